@@ -1,129 +1,100 @@
 from Graph_practical_work_02.graph import Graph
+from graph_common.memory_usage import track_memory
+from graph_common.search_stats import record_search
+from Graph_practical_work_02.scc import kosaraju, tarjan
+from Graph_practical_work_02.bcc import biconnected, symmetric_csr
+from Graph_practical_work_02.block_cut_tree import BlockCutTree
+from Graph_practical_work_02.union_find import DisjointSet
+from Graph_practical_work_02.csgraph_backend import ComponentBackend
+from Graph_practical_work_02.parallel_scc import parallel_scc
 from collections import deque
 import heapq
 # This code implements Kosaraju's algorithm to find strongly connected components in a directed graph.
-def kosaraju_scc(g: Graph):
+@track_memory
+def kosaraju_scc(g: Graph, backend="python"):
     """
     Finds the strongly connected components of a directed graph using Kosaraju's algorithm.
+    Runs without recursion on flat arrays (see scc.py), so long paths and million-vertex graphs are fine.
     :param g: Graph object
+    :param backend: "scipy" to run SciPy's compiled csgraph instead when it is installed (the
+                    components then come ordered by their first vertex), "parallel" to run the
+                    forward-backward decomposition of parallel_scc.py on all cores (components and
+                    their vertices in parse_vertices order)
     :return: List of strongly connected components
     """
-    def dfs(graph, node, visited, stack):
-        visited.add(node)
-        for neighbour, _ in graph.get_out_neighbours_for_vertex(node):
-            if neighbour not in visited:
-                dfs(graph, neighbour, visited, stack)
-        stack.append(node)
-
-    def reverse_graph(graph):
-        reversed_g = Graph(graph.get_number_vertices())
-        for edge_id in range(graph.edge_count):
-            source, target, weight = graph.get_edge_by_id(edge_id)
-            reversed_g.add_edge(target, source, weight)
-        return reversed_g
-
-    def fill_order(graph, visited, stack):
-        for vertex in range(graph.get_number_vertices()):
-            if vertex not in visited:
-                dfs(graph, vertex, visited, stack)
-
-    def get_sccs(graph, stack):
-        visited = set()
-        sccs = []
-        while stack:
-            node = stack.pop()
-            if node not in visited:
-                component = []
-                dfs(graph, node, visited, component)
-                sccs.append(component)
-        return sccs
-
-    stack = []
-    visited = set()
-    fill_order(g, visited, stack)
-    reversed_g = reverse_graph(g)
-    sccs = get_sccs(reversed_g, stack)
-    return sccs
+    if backend not in ("python", "scipy", "parallel"):
+        raise ValueError(f"backend must be 'python', 'scipy' or 'parallel', not {backend!r}")
+    if backend == "scipy":
+        return ComponentBackend(g).components("strong")
+    vertex_map, offsets, targets = g.dense_csr()
+    if backend == "parallel":
+        return [vertex_map.labels_of(component) for component in parallel_scc(len(vertex_map), offsets, targets)]
+    components = kosaraju(len(vertex_map), offsets, targets)
+    return [vertex_map.labels_of(component) for component in components]
+
+
+@track_memory
+def tarjan_scc(g: Graph):
+    """
+    Finds the strongly connected components of a directed graph in a single DFS (Tarjan's algorithm
+    in Pearce's variant), without building the reversed graph. For the per-vertex component ids,
+    call scc.tarjan on g.dense_csr() directly.
+    :param g: Graph object
+    :return: List of strongly connected components, in reverse topological order
+    """
+    vertex_map, offsets, targets = g.dense_csr()
+    components, _ = tarjan(len(vertex_map), offsets, targets)
+    return [vertex_map.labels_of(component) for component in components]
 
 
 
-def dfs(g: Graph, node, visited, component):
+@track_memory
+def find_conected_components(g, backend="python"):
     """
-    Depth First Search
-    :param g: graph object
-    :param node: starting vertex
-    :param visited: set of visited vertices
-    :param component: list of vertices in the order they were visited
-    :return: None
+    Finds the connected components of the graph, taking every edge as undirected, with a disjoint-set
+    pass over the edges (or the one g keeps up to date after g.track_connectivity()).
+    :param g: Graph object
+    :param backend: "scipy" to run SciPy's compiled csgraph instead when it is installed
+    :return: list of connected components
     """
-    visited.add(node)
-    component.append(node)
-    for neighbour, _ in g.get_out_neighbours_for_vertex(node):
-        if neighbour not in visited:
-            dfs(g, neighbour, visited, component)
+    if backend not in ("python", "scipy"):
+        raise ValueError(f"backend must be 'python' or 'scipy', not {backend!r}")
+    if backend == "scipy":
+        return ComponentBackend(g).components("weak")
+    connectivity = g.connectivity
+    if connectivity is None:
+        connectivity = DisjointSet(g.parse_vertices())
+        connectivity.union_edges(g.edge_index)
+    return connectivity.components()
 
-def find_conected_components(g):
+# This code implements Tarjan's algorithm to find biconnected components in an undirected graph.
+@track_memory
+def biconnected_components(g: Graph):
     """
-    Finds the connected components of the graph
+    Finds the biconnected components, articulation points and bridges of the undirected graph
+    underlying g (u and v are adjacent if either direction is an edge) in one iterative DFS (see bcc.py).
     :param g: Graph object
-    :return: list of connected components
+    :return: (list of biconnected components, list of articulation points, list of bridges as vertex pairs)
     """
-    visited = set()
-    components = []
-    for node in range(g.get_number_vertices()):
-        if node not in visited:
-            component = []  # Store current component
-            dfs(g, node, visited, component)
-            components.append(component)
-    return components
+    vertex_map, offsets, targets = g.dense_csr()
+    n = len(vertex_map)
+    components, articulation_points, bridges = biconnected(n, *symmetric_csr(n, offsets, targets))
+    label_of = vertex_map.label_of
+    return ([vertex_map.labels_of(component) for component in components],
+            vertex_map.labels_of(articulation_points),
+            [(label_of(u), label_of(v)) for u, v in bridges])
+
 
-# This code implements Tarjan's algorithm to find biconnected components in an undirected graph.
 def tarjan_bcc(g: Graph):
     """
     Finds the biconnected components of an undirected graph using Tarjan's algorithm.
-    :param g: Graph object
+    :param g: Graph object, each undirected edge given in one direction or both
     :return: List of biconnected components
     """
-    def dfs(u, parent, time):
-        nonlocal current_time
-        visited[u] = True
-        discovery_time[u] = low[u] = current_time
-        current_time += 1
-        children = 0
-        stack.append(u)
-
-        for v, _ in g.get_out_neighbours_for_vertex(u):
-            if not visited[v]:
-                children += 1
-                parent[v] = u
-                dfs(v, parent, time)
-                low[u] = min(low[u], low[v])
-
-                if (parent[u] is None and children > 1) or (parent[u] is not None and low[v] >= discovery_time[u]):
-                    bcc = []
-                    while stack[-1] != v:
-                        bcc.append(stack.pop())
-                    bcc.append(stack.pop())
-                    bcc.append(u)
-                    biconnected_components.append(bcc)
-            elif v != parent[u]:
-                low[u] = min(low[u], discovery_time[v])
-
-    current_time = 0
-    visited = [False] * g.get_number_vertices()
-    discovery_time = [-1] * g.get_number_vertices()
-    low = [-1] * g.get_number_vertices()
-    parent = [None] * g.get_number_vertices()
-    stack = []
-    biconnected_components = []
-
-    for i in range(g.get_number_vertices()):
-        if not visited[i]:
-            dfs(i, parent, current_time)
-
-    return biconnected_components
+    return biconnected_components(g)[0]
 
 
+@track_memory
 def wolf_goat_cabbage():
     initial_state = (1, 1, 1, 1)  # (man, wolf, goat, cabbage) on the left bank
     goal_state = (0, 0, 0, 0)  # (man, wolf, goat, cabbage) on the right bank
@@ -160,59 +131,6 @@ def wolf_goat_cabbage():
 
     return None
 
-# Example usage of finding connected components by simulating a non-directed graph
-graph = Graph(7)
-graph.add_edge(0, 1, 1)
-graph.add_edge(1, 0, 1)  # Add reverse edge
-graph.add_edge(1, 2, 1)
-graph.add_edge(2, 1, 1)  # Add reverse edge
-graph.add_edge(3, 4, 1)
-graph.add_edge(4, 3, 1)  # Add reverse edge
-graph.add_edge(4, 5, 1)
-graph.add_edge(5, 4, 1)  # Add reverse edge
-components = find_conected_components(graph)
-print("Connected components:", components)
-
-
-
-# Example usage of Kosaraju's algorithm(finding strongly connected components)
-g = Graph(7)
-g.add_edge(0, 1, 1)
-g.add_edge(1, 2, 1)
-#g.add_edge(2, 0, 1)
-#g.add_edge(1, 3, 1)
-g.add_edge(3, 4, 1)
-g.add_edge(4, 5, 1)
-g.add_edge(5, 3, 1)
-g.add_edge(5, 6, 1)
-
-sccs = kosaraju_scc(g)
-print("Strongly connected components:", sccs)
-
-# Example usage of Tarjan's algorithm(finding biconnected components)
-g = Graph(7)
-g.add_edge(0, 1, 1)
-#g.add_edge(1, 0, 1)
-g.add_edge(1, 2, 1)
-#g.add_edge(2, 1, 1)
-g.add_edge(1, 3, 1)
-#g.add_edge(3, 1, 1)
-g.add_edge(3, 4, 1)
-g.add_edge(4, 3, 1)
-g.add_edge(4, 5, 1)
-g.add_edge(5, 4, 1)
-g.add_edge(5, 6, 1)
-g.add_edge(6, 5, 1)
-g.add_edge(3,6,1)
-g.add_edge(6, 3, 1)
-
-bccs = tarjan_bcc(g)
-print("Biconnected components:", bccs)
-
-solution = wolf_goat_cabbage()
-print("Wolf, Goat, and Cabbage Solution:", solution)
-
-
 import heapq
 from copy import deepcopy
 
@@ -286,27 +204,41 @@ class Fifteen:
     def __eq__(self, other):
         return self.tiles == other.tiles
 
+    @track_memory
     def astar(self):
         queue = [(self.h_score, self)]
         visited = set()
+        pushes, pops, stale, relaxed, peak = 1, 0, 0, 0, 1  # Work counters for search_stats
+
+        def report():
+            record_search("Fifteen.astar", edges_relaxed=relaxed, heap_pushes=pushes, heap_pops=pops,
+                          stale_pops=stale, nodes_expanded=len(visited), peak_frontier=peak)
 
         while queue:
             _, current = heapq.heappop(queue)
+            pops += 1
             state_hash = hash(current)
             if state_hash in visited:
+                stale += 1
                 continue
             visited.add(state_hash)
 
             if current.h_score == 0:
+                report()
                 print("Solution found!")
                 current.show_steps()
                 print(f"Total moves: {len(current.previous_moves)}")
                 return
 
             for neighbor in current.generate_next_states():
+                relaxed += 1
                 if hash(neighbor) not in visited:
                     heapq.heappush(queue, (neighbor.depth + neighbor.h_score, neighbor))
+                    pushes += 1
+                    if len(queue) > peak:
+                        peak = len(queue)
 
+        report()
         print("No solution found.")
 
     def show_steps(self):
@@ -326,5 +258,69 @@ class Fifteen:
         print()
 
 
-fifteen = Fifteen()
-fifteen.astar()
+def run_examples():
+    # Example usage of finding connected components by simulating a non-directed graph
+    graph = Graph(7)
+    graph.add_edge(0, 1, 1)
+    graph.add_edge(1, 0, 1)  # Add reverse edge
+    graph.add_edge(1, 2, 1)
+    graph.add_edge(2, 1, 1)  # Add reverse edge
+    graph.add_edge(3, 4, 1)
+    graph.add_edge(4, 3, 1)  # Add reverse edge
+    graph.add_edge(4, 5, 1)
+    graph.add_edge(5, 4, 1)  # Add reverse edge
+    components = find_conected_components(graph)
+    print("Connected components:", components)
+
+
+
+    # Example usage of Kosaraju's algorithm(finding strongly connected components)
+    g = Graph(7)
+    g.add_edge(0, 1, 1)
+    g.add_edge(1, 2, 1)
+    #g.add_edge(2, 0, 1)
+    #g.add_edge(1, 3, 1)
+    g.add_edge(3, 4, 1)
+    g.add_edge(4, 5, 1)
+    g.add_edge(5, 3, 1)
+    g.add_edge(5, 6, 1)
+
+    sccs = kosaraju_scc(g)
+    print("Strongly connected components:", sccs)
+    print("Strongly connected components (Tarjan):", tarjan_scc(g))
+
+    # Example usage of Tarjan's algorithm(finding biconnected components)
+    g = Graph(7)
+    g.add_edge(0, 1, 1)
+    #g.add_edge(1, 0, 1)
+    g.add_edge(1, 2, 1)
+    #g.add_edge(2, 1, 1)
+    g.add_edge(1, 3, 1)
+    #g.add_edge(3, 1, 1)
+    g.add_edge(3, 4, 1)
+    g.add_edge(4, 3, 1)
+    g.add_edge(4, 5, 1)
+    g.add_edge(5, 4, 1)
+    g.add_edge(5, 6, 1)
+    g.add_edge(6, 5, 1)
+    g.add_edge(3,6,1)
+    g.add_edge(6, 3, 1)
+
+    bccs = tarjan_bcc(g)
+    print("Biconnected components:", bccs)
+    _, articulation_points, bridges = biconnected_components(g)
+    print("Articulation points:", articulation_points)
+    print("Bridges:", bridges)
+    block_cut_tree = BlockCutTree(g)
+    print("4 and 6 survive any single vertex failure together:", block_cut_tree.biconnected(4, 6))
+    print("Vertices separating 0 from 5:", block_cut_tree.separating_vertices(0, 5))
+
+    solution = wolf_goat_cabbage()
+    print("Wolf, Goat, and Cabbage Solution:", solution)
+
+    fifteen = Fifteen()
+    fifteen.astar()
+
+
+if __name__ == "__main__":
+    run_examples()
@@ -0,0 +1,128 @@
+from array import array
+
+from Graph_practical_work_02.scc import transpose
+from graph_common.search_stats import record_search
+
+# Biconnected components of the undirected graph underlying a graph in compressed sparse rows
+# (dense ids 0 .. n-1, see Graph.dense_csr). Like scc.py, the DFS keeps an explicit stack and its
+# state in flat arrays, so deep graphs do not hit the recursion limit.
+
+
+def symmetric_csr(n, offsets, targets):
+    """
+    Turns a directed graph into its underlying simple undirected graph: u and v are neighbours when
+    u -> v or v -> u is an edge, so it does not matter whether the caller added one direction or both.
+    Self loops are dropped.
+    :param n: number of vertices
+    :param offsets: row offsets of the directed graph
+    :param targets: edge targets of the directed graph
+    :return: (offsets, targets) where every undirected edge appears once in the row of each endpoint;
+             a row lists the out neighbours first, then the remaining in neighbours
+    """
+    reverse_offsets, reverse_targets = transpose(n, offsets, targets)
+    undirected_offsets = array("q", [0])
+    undirected_targets = array("q")
+    for vertex in range(n):
+        row = dict.fromkeys(targets[offsets[vertex]:offsets[vertex + 1]])
+        row.update(dict.fromkeys(reverse_targets[reverse_offsets[vertex]:reverse_offsets[vertex + 1]]))
+        row.pop(vertex, None)
+        undirected_targets.extend(row)
+        undirected_offsets.append(len(undirected_targets))
+    return undirected_offsets, undirected_targets
+
+
+def biconnected(n, offsets, targets):
+    """
+    Tarjan and Hopcroft's algorithm with an edge stack, in one DFS: every tree edge and every back edge
+    is pushed once, and when a child's subtree cannot reach above its parent the edges down to that
+    tree edge form one biconnected component.
+    :param n: number of vertices
+    :param offsets: row offsets of a symmetric simple graph (see symmetric_csr)
+    :param targets: edge targets of that graph
+    :return: (components, articulation_points, bridges): the vertex lists of the biconnected components
+             (isolated vertices belong to none), the cut vertices in increasing order, and the bridges
+             as (parent, child) pairs of the DFS tree
+    """
+    discovery = array("q", bytes(8 * n))  # 0 = not visited yet, times start at 1
+    low = array("q", bytes(8 * n))
+    parent = array("q", [-1]) * n
+    next_edge = array("q", offsets)
+    edge_sources = array("q")  # Edge stack, as two parallel arrays
+    edge_targets = array("q")
+    is_cut = bytearray(n)
+    member_of = array("q", [-1]) * n  # member_of[v] = last component v was added to, to list it once
+    components = []
+    bridges = []
+    time = 1
+    peak = 0
+
+    for start in range(n):
+        if discovery[start]:
+            continue
+        discovery[start] = low[start] = time
+        time += 1
+        root_children = 0
+        stack = [start]
+        peak = max(peak, 1)
+        while stack:
+            vertex = stack[-1]
+            edge = next_edge[vertex]
+            end = offsets[vertex + 1]
+            descended = False
+            while edge < end:
+                neighbour = targets[edge]
+                edge += 1
+                if not discovery[neighbour]:  # Tree edge
+                    next_edge[vertex] = edge
+                    parent[neighbour] = vertex
+                    discovery[neighbour] = low[neighbour] = time
+                    time += 1
+                    edge_sources.append(vertex)
+                    edge_targets.append(neighbour)
+                    if vertex == start:
+                        root_children += 1
+                    stack.append(neighbour)
+                    if len(stack) > peak:
+                        peak = len(stack)
+                    descended = True
+                    break
+                if neighbour != parent[vertex] and discovery[neighbour] < discovery[vertex]:  # Back edge to an ancestor
+                    if discovery[neighbour] < low[vertex]:
+                        low[vertex] = discovery[neighbour]
+                    edge_sources.append(vertex)
+                    edge_targets.append(neighbour)
+            if descended:
+                continue
+            next_edge[vertex] = end
+            stack.pop()
+            above = parent[vertex]
+            if above < 0:
+                continue
+            if low[vertex] < low[above]:
+                low[above] = low[vertex]
+            if low[vertex] >= discovery[above]:
+                # Nothing below vertex reaches above its parent: pop the component hanging from this tree edge
+                if above != start:
+                    is_cut[above] = 1
+                if low[vertex] > discovery[above]:
+                    bridges.append((above, vertex))
+                number = len(components)
+                component = []
+                while True:
+                    source = edge_sources.pop()
+                    target = edge_targets.pop()
+                    for member in (target, source):
+                        if member_of[member] != number:
+                            member_of[member] = number
+                            component.append(member)
+                    if source == above and target == vertex:
+                        break
+                components.append(component)
+        if root_children > 1:
+            is_cut[start] = 1
+
+    articulation_points = [vertex for vertex in range(n) if is_cut[vertex]]
+    # Every vertex is pushed and popped once and every edge is looked at from both endpoints
+    record_search("tarjan_bcc", edges_relaxed=len(targets), heap_pushes=time - 1, heap_pops=time - 1,
+                  nodes_expanded=time - 1, peak_frontier=peak)
+    return components, articulation_points, bridges
@@ -0,0 +1,180 @@
+from array import array
+
+from Graph_practical_work_02.bcc import biconnected, symmetric_csr
+
+
+class BlockCutTree:
+    """
+    Block-cut tree of the undirected graph underlying a Graph: one node per biconnected component
+    (block) and one per articulation point, a cut vertex being linked to every block that contains it.
+    Every vertex is represented by its own node if it is a cut vertex and by its only block otherwise
+    (an isolated vertex gets a block of its own). With the tree preprocessed for lowest common
+    ancestors by binary lifting, the 2-connectivity queries below take O(log n) each.
+    """
+
+    def __init__(self, g):
+        """
+        :param g: Graph object, each undirected edge given in one direction or both
+        """
+        vertex_map, offsets, targets = g.dense_csr()
+        n = len(vertex_map)
+        blocks, cut_vertices, _ = biconnected(n, *symmetric_csr(n, offsets, targets))
+        self._vertex_map = vertex_map
+        self.blocks = [vertex_map.labels_of(block) for block in blocks]
+        self.articulation_points = vertex_map.labels_of(cut_vertices)
+
+        # Tree nodes: blocks 0 .. B-1, cut vertices B .. B+C-1, then the blocks of isolated vertices
+        self._first_cut = len(blocks)
+        self._end_cut = len(blocks) + len(cut_vertices)
+        node_of = array("q", [-1]) * n  # Dense vertex id -> tree node representing it
+        for position, vertex in enumerate(cut_vertices):
+            node_of[vertex] = self._first_cut + position
+        tree = [[] for _ in range(self._end_cut)]
+        for block_node, block in enumerate(blocks):
+            for vertex in block:
+                if node_of[vertex] >= self._first_cut:
+                    tree[block_node].append(node_of[vertex])
+                    tree[node_of[vertex]].append(block_node)
+                else:
+                    node_of[vertex] = block_node
+        for vertex in range(n):
+            if node_of[vertex] < 0:
+                node_of[vertex] = len(tree)
+                tree.append([])
+        self._node_of = node_of
+        self._cut_vertices = cut_vertices
+        self._preprocess(tree)
+
+    def _preprocess(self, tree):
+        """
+        Roots every tree of the forest at its first node (breadth first, no recursion) and builds the
+        binary lifting table up[k][x] = ancestor of x 2^k levels up (the root is its own parent).
+        :param tree: adjacency lists of the block-cut forest
+        """
+        size = len(tree)
+        parent = array("q", range(size))
+        depth = array("q", bytes(8 * size))
+        root = array("q", [-1]) * size  # Root of the tree containing the node, -1 while not reached
+        for start in range(size):
+            if root[start] >= 0:
+                continue
+            root[start] = start
+            queue = [start]
+            for node in queue:  # The list grows while it is walked
+                for child in tree[node]:
+                    if root[child] < 0:
+                        root[child] = start
+                        parent[child] = node
+                        depth[child] = depth[node] + 1
+                        queue.append(child)
+        self._depth = depth
+        self._root = root
+        self._up = [parent]
+        for _ in range(max(depth, default=0).bit_length() - 1):
+            previous = self._up[-1]
+            self._up.append(array("q", [previous[ancestor] for ancestor in previous]))
+
+    def _lca(self, a, b):
+        """Returns the lowest common ancestor of two tree nodes of the same tree."""
+        depth, up = self._depth, self._up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        difference = depth[a] - depth[b]
+        level = 0
+        while difference:
+            if difference & 1:
+                a = up[level][a]
+            difference >>= 1
+            level += 1
+        if a == b:
+            return a
+        for level in range(len(up) - 1, -1, -1):
+            if up[level][a] != up[level][b]:
+                a = up[level][a]
+                b = up[level][b]
+        return up[0][a]
+
+    def _is_cut_node(self, node):
+        return self._first_cut <= node < self._end_cut
+
+    def _nodes(self, u, v):
+        id_of = self._vertex_map.id_of
+        return self._node_of[id_of(u)], self._node_of[id_of(v)]
+
+    def connected(self, u, v):
+        """Returns True if u and v are in the same connected component."""
+        a, b = self._nodes(u, v)
+        return self._root[a] == self._root[b]
+
+    def count_separating_vertices(self, u, v):
+        """
+        Returns the number of vertices other than u and v whose removal disconnects u from v, or None
+        if they are not connected. Blocks and cut vertices alternate along a tree path, so the count
+        follows from the length of the path between the nodes of u and v.
+        """
+        if u == v:
+            return 0
+        a, b = self._nodes(u, v)
+        if self._root[a] != self._root[b]:
+            return None
+        distance = self._depth[a] + self._depth[b] - 2 * self._depth[self._lca(a, b)]
+        return (distance - 1 + (not self._is_cut_node(a)) + (not self._is_cut_node(b))) // 2
+
+    def biconnected(self, u, v):
+        """
+        Returns True if u and v lie in a common biconnected component, i.e. they stay connected
+        whatever single other vertex fails.
+        """
+        return self.count_separating_vertices(u, v) == 0
+
+    def biconnected_pairs(self, pairs):
+        """
+        Answers biconnected() for many pairs at once.
+        :param pairs: iterable of (u, v) vertex pairs
+        :return: list of booleans, one per pair
+        """
+        count = self.count_separating_vertices
+        return [count(u, v) == 0 for u, v in pairs]
+
+    def separates(self, x, u, v):
+        """
+        Returns True if removing vertex x disconnects u from v (x being neither of them), i.e. x is a
+        cut vertex whose node lies on the tree path between u and v.
+        """
+        if x == u or x == v or not self.connected(u, v):
+            return False
+        c = self._node_of[self._vertex_map.id_of(x)]
+        if not self._is_cut_node(c):
+            return False
+        a, b = self._nodes(u, v)
+        if self._root[c] != self._root[a]:
+            return False
+        depth = self._depth
+
+        def distance(p, q):
+            return depth[p] + depth[q] - 2 * depth[self._lca(p, q)]
+
+        return distance(a, c) + distance(c, b) == distance(a, b)
+
+    def separating_vertices(self, u, v):
+        """
+        Lists the vertices other than u and v whose removal disconnects u from v, in path order from u.
+        Takes time proportional to the length of the tree path.
+        :return: list of cut vertices, or None if u and v are not connected
+        """
+        if u == v:
+            return []
+        a, b = self._nodes(u, v)
+        if self._root[a] != self._root[b]:
+            return None
+        ancestor = self._lca(a, b)
+        parent = self._up[0]
+        from_a, from_b = [], []
+        for node, path in ((a, from_a), (b, from_b)):
+            while node != ancestor:
+                path.append(node)
+                node = parent[node]
+        path = from_a + [ancestor] + from_b[::-1]
+        label_of = self._vertex_map.label_of
+        return [label_of(self._cut_vertices[node - self._first_cut])
+                for node in path[1:-1] if self._is_cut_node(node)]
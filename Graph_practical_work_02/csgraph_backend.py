@@ -0,0 +1,81 @@
+from Graph_practical_work_02.scc import tarjan
+from Graph_practical_work_02.union_find import DisjointSet
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # SciPy is optional, the pure Python engines take over without it
+    np = None
+
+HAVE_SCIPY = np is not None
+
+
+def to_csr_matrix(n, offsets, targets):
+    """
+    Wraps a graph in compressed sparse rows (see Graph.dense_csr) as a scipy.sparse matrix. The offset
+    and target arrays are shared with NumPy, not copied.
+    :param n: number of vertices
+    :param offsets: row offsets, array of "q"
+    :param targets: edge targets, array of "q"
+    :return: n x n csr_matrix with a 1 for every edge
+    """
+    indptr = np.frombuffer(offsets, dtype=np.int64)
+    indices = np.frombuffer(targets, dtype=np.int64)
+    data = np.ones(len(targets), dtype=np.int8)
+    return csr_matrix((data, indices, indptr), shape=(n, n))
+
+
+class ComponentBackend:
+    """
+    Connected (weak) and strongly connected components of a Graph, computed by SciPy's compiled
+    csgraph routines when SciPy is installed and by the pure Python engines (union_find, scc)
+    otherwise. The graph is exported once, when the backend is created; create a new one after
+    changing the graph.
+    """
+
+    def __init__(self, g, use_scipy=True):
+        """
+        :param g: Graph object
+        :param use_scipy: False to force the pure Python engines even when SciPy is installed
+        """
+        self._vertex_map, self._offsets, self._targets = g.dense_csr()
+        self.n = len(self._vertex_map)
+        self.uses_scipy = use_scipy and HAVE_SCIPY
+        self._matrix = to_csr_matrix(self.n, self._offsets, self._targets) if self.uses_scipy else None
+
+    def component_ids(self, connection="weak"):
+        """
+        Numbers the components.
+        :param connection: "weak" (edges taken as undirected) or "strong"
+        :return: (number of components, sequence of component numbers indexed by dense vertex id)
+        """
+        if connection not in ("weak", "strong"):
+            raise ValueError(f"connection must be 'weak' or 'strong', not {connection!r}")
+        if self.uses_scipy:
+            count, ids = connected_components(self._matrix, directed=True, connection=connection)
+            return count, ids.tolist()
+        if connection == "strong":
+            components, component_of = tarjan(self.n, self._offsets, self._targets)
+            return len(components), component_of
+        connectivity = DisjointSet(range(self.n))
+        offsets, targets = self._offsets, self._targets
+        for source in range(self.n):
+            for index in range(offsets[source], offsets[source + 1]):
+                connectivity.union(source, targets[index])
+        roots = {}
+        ids = [roots.setdefault(connectivity.find(vertex), len(roots)) for vertex in range(self.n)]
+        return len(roots), ids
+
+    def components(self, connection="weak"):
+        """
+        Lists the components as the other component functions of this lab do.
+        :param connection: "weak" or "strong"
+        :return: list of components, each a list of vertices, ordered by their first vertex in
+                 parse_vertices order
+        """
+        _, ids = self.component_ids(connection)
+        groups = {}
+        for vertex, component in zip(self._vertex_map, ids):
+            groups.setdefault(component, []).append(vertex)
+        return list(groups.values())
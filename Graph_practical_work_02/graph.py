@@ -1,5 +1,11 @@
 import random
 import copy
+from array import array
+
+from Graph_practical_work_02.edge_table import EdgeTable
+from graph_common.memory_usage import deep_sizeof
+from Graph_practical_work_02.vertex_map import VertexMap
+from Graph_practical_work_02.union_find import DisjointSet
 
 
 class Graph:
@@ -11,8 +17,11 @@ class Graph:
         :param v: Can be an integer for the number of vertices or a string with the filename to read from.
         """
         self.out_neighbours = {}  # Adjacency list (with weights)
-        self.edges = {}  # Mapping EDGE_ID -> (source, target, weight)
+        self.in_neighbours = {}  # Inbound adjacency list: vertex -> [(source, weight)]
+        self.edges = EdgeTable()  # Mapping EDGE_ID -> (source, target, weight), stored as typed arrays
+        self.edge_index = {}  # Mapping (source, target) -> EDGE_ID, IDs of removed edges are not reused
         self.edge_count = 0
+        self.connectivity = None  # DisjointSet kept up to date by add_edge/add_vertex, see track_connectivity
 
         # If v is a filename (string), read the graph from the file
         if isinstance(v, str):
@@ -21,6 +30,7 @@ class Graph:
         elif isinstance(v, int):
             for vertex in range(v):
                 self.out_neighbours[vertex] = []
+                self.in_neighbours[vertex] = []
     def get_out_neighbours_for_vertex(self,vertex):
         """
         Returns the out neighbours of a vertex
@@ -29,6 +39,77 @@ class Graph:
 
         """
         return self.out_neighbours[vertex]
+
+    def get_in_neighbours_for_vertex(self, vertex):
+        """
+        Returns the in neighbours of a vertex, i.e. its out neighbours in the reversed graph
+        :param vertex: the child
+        :return: the in neighbours as (source, weight) pairs
+        """
+        return self.in_neighbours[vertex]
+
+    def memory_report(self):
+        """
+        Breaks the memory held by the graph down by structure (containers, tuples and ints included;
+        an object referenced by two structures is counted in the first one).
+        :return: dict structure name -> bytes, plus "total"
+        """
+        seen = set()
+        report = {name: deep_sizeof(getattr(self, name), seen) for name in ("out_neighbours", "in_neighbours", "edges", "edge_index")}
+        report["total"] = sum(report.values())
+        return report
+
+    def dense_adjacency(self, reverse=False):
+        """
+        Numbers the vertices 0 .. n-1 in the order of parse_vertices, so that algorithms can keep
+        per-vertex state in flat lists even when the labels are sparse ints or strings.
+        :param reverse: use the inbound lists, i.e. the adjacency of the reversed graph
+        :return: (vertex_map, adjacency) where adjacency[i] lists the dense ids of the neighbours
+                 of vertex_map.label_of(i)
+        """
+        lists = self.in_neighbours if reverse else self.out_neighbours
+        vertex_map = VertexMap(self.out_neighbours)
+        if vertex_map.is_identity():
+            adjacency = [[neighbour for neighbour, _ in lists[vertex]] for vertex in vertex_map]
+        else:
+            id_of = vertex_map.id_of
+            adjacency = [[id_of(neighbour) for neighbour, _ in lists[vertex]] for vertex in vertex_map]
+        return vertex_map, adjacency
+
+    def dense_csr(self, reverse=False):
+        """
+        Like dense_adjacency, but packs the lists into two flat arrays (compressed sparse rows), which
+        for large graphs takes a fraction of the memory of a list per vertex.
+        :param reverse: use the inbound lists, i.e. the adjacency of the reversed graph
+        :return: (vertex_map, offsets, targets) where the neighbours of dense id i are
+                 targets[offsets[i]:offsets[i + 1]]
+        """
+        lists = self.in_neighbours if reverse else self.out_neighbours
+        vertex_map = VertexMap(self.out_neighbours)
+        offsets = array("q", [0])
+        targets = array("q")
+        id_of = None if vertex_map.is_identity() else vertex_map.id_of
+        for vertex in vertex_map:
+            if id_of is None:
+                targets.extend([neighbour for neighbour, _ in lists[vertex]])
+            else:
+                targets.extend([id_of(neighbour) for neighbour, _ in lists[vertex]])
+            offsets.append(len(targets))
+        return vertex_map, offsets, targets
+
+    def track_connectivity(self):
+        """
+        Starts keeping the weakly connected components (edges taken as undirected) in a disjoint-set
+        structure that add_edge and add_vertex update as the graph grows, so connected(u, v) queries and
+        the component count need no traversal. Removing an edge or a vertex drops it, call again then.
+        :return: the DisjointSet, also kept in self.connectivity
+        """
+        if self.connectivity is None:
+            connectivity = DisjointSet(self.out_neighbours)
+            connectivity.union_edges(self.edge_index)
+            self.connectivity = connectivity
+        return self.connectivity
+
     def _read_from_file(self, file_name):
         """
         Reads a graph from the specified file.
@@ -47,23 +128,46 @@ class Graph:
 
     def add_edge(self, x, y, weight):
         """Adds a directed edge from x to y with a given weight."""
-        if y not in [neighbor for neighbor, _ in self.out_neighbours[x]]:
+        if x not in self.out_neighbours or y not in self.out_neighbours:
+            raise ValueError("Vertex does not exist")
+        if (x, y) not in self.edge_index:
             self.out_neighbours[x].append((y, weight))
-            self.edges[self.edge_count] = (x, y, weight)
+            self.in_neighbours[y].append((x, weight))
+            self.edge_index[(x, y)] = self.edges.append(x, y, weight)
             self.edge_count += 1
+            if self.connectivity is not None:
+                self.connectivity.union(x, y)
         return True
 
     def remove_edge(self, x, y):
         """Removes the directed edge from x to y."""
+        if (x, y) not in self.edge_index:
+            return False
         for i, (neighbor, weight) in enumerate(self.out_neighbours[x]):
             if neighbor == y:
                 del self.out_neighbours[x][i]
+                del self.edges[self.edge_index.pop((x, y))]
+                self.edge_count -= 1
+                self.in_neighbours[y] = [(source, w) for source, w in self.in_neighbours[y] if source != x]
+                self.connectivity = None  # A union cannot be undone
                 return True
 
     def remove_vertex(self, x):
-        """Removes vertex x from the graph."""
+        """Removes vertex x and all its inbound and outbound edges, found through its own adjacency lists."""
         if x in self.out_neighbours:
+            for neighbor, _ in self.out_neighbours[x]:
+                del self.edges[self.edge_index.pop((x, neighbor))]
+                self.edge_count -= 1
+                if neighbor != x:
+                    self.in_neighbours[neighbor] = [(s, w) for s, w in self.in_neighbours[neighbor] if s != x]
+            for source, _ in self.in_neighbours[x]:
+                if source != x:  # A loop was unindexed with the outbound edges
+                    del self.edges[self.edge_index.pop((source, x))]
+                    self.edge_count -= 1
+                    self.out_neighbours[source] = [(t, w) for t, w in self.out_neighbours[source] if t != x]
             del self.out_neighbours[x]
+            del self.in_neighbours[x]
+            self.connectivity = None  # A union cannot be undone
             return True
         else:
             return False
@@ -72,6 +176,9 @@ class Graph:
         """Adds vertex x to the graph."""
         if x not in self.out_neighbours:
             self.out_neighbours[x] = []
+            self.in_neighbours[x] = []
+            if self.connectivity is not None:
+                self.connectivity.add(x)
         else:
             raise ValueError("Vertex already exists")
 
@@ -104,16 +211,12 @@ class Graph:
 
     def is_edge(self, x, y):
         """
-        Returns True if there is an edge from x to y in the graph.
+        Checks in O(1) whether there is an edge from x to y in the graph.
         :param x: source vertex
         :param y: target vertex
         :return: returns the edge_id from x to y if it exists, otherwise None
         """
-        for edge_id in range(self.edge_count):
-            source, target, _ = self.edges[edge_id]
-            if source == x and target == y:
-                return edge_id
-        return None
+        return self.edge_index.get((x, y))
 
     def generate_random_graph(self, number_vertices, number_edges):
         """
@@ -136,7 +239,9 @@ class Graph:
         """
         new_graph = Graph()
         new_graph.out_neighbours = copy.deepcopy(self.out_neighbours)
-        new_graph.edges = copy.deepcopy(self.edges)
+        new_graph.in_neighbours = copy.deepcopy(self.in_neighbours)
+        new_graph.edges = self.edges.copy()
+        new_graph.edge_index = dict(self.edge_index)
         new_graph.edge_count = self.edge_count
         return new_graph
 
@@ -149,9 +254,7 @@ def write_to_file(graph: Graph, file_name):
     """
     with open(file_name, "w") as f:
         f.write(f"{graph.get_number_vertices()} {graph.edge_count}\n")
-        for edge_id in range(graph.edge_count):
-            source, target, weight = graph.get_edge_by_id(edge_id)
-            f.write(f"{source} {target} {weight}\n")
+        f.writelines(f"{source} {target} {weight}\n" for source, target, weight in graph.edges.values())
 
 
 
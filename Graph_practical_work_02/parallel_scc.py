@@ -0,0 +1,149 @@
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from Graph_practical_work_02.scc import transpose
+
+# Strongly connected components by forward-backward decomposition. After trimming the vertices that
+# cannot lie on a cycle, a pivot's forward and backward reachable sets intersect in its component and
+# split the rest into three parts that share no component, so they can be solved independently:
+# parts of at least SPLIT_MIN vertices go back to the pool, smaller ones are finished in place.
+# The graph and its transpose sit in one shared memory block that the workers map, not copy.
+
+SPLIT_MIN = 4096  # Smallest part handed back to the pool instead of being solved by the same worker
+SERIAL_MAX = 20000  # Below this many vertices left after trimming, no processes are started
+
+_worker_graph = None  # (offsets, targets, reverse_offsets, reverse_targets) mapped by a worker process
+_worker_memory = None
+
+
+def _init_worker(name, n, m):
+    """Maps the shared CSR arrays of the parent into a pool process."""
+    global _worker_graph, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_graph = _split_block(_worker_memory.buf.cast("q"), n, m)
+
+
+def _split_block(block, n, m):
+    """Cuts the shared block into offsets, targets, reverse offsets and reverse targets."""
+    return block[:n + 1], block[n + 1:n + 1 + m], block[n + 1 + m:2 * n + 2 + m], block[2 * n + 2 + m:]
+
+
+def _trim(n, offsets, reverse_offsets, targets, reverse_targets):
+    """
+    Repeatedly removes the vertices without a remaining in or out edge: each is a component by itself.
+    :return: (trimmed vertices, remaining vertices)
+    """
+    out_degree = array("q", (offsets[v + 1] - offsets[v] for v in range(n)))
+    in_degree = array("q", (reverse_offsets[v + 1] - reverse_offsets[v] for v in range(n)))
+    removed = bytearray(n)
+    trimmed = [v for v in range(n) if not out_degree[v] or not in_degree[v]]
+    for vertex in trimmed:
+        removed[vertex] = 1
+    for vertex in trimmed:  # The list grows while it is walked
+        for index in range(offsets[vertex], offsets[vertex + 1]):
+            target = targets[index]
+            in_degree[target] -= 1
+            if not removed[target] and not in_degree[target]:
+                removed[target] = 1
+                trimmed.append(target)
+        for index in range(reverse_offsets[vertex], reverse_offsets[vertex + 1]):
+            source = reverse_targets[index]
+            out_degree[source] -= 1
+            if not removed[source] and not out_degree[source]:
+                removed[source] = 1
+                trimmed.append(source)
+    return trimmed, [v for v in range(n) if not removed[v]]
+
+
+def _reach(pivot, offsets, targets, members):
+    """Returns the vertices of members reachable from pivot."""
+    seen = {pivot}
+    stack = [pivot]
+    while stack:
+        vertex = stack.pop()
+        for neighbour in targets[offsets[vertex]:offsets[vertex + 1]]:
+            if neighbour in members and neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+def _forward_backward(graph, vertices, split_min):
+    """
+    Decomposes one part completely, except for the parts of at least split_min vertices it spawns.
+    :param graph: (offsets, targets, reverse_offsets, reverse_targets)
+    :param vertices: the vertices of the part
+    :param split_min: size from which a spawned part is returned instead of solved, None to solve all
+    :return: (components found, spawned parts as arrays)
+    """
+    offsets, targets, reverse_offsets, reverse_targets = graph
+    components = []
+    spawned = []
+    work = [vertices]
+    while work:
+        members = set(work.pop())
+        pivot = next(iter(members))
+        forward = _reach(pivot, offsets, targets, members)
+        backward = _reach(pivot, reverse_offsets, reverse_targets, members)
+        component = forward & backward
+        components.append(list(component))
+        for part in (forward - component, backward - component, members - forward - backward):
+            if not part:
+                continue
+            if split_min is not None and len(part) >= split_min:
+                spawned.append(array("q", part))
+            else:
+                work.append(part)
+    return components, spawned
+
+
+def _solve_part(vertices):
+    """Pool task: decomposes a part of the shared graph."""
+    return _forward_backward(_worker_graph, vertices, SPLIT_MIN)
+
+
+def parallel_scc(n, offsets, targets, workers=None):
+    """
+    Strongly connected components of a graph in compressed sparse rows, over a pool of processes.
+    :param n: number of vertices
+    :param offsets: row offsets of the graph, array of "q"
+    :param targets: edge targets of the graph, array of "q"
+    :param workers: number of processes, os.cpu_count() by default; 1 runs everything in this process
+    :return: list of components, each a list of vertices in increasing order, ordered by their smallest vertex
+    """
+    reverse_offsets, reverse_targets = transpose(n, offsets, targets)
+    trimmed, remaining = _trim(n, offsets, reverse_offsets, targets, reverse_targets)
+    components = [[vertex] for vertex in trimmed]
+    workers = workers or os.cpu_count()
+
+    if remaining and (workers == 1 or len(remaining) < SERIAL_MAX):
+        found, _ = _forward_backward((offsets, targets, reverse_offsets, reverse_targets), remaining, None)
+        components.extend(found)
+    elif remaining:
+        m = len(targets)
+        memory = shared_memory.SharedMemory(create=True, size=8 * (2 * n + 2 + 2 * m))
+        try:
+            block = memory.buf.cast("q")
+            for view, values in zip(_split_block(block, n, m), (offsets, targets, reverse_offsets, reverse_targets)):
+                view[:] = values
+                view.release()
+            block.release()
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(memory.name, n, m)) as pool:
+                pending = {pool.submit(_solve_part, array("q", remaining))}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        found, spawned = future.result()
+                        components.extend(found)
+                        pending.update(pool.submit(_solve_part, part) for part in spawned)
+        finally:
+            memory.close()
+            memory.unlink()
+
+    # The schedule decides the order components are found in, sort so the result does not depend on it
+    for component in components:
+        component.sort()
+    components.sort()
+    return components
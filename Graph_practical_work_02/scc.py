@@ -0,0 +1,178 @@
+from array import array
+
+from graph_common.search_stats import record_search
+
+# Strongly connected components of a graph in compressed sparse rows: the vertices are the dense ids
+# 0 .. n-1 and the out neighbours of v are targets[offsets[v]:offsets[v + 1]] (see Graph.dense_csr).
+# Every traversal keeps an explicit stack instead of recursing, so long chains do not hit the
+# recursion limit and the extra memory is a few flat arrays of n entries.
+
+
+def transpose(n, offsets, targets):
+    """
+    Builds the reversed graph in two passes over the edges (counting sort by target) instead of
+    inserting its edges one by one.
+    :param n: number of vertices
+    :param offsets: row offsets of the graph, n + 1 entries
+    :param targets: edge targets of the graph
+    :return: (offsets, targets) of the reversed graph; every row lists its sources in increasing order
+    """
+    reverse_offsets = array("q", bytes(8 * (n + 1)))
+    for target in targets:
+        reverse_offsets[target + 1] += 1
+    for vertex in range(n):
+        reverse_offsets[vertex + 1] += reverse_offsets[vertex]
+    reverse_targets = array("q", bytes(8 * len(targets)))
+    cursor = array("q", reverse_offsets)  # cursor[v] = next free slot in the row of v
+    for source in range(n):
+        for index in range(offsets[source], offsets[source + 1]):
+            target = targets[index]
+            reverse_targets[cursor[target]] = source
+            cursor[target] += 1
+    return reverse_offsets, reverse_targets
+
+
+def _postorder(root, offsets, targets, next_edge, seen, out):
+    """
+    Depth first search from root through the vertices not seen yet, appending every vertex to out
+    when all of its descendants are finished (the order a recursive DFS would produce).
+    :param next_edge: next_edge[v] = index of the next edge of v to look at, advanced in place
+    :param seen: bytearray of visited flags, updated in place
+    :return: the largest size the stack reached
+    """
+    seen[root] = 1
+    stack = [root]
+    peak = 1
+    while stack:
+        vertex = stack[-1]
+        index = next_edge[vertex]
+        end = offsets[vertex + 1]
+        while index < end and seen[targets[index]]:
+            index += 1
+        if index < end:  # Descend into the first unseen neighbour, coming back to the next edge later
+            neighbour = targets[index]
+            next_edge[vertex] = index + 1
+            seen[neighbour] = 1
+            stack.append(neighbour)
+            if len(stack) > peak:
+                peak = len(stack)
+        else:
+            stack.pop()
+            out.append(vertex)
+    return peak
+
+
+def kosaraju(n, offsets, targets, reverse_offsets=None, reverse_targets=None):
+    """
+    Kosaraju's algorithm: a first DFS orders the vertices by finishing time, a second DFS over the
+    reversed graph, started from the latest finished vertex, collects one component per tree.
+    :param n: number of vertices
+    :param offsets: row offsets of the graph
+    :param targets: edge targets of the graph
+    :param reverse_offsets: row offsets of the reversed graph if already at hand, built by transpose() otherwise
+    :param reverse_targets: edge targets of the reversed graph
+    :return: list of components, each a list of vertices in the order the second pass finished them
+    """
+    seen = bytearray(n)
+    next_edge = array("q", offsets)
+    order = array("q")
+    peak = 0
+    for vertex in range(n):
+        if not seen[vertex]:
+            peak = max(peak, _postorder(vertex, offsets, targets, next_edge, seen, order))
+
+    if reverse_offsets is None:
+        reverse_offsets, reverse_targets = transpose(n, offsets, targets)
+    seen = bytearray(n)
+    next_edge = array("q", reverse_offsets)
+    components = []
+    for vertex in reversed(order):
+        if not seen[vertex]:
+            component = []
+            peak = max(peak, _postorder(vertex, reverse_offsets, reverse_targets, next_edge, seen, component))
+            components.append(component)
+
+    # Each pass pushes and pops every vertex once and looks at every edge once
+    record_search("kosaraju_scc", edges_relaxed=2 * len(targets), heap_pushes=2 * n, heap_pops=2 * n,
+                  nodes_expanded=2 * n, peak_frontier=peak)
+    return components
+
+
+def tarjan(n, offsets, targets):
+    """
+    Tarjan's single-pass algorithm in Pearce's memory-lean form: one array rindex holds the DFS index
+    of a vertex while it is open and its component number once it is assigned, replacing the
+    separate index, lowlink and on-stack arrays, and the reversed graph is never built.
+    :param n: number of vertices
+    :param offsets: row offsets of the graph
+    :param targets: edge targets of the graph
+    :return: (components, component_of) where components lists the components in the order they
+             are completed (reverse topological order of the condensation) and component_of[v] is the
+             position of the component of v in that list
+    """
+    rindex = array("q", bytes(8 * n))  # 0 = not visited yet
+    root = bytearray(n)  # root[v] = 1 while no edge out of the subtree of v reached an older open vertex
+    next_edge = array("q", offsets)
+    visiting = []  # DFS path
+    pending = []  # Finished vertices waiting for the root of their component
+    components = []
+    index = 1
+    label = n - 1  # Component numbers count down from n - 1, above the indices of the open vertices
+    peak = 0
+
+    for start in range(n):
+        if rindex[start]:
+            continue
+        rindex[start] = index
+        index += 1
+        root[start] = 1
+        visiting.append(start)
+        peak = max(peak, 1)
+        while visiting:
+            vertex = visiting[-1]
+            edge = next_edge[vertex]
+            end = offsets[vertex + 1]
+            descended = False
+            while edge < end:
+                neighbour = targets[edge]
+                if not rindex[neighbour]:
+                    # Leave the edge in place, it is looked at again once the neighbour is finished
+                    next_edge[vertex] = edge
+                    rindex[neighbour] = index
+                    index += 1
+                    root[neighbour] = 1
+                    visiting.append(neighbour)
+                    if len(visiting) > peak:
+                        peak = len(visiting)
+                    descended = True
+                    break
+                if rindex[neighbour] < rindex[vertex]:
+                    rindex[vertex] = rindex[neighbour]
+                    root[vertex] = 0
+                edge += 1
+            if descended:
+                continue
+            next_edge[vertex] = end
+            visiting.pop()
+            if root[vertex]:
+                index -= 1
+                component = [vertex]
+                while pending and rindex[vertex] <= rindex[pending[-1]]:
+                    member = pending.pop()
+                    rindex[member] = label
+                    index -= 1
+                    component.append(member)
+                rindex[vertex] = label
+                label -= 1
+                components.append(component)
+            else:
+                pending.append(vertex)
+
+    component_of = rindex
+    for vertex in range(n):
+        component_of[vertex] = n - 1 - component_of[vertex]
+
+    # Every vertex is pushed and popped once; an edge followed down is looked at again on the way back but counted once
+    record_search("tarjan_scc", edges_relaxed=len(targets), heap_pushes=n, heap_pops=n,
+                  nodes_expanded=n, peak_frontier=peak)
+    return components, component_of
@@ -0,0 +1,107 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from Graph_practical_work_02.bcc import biconnected, symmetric_csr
+from Graph_practical_work_02.block_cut_tree import BlockCutTree
+from Graph_practical_work_02.graph import Graph
+
+
+def random_graph(seed):
+    """A random graph whose edges are taken as undirected, given in one direction or both."""
+    rng = random.Random(seed)
+    n = rng.randint(1, 12)
+    g = Graph(n)
+    for _ in range(rng.randint(0, 2 * n)):
+        x, y = rng.randrange(n), rng.randrange(n)
+        g.add_edge(x, y, 1)
+        if rng.random() < 0.3:
+            g.add_edge(y, x, 1)
+    return g
+
+
+def neighbours(g):
+    """Undirected adjacency sets, without loops."""
+    adjacent = {vertex: set() for vertex in g.parse_vertices()}
+    for x, y, _ in g.edges.values():
+        if x != y:
+            adjacent[x].add(y)
+            adjacent[y].add(x)
+    return adjacent
+
+
+def connected(adjacent, u, v, removed=None, removed_edge=None):
+    seen, stack = {u}, [u]
+    while stack:
+        vertex = stack.pop()
+        for neighbour in adjacent[vertex]:
+            if neighbour != removed and {vertex, neighbour} != removed_edge and neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return v in seen
+
+
+def separators(adjacent, u, v):
+    return {x for x in adjacent if x not in (u, v) and not connected(adjacent, u, v, removed=x)}
+
+
+def component_count(adjacent, removed=None, removed_edge=None):
+    left, count = set(adjacent) - {removed}, 0
+    while left:
+        start = left.pop()
+        count += 1
+        left -= {v for v in list(left) if connected(adjacent, start, v, removed, removed_edge)}
+    return count
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_biconnected(seed):
+    g = random_graph(seed)
+    adjacent = neighbours(g)
+    n = len(adjacent)
+    _, offsets, targets = g.dense_csr()
+    blocks, cut_vertices, bridges = biconnected(n, *symmetric_csr(n, offsets, targets))
+
+    base = component_count(adjacent)
+    assert list(cut_vertices) == sorted(v for v in adjacent if component_count(adjacent, removed=v) > base)
+    assert sorted(tuple(sorted(bridge)) for bridge in bridges) == sorted(
+        (x, y) for x in adjacent for y in adjacent[x]
+        if x < y and component_count(adjacent, removed_edge={x, y}) > base)
+    for x in adjacent:  # Every edge lies in exactly one block
+        for y in adjacent[x]:
+            assert sum(x in block and y in block for block in blocks) == 1
+    for block in blocks:  # Nothing separates two vertices of a block
+        assert all(not separators(adjacent, u, v) for u, v in combinations(block, 2))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_block_cut_tree_queries(seed):
+    g = random_graph(seed)
+    adjacent = neighbours(g)
+    tree = BlockCutTree(g)
+    for u, v in combinations(adjacent, 2):
+        if not connected(adjacent, u, v):
+            assert not tree.connected(u, v)
+            assert tree.count_separating_vertices(u, v) is None and tree.separating_vertices(u, v) is None
+            continue
+        expected = separators(adjacent, u, v)
+        assert tree.connected(u, v)
+        assert tree.count_separating_vertices(u, v) == len(expected)
+        assert set(tree.separating_vertices(u, v)) == expected
+        assert tree.biconnected(u, v) == (not expected)
+        assert all(tree.separates(x, u, v) == (x in expected) for x in adjacent)
+    pairs = list(combinations(adjacent, 2))
+    assert tree.biconnected_pairs(pairs) == [tree.biconnected(u, v) for u, v in pairs]
+
+
+def test_block_cut_tree_with_labels():
+    g = Graph(None)
+    for label in ("a", "b", "c", "d"):
+        g.add_vertex(label)
+    for x, y in [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")]:
+        g.add_edge(x, y, 1)
+    tree = BlockCutTree(g)
+    assert tree.articulation_points == ["c"]
+    assert tree.separating_vertices("a", "d") == ["c"]
+    assert tree.biconnected("a", "b") and not tree.biconnected("a", "d")
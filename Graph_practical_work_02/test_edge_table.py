@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from Graph_practical_work_02.edge_table import EdgeTable
+from Graph_practical_work_02.graph import Graph
+
+
+def test_append_delete_and_iterate():
+    table = EdgeTable()
+    assert [table.append(0, 1, 5), table.append(1, 2, 6), table.append(2, 0, 7)] == [0, 1, 2]
+    del table[1]
+    assert len(table) == 2 and 1 not in table and table.get(1) is None
+    assert list(table.items()) == [(0, (0, 1, 5)), (2, (2, 0, 7))]
+    assert list(table.values()) == [(0, 1, 5), (2, 0, 7)] and list(table) == [0, 2]
+    assert table.append(3, 3, 3) == 3  # Ids are not reused
+    with pytest.raises(KeyError):
+        del table[1]
+    with pytest.raises(KeyError):
+        table["0"]
+
+
+def test_falls_back_to_lists_for_other_values():
+    table = EdgeTable()
+    table.append(0, 1, 2)
+    assert table.append("a", "b", 0.5) == 1
+    assert table[1] == ("a", "b", 0.5) and table[0] == (0, 1, 2)
+    copy = table.copy()
+    del copy[0]
+    assert 0 in table and len(copy) == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_removals_keep_the_table_and_edge_count(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 8)
+    g, model = Graph(n), {}
+    for step in range(150):
+        x, y = rng.randrange(n), rng.randrange(n)
+        operation = rng.random()
+        if operation < 0.5:
+            if x in g.out_neighbours and y in g.out_neighbours:
+                g.add_edge(x, y, step)
+                model.setdefault((x, y), step)
+        elif operation < 0.8:
+            g.remove_edge(x, y)
+            model.pop((x, y), None)
+        elif operation < 0.9:
+            if g.remove_vertex(x):
+                model = {pair: weight for pair, weight in model.items() if x not in pair}
+        elif x not in g.out_neighbours:
+            g.add_vertex(x)
+        assert g.edge_count == len(g.edges) == len(g.edge_index) == len(model)
+        assert {(source, target): weight for source, target, weight in g.edges.values()} == model
+        assert all(g.get_edge_by_id(edge_id)[:2] == pair for pair, edge_id in g.edge_index.items())
+
+
+def test_add_edge_rejects_missing_vertex():
+    g = Graph(2)
+    with pytest.raises(ValueError, match="Vertex does not exist"):
+        g.add_edge(0, 2, 1)
+    with pytest.raises(ValueError, match="Vertex does not exist"):
+        g.add_edge(2, 0, 1)
+    assert g.edge_count == 0 and g.out_neighbours == {0: [], 1: []} and g.in_neighbours == {0: [], 1: []}
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from Graph_practical_work_02.graph import Graph
+from Graph_practical_work_02.parallel_scc import parallel_scc
+from Graph_practical_work_02.scc import kosaraju, tarjan, transpose
+
+
+def random_csr(seed):
+    """A random digraph through Graph.dense_csr, loops and sparse parts included."""
+    rng = random.Random(seed)
+    n = rng.randint(1, 30)
+    g = Graph(n)
+    for _ in range(rng.randint(0, 2 * n)):
+        g.add_edge(rng.randrange(n), rng.randrange(n), 1)
+    _, offsets, targets = g.dense_csr()
+    return n, offsets, targets
+
+
+def brute_force_sccs(n, offsets, targets):
+    reach = []
+    for start in range(n):
+        seen, stack = {start}, [start]
+        while stack:
+            vertex = stack.pop()
+            for target in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        reach.append(seen)
+    return sorted({tuple(sorted(v for v in reach[u] if u in reach[v])) for u in range(n)})
+
+
+def as_partition(components):
+    return sorted(tuple(sorted(component)) for component in components)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_kosaraju_and_tarjan(seed):
+    n, offsets, targets = random_csr(seed)
+    expected = brute_force_sccs(n, offsets, targets)
+    assert as_partition(kosaraju(n, offsets, targets)) == expected
+    components, component_of = tarjan(n, offsets, targets)
+    assert as_partition(components) == expected
+    assert all(vertex in components[component_of[vertex]] for vertex in range(n))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_tarjan_finishes_components_in_reverse_topological_order(seed):
+    n, offsets, targets = random_csr(seed)
+    _, component_of = tarjan(n, offsets, targets)
+    for source in range(n):
+        for target in targets[offsets[source]:offsets[source + 1]]:
+            assert component_of[source] >= component_of[target]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_transpose(seed):
+    n, offsets, targets = random_csr(seed)
+    reverse_offsets, reverse_targets = transpose(n, offsets, targets)
+    edges = sorted((source, target) for source in range(n) for target in targets[offsets[source]:offsets[source + 1]])
+    reverse = sorted((source, target) for target in range(n)
+                     for source in reverse_targets[reverse_offsets[target]:reverse_offsets[target + 1]])
+    assert reverse == edges
+    assert all(list(reverse_targets[reverse_offsets[v]:reverse_offsets[v + 1]])
+               == sorted(reverse_targets[reverse_offsets[v]:reverse_offsets[v + 1]]) for v in range(n))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_scc(seed, workers):
+    n, offsets, targets = random_csr(seed)
+    components = parallel_scc(n, offsets, targets, workers=workers)
+    assert [tuple(component) for component in components] == sorted(brute_force_sccs(n, offsets, targets))
+
+
+def test_labels_are_mapped_back():
+    g = Graph(None)
+    for label in ("a", "b", "c"):
+        g.add_vertex(label)
+    g.add_edge("a", "b", 1)
+    g.add_edge("b", "a", 1)
+    vertex_map, offsets, targets = g.dense_csr()
+    components = [vertex_map.labels_of(component) for component in kosaraju(len(vertex_map), offsets, targets)]
+    assert as_partition(components) == [("a", "b"), ("c",)]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from Graph_practical_work_02.csgraph_backend import ComponentBackend
+from Graph_practical_work_02.graph import Graph
+from Graph_practical_work_02.union_find import DisjointSet, read_connectivity
+
+
+def brute_force_components(labels, edges):
+    component_of = {label: {label} for label in labels}
+    for x, y in edges:
+        if component_of[x] is not component_of[y]:
+            merged = component_of[x] | component_of[y]
+            for label in merged:
+                component_of[label] = merged
+    return sorted(sorted(component) for component in {id(c): c for c in component_of.values()}.values())
+
+
+def as_partition(components):
+    return sorted(sorted(component) for component in components)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_disjoint_set(seed):
+    rng = random.Random(seed)
+    labels = list(range(rng.randint(1, 40)))
+    edges = [(rng.choice(labels), rng.choice(labels)) for _ in range(rng.randint(0, 40))]
+    sets = DisjointSet(labels)
+    merges = sum(sets.union(x, y) for x, y in edges)
+    expected = brute_force_components(labels, edges)
+    assert as_partition(sets.components()) == expected
+    assert sets.count == len(expected) == len(labels) - merges
+    for x, y in edges[:10]:
+        assert sets.connected(x, y) and not sets.union(x, y)
+
+
+def test_labels_and_errors():
+    sets = DisjointSet(["a", "b", (1, 2)])
+    assert sets.union_edges([("a", (1, 2), 5), ("a", "b")]) == 2 and sets.count == 1
+    assert sets.add("a") == sets.add("a") and len(sets) == 3 and "c" not in sets
+    with pytest.raises(KeyError):
+        sets.connected("a", "c")
+
+
+def test_track_connectivity_follows_the_graph():
+    g = Graph(5)
+    connectivity = g.track_connectivity()
+    g.add_edge(0, 1, 1)
+    g.add_vertex(5)
+    g.add_edge(5, 4, 1)
+    assert connectivity.connected(0, 1) and connectivity.connected(4, 5) and not connectivity.connected(1, 4)
+    assert connectivity.count == 4
+    g.remove_edge(0, 1)
+    assert g.connectivity is None  # A removal cannot be undone in the sets
+    assert not g.track_connectivity().connected(0, 1)
+
+
+def test_read_connectivity(tmp_path):
+    file_name = tmp_path / "graph.txt"
+    file_name.write_text("5 3\n0 1 4\n\n3 4 1\n1 0 2\n")
+    assert as_partition(read_connectivity(str(file_name)).components()) == [[0, 1], [2], [3, 4]]
+
+
+@pytest.mark.parametrize("connection", ["weak", "strong"])
+def test_component_backend_engines_agree(connection):
+    rng = random.Random(3)
+    g = Graph(20)
+    for _ in range(25):
+        g.add_edge(rng.randrange(20), rng.randrange(20), 1)
+    python = ComponentBackend(g, use_scipy=False)
+    assert not python.uses_scipy
+    assert as_partition(python.components(connection)) == as_partition(ComponentBackend(g).components(connection))
+    with pytest.raises(ValueError):
+        python.components("sideways")
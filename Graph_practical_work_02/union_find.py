@@ -0,0 +1,124 @@
+from array import array
+
+from Graph_practical_work_02.vertex_map import VertexMap
+
+
+class DisjointSet:
+    """
+    Disjoint sets of vertex labels (union by rank, path compression), for incremental connectivity:
+    unions and queries take amortized O(alpha(n)), so components can be followed while edges keep
+    arriving instead of traversing the graph again after each one. Edges are taken as undirected.
+    """
+
+    def __init__(self, labels=()):
+        """
+        :param labels: iterable of labels, each starting as a set of its own
+        """
+        self._vertex_map = VertexMap()
+        self._parent = array("q")  # Dense id -> parent dense id, roots are their own parent
+        self._rank = bytearray()  # Upper bound of the height of a root's tree, never above log2(n)
+        self.count = 0  # Number of disjoint sets
+        for label in labels:
+            self.add(label)
+
+    def add(self, label):
+        """
+        Adds a label as a set of its own; a known label is left as it is.
+        :return: dense id of the label
+        """
+        vertex_id = self._vertex_map.intern(label)
+        if vertex_id == len(self._parent):
+            self._parent.append(vertex_id)
+            self._rank.append(0)
+            self.count += 1
+        return vertex_id
+
+    def _find(self, vertex_id):
+        """Returns the root of a dense id, pointing the whole path straight at it."""
+        parent = self._parent
+        root = vertex_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[vertex_id] != root:
+            next_id = parent[vertex_id]
+            parent[vertex_id] = root
+            vertex_id = next_id
+        return root
+
+    def find(self, label):
+        """
+        Returns the representative of the set containing label.
+        :raises KeyError: if the label was never added
+        """
+        return self._vertex_map.label_of(self._find(self._vertex_map.id_of(label)))
+
+    def union(self, x, y):
+        """
+        Merges the sets of x and y, adding the labels that are new.
+        :return: True if two sets were merged, False if x and y were already connected
+        """
+        x_root = self._find(self.add(x))
+        y_root = self._find(self.add(y))
+        if x_root == y_root:
+            return False
+        rank = self._rank
+        if rank[x_root] < rank[y_root]:
+            x_root, y_root = y_root, x_root
+        self._parent[y_root] = x_root
+        if rank[x_root] == rank[y_root]:
+            rank[x_root] += 1
+        self.count -= 1
+        return True
+
+    def union_edges(self, edges):
+        """
+        Feeds a stream of edges, consumed one at a time.
+        :param edges: iterable of (x, y) or (x, y, weight)
+        :return: number of unions that merged two sets
+        """
+        merged = 0
+        union = self.union
+        for edge in edges:
+            merged += union(edge[0], edge[1])
+        return merged
+
+    def connected(self, x, y):
+        """
+        Returns True if x and y are in the same set.
+        :raises KeyError: if a label was never added
+        """
+        id_of = self._vertex_map.id_of
+        return self._find(id_of(x)) == self._find(id_of(y))
+
+    def components(self):
+        """
+        Lists the sets, ordered by their first added label, each in the order its labels were added.
+        :return: list of lists of labels
+        """
+        groups = {}
+        for vertex_id, label in enumerate(self._vertex_map):
+            groups.setdefault(self._find(vertex_id), []).append(label)
+        return list(groups.values())
+
+    def __len__(self):
+        return len(self._parent)
+
+    def __contains__(self, label):
+        return label in self._vertex_map
+
+
+def read_connectivity(file_name):
+    """
+    Builds the connectivity of a graph file (first line "vertices edges", then "source target weight"
+    lines) streaming the edges, without building the Graph.
+    :param file_name: The filename from which the edges are read.
+    :return: DisjointSet over the vertices 0 .. vertices-1
+    """
+    with open(file_name, "r") as f:
+        number_vertices, _ = map(int, f.readline().split())
+        connectivity = DisjointSet(range(number_vertices))
+        for line in f:
+            fields = line.split()
+            if fields:
+                connectivity.union(int(fields[0]), int(fields[1]))
+    return connectivity
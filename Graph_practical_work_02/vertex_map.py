@@ -0,0 +1,81 @@
+class VertexMap:
+    """
+    Interns arbitrary vertex labels (large or sparse ints, strings, tuples, ...) to dense ids
+    0 .. n-1, so that algorithms can keep their per-vertex state in flat lists and arrays,
+    and maps the ids back to labels on output.
+    When the labels already are 0 .. n-1 the map is the identity and stores nothing.
+    """
+
+    def __init__(self, labels=()):
+        """
+        :param labels: iterable of labels, interned in iteration order
+        """
+        self._labels = None  # None while the map is the identity over 0 .. _size-1
+        self._ids = None
+        self._size = 0
+        for label in labels:
+            self.intern(label)
+
+    def intern(self, label):
+        """
+        Returns the dense id of a label, giving it the next free id if it is new.
+        :param label: vertex label
+        :return: dense id
+        """
+        if self._labels is None:
+            if isinstance(label, int) and 0 <= label <= self._size:
+                if label == self._size:  # Still 0 .. n-1 after adding the next integer
+                    self._size += 1
+                return label
+            self._materialize()
+        vertex_id = self._ids.get(label)
+        if vertex_id is None:
+            vertex_id = self._ids[label] = len(self._labels)
+            self._labels.append(label)
+        return vertex_id
+
+    def id_of(self, label):
+        """
+        Returns the dense id of a known label.
+        :raises KeyError: if the label was never interned
+        """
+        if self._labels is None:
+            if isinstance(label, int) and 0 <= label < self._size:
+                return label
+            raise KeyError(label)
+        return self._ids[label]
+
+    def label_of(self, vertex_id):
+        """Returns the label behind a dense id."""
+        if self._labels is None:
+            if not 0 <= vertex_id < self._size:
+                raise IndexError(vertex_id)
+            return vertex_id
+        return self._labels[vertex_id]
+
+    def labels_of(self, vertex_ids):
+        """Maps a list of dense ids back to labels."""
+        if self._labels is None:
+            return list(vertex_ids)
+        labels = self._labels
+        return [labels[vertex_id] for vertex_id in vertex_ids]
+
+    def is_identity(self):
+        """Returns True if every label is its own id."""
+        return self._labels is None
+
+    def _materialize(self):
+        """Switches from the identity representation to explicit tables."""
+        self._labels = list(range(self._size))
+        self._ids = {label: label for label in self._labels}
+
+    def __len__(self):
+        return self._size if self._labels is None else len(self._labels)
+
+    def __contains__(self, label):
+        if self._labels is None:
+            return isinstance(label, int) and 0 <= label < self._size
+        return label in self._ids
+
+    def __iter__(self):
+        return iter(range(self._size) if self._labels is None else self._labels)
@@ -2,7 +2,9 @@ import random
 import copy
 import heapq
 
-from fontTools.ttLib.ttVisitor import visit
+from edge_table import EdgeTable
+from graph_common.memory_usage import deep_sizeof, track_memory
+from graph_common.search_stats import record_search
 
 
 class Graph:
@@ -14,7 +16,9 @@ class Graph:
         :param v: Can be an integer for the number of vertices or a string with the filename to read from.
         """
         self.out_neighbours = {}  # Adjacency list (with weights)
-        self.edges = {}  # Mapping EDGE_ID -> (source, target, weight)
+        self.predecessors = {}  # Mapping vertex -> sources of its inbound edges, so remove_vertex can unlink them
+        self.edges = EdgeTable()  # Mapping EDGE_ID -> (source, target, weight), stored as typed arrays
+        self.edge_index = {}  # Mapping (source, target) -> EDGE_ID, IDs of removed edges are not reused
         self.edge_count = 0
 
         # If v is a filename (string), read the graph from the file
@@ -24,6 +28,7 @@ class Graph:
         elif isinstance(v, int):
             for vertex in range(v):
                 self.out_neighbours[vertex] = []
+                self.predecessors[vertex] = []
     def get_out_neighbours_for_vertex(self,vertex):
         """
         Returns the out neighbours of a vertex
@@ -55,23 +60,38 @@ class Graph:
             self.add_vertex(x)
 
         # Add the edge if it doesn't already exist
-        if y not in [neighbor for neighbor, _ in self.out_neighbours[x]]:
+        if (x, y) not in self.edge_index:
             self.out_neighbours[x].append((y, weight))
-            self.edges[self.edge_count] = (x, y, weight)
+            self.predecessors.setdefault(y, []).append(x)
+            self.edge_index[(x, y)] = self.edges.append(x, y, weight)
             self.edge_count += 1
         return True
 
     def remove_edge(self, x, y):
         """Removes the directed edge from x to y."""
+        if (x, y) not in self.edge_index:
+            return False
         for i, (neighbor, weight) in enumerate(self.out_neighbours[x]):
             if neighbor == y:
                 del self.out_neighbours[x][i]
+                del self.edges[self.edge_index.pop((x, y))]
+                self.edge_count -= 1
+                self.predecessors[y].remove(x)
                 return True
 
     def remove_vertex(self, x):
-        """Removes vertex x from the graph."""
+        """Removes vertex x and all its inbound and outbound edges, found through its own adjacency lists."""
         if x in self.out_neighbours:
-            del self.out_neighbours[x]
+            for neighbor, _ in self.out_neighbours.pop(x):
+                del self.edges[self.edge_index.pop((x, neighbor))]
+                self.edge_count -= 1
+                if neighbor != x:
+                    self.predecessors[neighbor].remove(x)
+            for source in self.predecessors.pop(x, ()):
+                if source != x:  # A loop was unindexed with the outbound edges
+                    del self.edges[self.edge_index.pop((source, x))]
+                    self.edge_count -= 1
+                    self.out_neighbours[source] = [(t, w) for t, w in self.out_neighbours[source] if t != x]
             return True
         else:
             return False
@@ -80,6 +100,7 @@ class Graph:
         """Adds vertex x to the graph."""
         if x not in self.out_neighbours:
             self.out_neighbours[x] = []
+            self.predecessors.setdefault(x, [])  # Edges to x may have been added before x itself
         else:
             raise ValueError("Vertex already exists")
 
@@ -112,16 +133,23 @@ class Graph:
 
     def is_edge(self, x, y):
         """
-        Returns True if there is an edge from x to y in the graph.
+        Checks in O(1) whether there is an edge from x to y in the graph.
         :param x: source vertex
         :param y: target vertex
         :return: returns the edge_id from x to y if it exists, otherwise None
         """
-        for edge_id in range(self.edge_count):
-            source, target, _ = self.edges[edge_id]
-            if source == x and target == y:
-                return edge_id
-        return None
+        return self.edge_index.get((x, y))
+
+    def memory_report(self):
+        """
+        Breaks the memory held by the graph down by structure (containers, tuples and ints included;
+        an object referenced by two structures is counted in the first one).
+        :return: dict structure name -> bytes, plus "total"
+        """
+        seen = set()
+        report = {name: deep_sizeof(getattr(self, name), seen) for name in ("out_neighbours", "predecessors", "edges", "edge_index")}
+        report["total"] = sum(report.values())
+        return report
 
     def generate_random_graph(self, number_vertices, number_edges):
         """
@@ -144,10 +172,13 @@ class Graph:
         """
         new_graph = Graph()
         new_graph.out_neighbours = copy.deepcopy(self.out_neighbours)
-        new_graph.edges = copy.deepcopy(self.edges)
+        new_graph.predecessors = {vertex: list(sources) for vertex, sources in self.predecessors.items()}
+        new_graph.edges = self.edges.copy()
+        new_graph.edge_index = dict(self.edge_index)
         new_graph.edge_count = self.edge_count
         return new_graph
 
+    @track_memory
     def count_min_cost_walks(self, start_vertex, end_vertex):
         """
         Counts the number of distinct walks of minimum cost between start_vertex and end_vertex
@@ -171,12 +202,15 @@ class Graph:
         # implemented as a heap to precess vertices in the order of increasing distance
         visited = set()
         priority_queue = [(0, start_vertex)]  # (distance, vertex) #Starts with start_vertex having a distance of 0
+        pushes, pops, stale, relaxed, peak = 1, 0, 0, 0, 1  # Work counters for search_stats
 
 
         while priority_queue:
             current_distance, current_vertex = heapq.heappop(priority_queue)
+            pops += 1
 
             if current_vertex in visited: # Skip if already visited
+                stale += 1
                 continue
             visited.add(current_vertex) # Add current vertex to visited set
 
@@ -184,6 +218,7 @@ class Graph:
             # the new_distace to reach that neighbor by adding the edge weight to current_distance
 
             for neighbor, weight in self.out_neighbours[current_vertex]:
+                relaxed += 1
                 new_distance = current_distance + weight
 
                 # If the new distance is less than the current known distance, update it
@@ -194,6 +229,9 @@ class Graph:
                     #Because it is the minimum cost path to reach the neighbor
                     paths[neighbor] = [path + [neighbor] for path in paths[current_vertex]]
                     heapq.heappush(priority_queue, (new_distance, neighbor))
+                    pushes += 1
+                    if len(priority_queue) > peak:
+                        peak = len(priority_queue)
 
                 #We add the new paths from current_vertex to neighbor to the paths dictionary and increment the path_count
                 elif new_distance == distances[neighbor]:
@@ -201,6 +239,9 @@ class Graph:
                     path_count[neighbor] += path_count[current_vertex]
                     paths[neighbor].extend(path + [neighbor] for path in paths[current_vertex])
 
+        record_search("Graph.count_min_cost_walks", edges_relaxed=relaxed, heap_pushes=pushes, heap_pops=pops,
+                      stale_pops=stale, nodes_expanded=len(visited), peak_frontier=peak)
+
         # Print all walks of minimum cost
         print(f"All distinct walks of minimum cost from {start_vertex} to {end_vertex}:")
         for walk in paths[end_vertex]:
@@ -208,6 +249,7 @@ class Graph:
 
         return path_count[end_vertex]
 
+    @track_memory
     def dijkstra(self, start_vertex):
         """
         Dijkstra's algorithm to find the shortest path from a starting vertex to all other vertices.
@@ -222,17 +264,21 @@ class Graph:
 
         # Priority queue setup
         priority_queue = [(0, start_vertex)]  # (distance, vertex)
+        pushes, pops, stale, relaxed, peak = 1, 0, 0, 0, 1  # Work counters for search_stats
 
         while priority_queue:
             current_distance, current_vertex = heapq.heappop(priority_queue)
+            pops += 1
 
             # Skip if already visited
             if current_vertex in visited:
+                stale += 1
                 continue
             visited.add(current_vertex)
 
             # Update neighboring vertices
             for neighbor, weight in self.out_neighbours[current_vertex]:
+                relaxed += 1
                 if neighbor not in visited:
                     new_distance = current_distance + weight
                     # Relaxation: Update distance if a shorter path is found
@@ -240,7 +286,12 @@ class Graph:
                         distances[neighbor] = new_distance
                         parents[neighbor] = current_vertex
                         heapq.heappush(priority_queue, (new_distance, neighbor))
+                        pushes += 1
+                        if len(priority_queue) > peak:
+                            peak = len(priority_queue)
 
+        record_search("Graph.dijkstra", edges_relaxed=relaxed, heap_pushes=pushes, heap_pops=pops,
+                      stale_pops=stale, nodes_expanded=len(visited), peak_frontier=peak)
         return distances, parents
     def print_graph(graph):
         """
@@ -302,14 +353,15 @@ def run_bonus_1():
     print(f"Number of distinct walks of minimum cost from {start_vertex} to {end_vertex}: {result}")
 
 
-print("_______________RUNNING PROBLEM_________________")
+if __name__ == "__main__":
+    print("_______________RUNNING PROBLEM_________________")
 
-#run_problem_large_graph()          #!!!!!!!!!!!!!!!!!!!!!!!
-run_problem1_simple_graph()
+    #run_problem_large_graph()          #!!!!!!!!!!!!!!!!!!!!!!!
+    run_problem1_simple_graph()
 
 
-print("_______________RUNNING BONUS 1_________________")
-run_bonus_1()
+    print("_______________RUNNING BONUS 1_________________")
+    run_bonus_1()
 
 
 
@@ -327,6 +379,7 @@ class DAG:
         self.graph[u].append(v)  # u -> v is a directed edge
         self.in_degree[v] += 1   # increase in-degree of v
 
+    @track_memory
     def count_walks(self, start, end):
         # Step 1: Topological Sort (Kahn's Algorithm)
         topo_order = [] # Will store vertices in topological order
@@ -366,8 +419,9 @@ def run_bonus_2():
 
     print(f"Number of distinct walks from {start_vertex} to {end_vertex}:",
           dag.count_walks(start_vertex, end_vertex))
-print("_______________RUNNING BONUS 2_________________")
-run_bonus_2()                    #  !!!!!!!!!!!!!!!!!!!!!!!
+if __name__ == "__main__":
+    print("_______________RUNNING BONUS 2_________________")
+    run_bonus_2()                    #  !!!!!!!!!!!!!!!!!!!!!!!
 
 
 
@@ -376,6 +430,7 @@ run_bonus_2()                    #  !!!!!!!!!!!!!!!!!!!!!!!
 
 import heapq
 
+@track_memory
 def bridge_and_torch(times):
     """
     Solves the Bridge and Torch problem using the A* search algorithm.
@@ -441,23 +496,37 @@ def bridge_and_torch(times):
         """
         queue = [(heuristic(start), 0, start, [])]  # Priority queue: (estimated total cost, cost so far, state, path)
         visited = {}  # Dictionary to track visited states and their costs
+        pushes, pops, stale, relaxed, expanded, peak = 1, 0, 0, 0, 0, 1  # Work counters for search_stats
+
+        def report():
+            record_search("bridge_and_torch.a_star", edges_relaxed=relaxed, heap_pushes=pushes, heap_pops=pops,
+                          stale_pops=stale, nodes_expanded=expanded, peak_frontier=peak)
 
         while queue:
             est_total_cost, cost_so_far, current_state, path = heapq.heappop(queue)
+            pops += 1
 
             if is_goal(current_state):  # If the goal state is reached
+                report()
                 return cost_so_far, path
 
             if current_state in visited and visited[current_state] <= cost_so_far:
+                stale += 1
                 continue  # Skip if the state has already been visited with a lower cost
             visited[current_state] = cost_so_far  # Mark the state as visited
+            expanded += 1
 
             # Explore neighbors
             for next_state, transition_cost, moved_people in neighbors(current_state):
+                relaxed += 1
                 new_cost = cost_so_far + transition_cost
                 new_path = path + [(current_state, moved_people, transition_cost)]
                 est = new_cost + heuristic(next_state)  # Calculate the estimated total cost
                 heapq.heappush(queue, (est, new_cost, next_state, new_path))
+                pushes += 1
+                if len(queue) > peak:
+                    peak = len(queue)
+        report()
         return None  # Return None if no solution is found
 
     result = a_star(start_state)  # Run the A* algorithm
@@ -477,11 +546,12 @@ def bridge_and_torch(times):
         print(f"Step {idx+1}: {names} {move_direction}  ({cost} min)")
 
     return total_time
-print("_______________RUNNING BONUS 3_________________")
+if __name__ == "__main__":
+    print("_______________RUNNING BONUS 3_________________")
 
-#Example usage:
-times = [1, 2, 5, 10]              #!!!!!!!!!!!!!!!!!!!!!!!
-bridge_and_torch(times)
+    #Example usage:
+    times = [1, 2, 5, 10]              #!!!!!!!!!!!!!!!!!!!!!!!
+    bridge_and_torch(times)
 
 
 
@@ -0,0 +1,81 @@
+from array import array
+from collections.abc import Mapping
+from itertools import compress
+
+
+class EdgeTable(Mapping):
+    """
+    EDGE_ID -> (source, target, weight) table for a graph that numbers its edges 0, 1, 2, ... in the
+    order they are added: three parallel typed arrays indexed by EDGE_ID. A removed edge leaves a dead
+    slot behind and its id is not handed out again, so the ids of the other edges stay valid.
+
+    An edge costs three machine ints and a liveness byte instead of a dict entry, a 3-tuple and three
+    boxed ints; the tuple is only built when an edge is read. If a vertex or weight is not a machine int
+    (a string label, a float cost, ...) the arrays are turned into plain lists, so any value still fits.
+    """
+
+    def __init__(self):
+        self.sources = array("q")
+        self.targets = array("q")
+        self.weights = array("q")
+        self.alive = bytearray()  # alive[EDGE_ID] is 1 while the edge exists
+        self._count = 0
+
+    def append(self, source, target, weight):
+        """
+        Stores an edge under the next EDGE_ID, one past the last slot (dead ones included).
+        :return: the EDGE_ID of the edge
+        """
+        size = len(self.weights)
+        try:
+            self.sources.append(source)
+            self.targets.append(target)
+            self.weights.append(weight)
+        except (TypeError, OverflowError):  # Not a machine int: fall back to lists, dropping the partial append
+            self.sources, self.targets, self.weights = (list(column[:size])
+                                                        for column in (self.sources, self.targets, self.weights))
+            self.sources.append(source)
+            self.targets.append(target)
+            self.weights.append(weight)
+        self.alive.append(1)
+        self._count += 1
+        return size
+
+    def __getitem__(self, edge_id):
+        if edge_id in self:
+            return self.sources[edge_id], self.targets[edge_id], self.weights[edge_id]
+        raise KeyError(edge_id)
+
+    def __delitem__(self, edge_id):
+        if edge_id not in self:
+            raise KeyError(edge_id)
+        self.alive[edge_id] = 0
+        self._count -= 1
+
+    def __contains__(self, edge_id):
+        return isinstance(edge_id, int) and 0 <= edge_id < len(self.alive) and self.alive[edge_id] == 1
+
+    def __iter__(self):
+        return compress(range(len(self.alive)), self.alive)
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        """Yields (source, target, weight) for every live edge in EDGE_ID order."""
+        return compress(zip(self.sources, self.targets, self.weights), self.alive)
+
+    def items(self):
+        """Yields (EDGE_ID, (source, target, weight)) for every live edge in EDGE_ID order."""
+        return compress(enumerate(zip(self.sources, self.targets, self.weights)), self.alive)
+
+    def copy(self):
+        """Returns an independent copy of the table."""
+        table = EdgeTable()
+        table.sources, table.targets, table.weights = self.sources[:], self.targets[:], self.weights[:]
+        table.alive = bytearray(self.alive)
+        table._count = self._count
+        return table
+
+    def __repr__(self):
+        return f"EdgeTable({dict(self.items())})"
@@ -2,6 +2,9 @@ import random
 import copy
 from collections import deque
 
+from edge_table import EdgeTable
+from graph_common.memory_usage import deep_sizeof, track_memory
+
 
 class Graph:
     def __init__(self, v=None):
@@ -12,7 +15,7 @@ class Graph:
         :param v: Can be an integer for the number of vertices or a string with the filename to read from.
         """
         self.out_neighbours = {}  # Adjacency list (with weights)
-        self.edges = {}  # Mapping EDGE_ID -> (source, target, weight)
+        self.edges = EdgeTable()  # Mapping EDGE_ID -> (source, target, weight), stored as typed arrays
         self.edge_count = 0
 
         if isinstance(v, str):  # If v is a filename, read the graph from the file
@@ -39,7 +42,7 @@ class Graph:
         """Adds a directed edge from x to y with a given weight."""
         if y not in [neighbor for neighbor, _ in self.out_neighbours.get(x, [])]:
             self.out_neighbours.setdefault(x, []).append((y, weight))
-            self.edges[self.edge_count] = (x, y, weight)
+            self.edges.append(x, y, weight)
             self.edge_count += 1
 
     def remove_edge(self, x, y):
@@ -83,6 +86,17 @@ class Graph:
         """Returns True if there is an edge from x to y in the graph."""
         return any(neighbor == y for neighbor, _ in self.out_neighbours.get(x, []))
 
+    def memory_report(self):
+        """
+        Breaks the memory held by the graph down by structure (containers, tuples and ints included;
+        an object referenced by two structures is counted in the first one).
+        :return: dict structure name -> bytes, plus "total"
+        """
+        seen = set()
+        report = {name: deep_sizeof(getattr(self, name), seen) for name in ("out_neighbours", "edges")}
+        report["total"] = sum(report.values())
+        return report
+
     def generate_random_graph(self, number_vertices, number_edges):
         """Generates a random graph."""
         self.__init__(number_vertices)
@@ -97,7 +111,7 @@ class Graph:
         """Creates a deep copy of the graph."""
         new_graph = Graph()
         new_graph.out_neighbours = copy.deepcopy(self.out_neighbours)
-        new_graph.edges = copy.deepcopy(self.edges)
+        new_graph.edges = self.edges.copy()
         new_graph.edge_count = self.edge_count
         return new_graph
 
@@ -106,9 +120,7 @@ def write_to_file(graph: Graph, file_name):
     """Writes the graph to a file."""
     with open(file_name, "w") as f:
         f.write(f"{graph.get_number_vertices()} {graph.edge_count}\n")
-        for edge_id in range(graph.edge_count):
-            source, target, weight = graph.get_edge_by_id(edge_id)
-            f.write(f"{source} {target} {weight}\n")
+        f.writelines(f"{source} {target} {weight}\n" for source, target, weight in graph.edges.values())
 
 
 def is_dag(graph: Graph):
@@ -133,6 +145,7 @@ def is_dag(graph: Graph):
 
 
 
+@track_memory
 def topological_sort(graph: Graph):
     """Performs a topological sorting of the graph."""
     in_degree = {vertex: 0 for vertex in graph.parse_vertices()} # Initialize in-degree of all vertices
@@ -155,6 +168,7 @@ def topological_sort(graph: Graph):
     return sorted_queue # Topologically sorted vertices
 
 
+@track_memory
 def longest_path(graph: Graph, start: int, finish: int):
     """Finds the longest path between two vertices in a directed graph."""
     if not is_dag(graph):
@@ -235,6 +249,7 @@ def print_tree(node, level=0, is_left=None):
 
 #_________________________BONUS 2_____________________
 
+@track_memory
 def bonus_2(graph : Graph):
     """
     Verify if it is a DAG.
@@ -259,6 +274,7 @@ def bonus_2(graph : Graph):
 
 #_________________________BONUS 3_____________________
 
+@track_memory
 def bonus_3(graph : Graph):
     """
     Given a weighted graph:
@@ -311,86 +327,87 @@ if __name__ == "__main__":
         print(e)
 
 
-#_____________________BONUS 1_____________________
-print("__________Reconstructing tree from lists____________")
-preorder = ['A', 'B', 'C', 'D', 'E']
-inorder = ['B', 'A', 'D', 'C', 'E']
-postorder = ['B', 'D', 'E', 'C', 'A']
-tree = reconstruct_tree(preorder, postorder, inorder)
-print_tree(tree)
-"""
-      A
-     / \
-    B   C
-       / \
-      D   E`
-
-"""
-preorder = [10, 5, 20, 15, 25]
-postorder = [5, 15, 25, 20, 10]
-inorder = [5, 10, 15, 20, 25]
-tree = reconstruct_tree(preorder, postorder, inorder)
-print_tree(tree)
-"""
-      10
-     /  \
-    5    20
-        /  \
-      15    25
-"""
+if __name__ == "__main__":
+    #_____________________BONUS 1_____________________
+    print("__________Reconstructing tree from lists____________")
+    preorder = ['A', 'B', 'C', 'D', 'E']
+    inorder = ['B', 'A', 'D', 'C', 'E']
+    postorder = ['B', 'D', 'E', 'C', 'A']
+    tree = reconstruct_tree(preorder, postorder, inorder)
+    print_tree(tree)
+    """
+          A
+         / \
+        B   C
+           / \
+          D   E`
 
-#_________________________BONUS 2_____________________
-print("__________Counting paths in DAG____________")
-graph = Graph("graph.txt")
-number_paths_graph = bonus_2(graph)
-print("Number of paths from start(vertex 0) to each vertex:")
-for vertex, count in number_paths_graph.items():
-    print(f"Vertex {vertex}: {count} paths")
-
-try:
-    number_paths_graph_no_dag = bonus_2(graph_no_DAG)
-    print("Number of paths from start to each vertex:")
-    for vertex, count in number_paths_graph_no_dag.items():
+    """
+    preorder = [10, 5, 20, 15, 25]
+    postorder = [5, 15, 25, 20, 10]
+    inorder = [5, 10, 15, 20, 25]
+    tree = reconstruct_tree(preorder, postorder, inorder)
+    print_tree(tree)
+    """
+          10
+         /  \
+        5    20
+            /  \
+          15    25
+    """
+
+    #_________________________BONUS 2_____________________
+    print("__________Counting paths in DAG____________")
+    graph = Graph("graph.txt")
+    number_paths_graph = bonus_2(graph)
+    print("Number of paths from start(vertex 0) to each vertex:")
+    for vertex, count in number_paths_graph.items():
         print(f"Vertex {vertex}: {count} paths")
-except ValueError as e:
-    print(e)
 
+    try:
+        number_paths_graph_no_dag = bonus_2(graph_no_DAG)
+        print("Number of paths from start to each vertex:")
+        for vertex, count in number_paths_graph_no_dag.items():
+            print(f"Vertex {vertex}: {count} paths")
+    except ValueError as e:
+        print(e)
 
-#_________________________BONUS 3_____________________
-print("__________Counting lowest-cost paths in DAG____________")
-graph = Graph("graph_bonus_3.txt")
-
-number_paths_graph = bonus_3(graph)
-print("Number of lowest-cost paths from start(vertex 0) to each vertex:")
-for vertex, count in number_paths_graph.items():
-    print(f"Vertex {vertex}: {count} paths")
-try:
-    number_paths_graph_no_dag = bonus_3(graph_no_DAG)
-    print("Number of lowest-cost paths from start to each vertex:")
-    for vertex, count in number_paths_graph_no_dag.items():
+
+    #_________________________BONUS 3_____________________
+    print("__________Counting lowest-cost paths in DAG____________")
+    graph = Graph("graph_bonus_3.txt")
+
+    number_paths_graph = bonus_3(graph)
+    print("Number of lowest-cost paths from start(vertex 0) to each vertex:")
+    for vertex, count in number_paths_graph.items():
         print(f"Vertex {vertex}: {count} paths")
-except ValueError as e:
-    print(e)
-
-#Modified graph_bonus_3.txt for testing, path from 2 -> 4 is 5 instead of 3 -> modified output for lowest cost path from 0 -> 4
-"""
-6 8
-0 1 1
-0 2 1
-1 3 2
-2 3 2
-1 4 3
-2 4 3
-3 5 1
-4 5 1"""
-"""
-6 8
-0 1 1
-0 2 1
-1 3 2
-2 3 2
-1 4 3
-2 4 5
-3 5 1
-4 5 1
-"""
+    try:
+        number_paths_graph_no_dag = bonus_3(graph_no_DAG)
+        print("Number of lowest-cost paths from start to each vertex:")
+        for vertex, count in number_paths_graph_no_dag.items():
+            print(f"Vertex {vertex}: {count} paths")
+    except ValueError as e:
+        print(e)
+
+    #Modified graph_bonus_3.txt for testing, path from 2 -> 4 is 5 instead of 3 -> modified output for lowest cost path from 0 -> 4
+    """
+    6 8
+    0 1 1
+    0 2 1
+    1 3 2
+    2 3 2
+    1 4 3
+    2 4 3
+    3 5 1
+    4 5 1"""
+    """
+    6 8
+    0 1 1
+    0 2 1
+    1 3 2
+    2 3 2
+    1 4 3
+    2 4 5
+    3 5 1
+    4 5 1
+    """
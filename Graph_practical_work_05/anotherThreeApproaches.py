@@ -1,12 +1,14 @@
 
 from graph import Graph
+from graph_common.memory_usage import track_memory
 import random
 
+@track_memory
 def high_degree_vertex_cover(graph: Graph):
     """
     Heuristic approach: repeatedly pick the vertex with the highest degree.
     """
-    g_copy = graph.deepcopy()  # Make a copy to preserve the original graph
+    g_copy = graph.snapshot()  # Make a copy-on-write snapshot to preserve the original graph
     cover = set()  # This will store the selected vertex cover
 
     # Repeat until all edges are removed
@@ -18,24 +20,20 @@ def high_degree_vertex_cover(graph: Graph):
         u = max(degrees, key=degrees.get)
         cover.add(u)  # Add it to the cover
 
-        # Remove all edges incident to this vertex
-        incident_edges = list(g_copy.edges.items())
-        for eid, (x, y, _) in incident_edges:
-            if x == u or y == u:
-                g_copy.remove_edge(x, y)
-                if eid in g_copy.edges:
-                    del g_copy.edges[eid]
-                    g_copy.edge_count -= 1  # Keep edge count in sync
+        # Remove all edges incident to this vertex, found through its adjacency list
+        for neighbour, _ in list(g_copy.out_neighbours[u]):
+            g_copy.remove_edge_by_id(g_copy.is_edge(u, neighbour))  # Keeps the edge table and edge count in sync
 
     return cover
 
+@track_memory
 def edge_density_vertex_cover(graph: Graph):
     """
     Heuristic approach: pick vertices covering the most uncovered edges.
     Similar to the high-degree method, but recalculates "edge frequency"
     for all vertices based on current uncovered edges.
     """
-    g_copy = graph.deepcopy()  # Work on a copy
+    g_copy = graph.snapshot()  # Work on a copy-on-write snapshot
     cover = set()
 
     # Loop until no edges are left
@@ -52,23 +50,19 @@ def edge_density_vertex_cover(graph: Graph):
         cover.add(best)  # Add it to the cover
 
         # Remove all incident edges from the graph
-        incident_edges = list(g_copy.edges.items())
-        for eid, (x, y, _) in incident_edges:
-            if x == best or y == best:
-                g_copy.remove_edge(x, y)
-                if eid in g_copy.edges:
-                    del g_copy.edges[eid]
-                    g_copy.edge_count -= 1
+        for neighbour, _ in list(g_copy.out_neighbours[best]):
+            g_copy.remove_edge_by_id(g_copy.is_edge(best, neighbour))
 
     return cover
 
 
+@track_memory
 def hybrid_greedy_matching_vertex_cover(graph: Graph):
     """
     Hybrid approach: Combines greedy matching with vertex cover.
     Selects non-visited vertex pairs and adds both endpoints to the cover.
     """
-    g_copy = graph.deepcopy()
+    g_copy = graph.snapshot()
     cover = set()      # Set of vertices in the cover
     visited = set()    # Set of already selected (covered) vertices
 
@@ -0,0 +1,114 @@
+from array import array
+from collections.abc import MutableMapping
+from itertools import compress
+
+
+class EdgeTable(MutableMapping):
+    """
+    EDGE_ID -> (source, target, weight) table stored as parallel typed arrays indexed by EDGE_ID.
+
+    An edge costs three machine ints and a liveness byte instead of a dict entry, a 3-tuple and
+    three boxed ints; the tuple is only built when an edge is read. Removed ids leave a dead slot.
+    The table behaves like the dict it replaces, and columns() hands the live edges out as whole
+    arrays for bulk readers such as the LP relaxation.
+    If a vertex or weight is not a machine int (a string label, a float cost, ...) the arrays
+    are turned into plain lists, so any value still fits.
+    """
+
+    def __init__(self):
+        self.sources = array("q")
+        self.targets = array("q")
+        self.weights = array("q")
+        self.alive = bytearray()  # alive[EDGE_ID] is 1 while the edge exists
+        self._count = 0
+
+    def __getitem__(self, edge_id):
+        if 0 <= edge_id < len(self.alive) and self.alive[edge_id]:
+            return self.sources[edge_id], self.targets[edge_id], self.weights[edge_id]
+        raise KeyError(edge_id)
+
+    def get(self, edge_id, default=None):
+        if 0 <= edge_id < len(self.alive) and self.alive[edge_id]:
+            return self.sources[edge_id], self.targets[edge_id], self.weights[edge_id]
+        return default
+
+    def __setitem__(self, edge_id, edge):
+        source, target, weight = edge
+        self.put(edge_id, source, target, weight)
+
+    def put(self, edge_id, source, target, weight):
+        """Stores an edge without building a tuple. Ids past the end grow the table."""
+        if edge_id < 0:
+            raise KeyError(edge_id)
+        try:
+            self._store(edge_id, source, target, weight)
+        except (TypeError, OverflowError):  # Not a machine int: fall back to lists
+            self._widen(len(self.alive))
+            self._store(edge_id, source, target, weight)
+        if not self.alive[edge_id]:
+            self.alive[edge_id] = 1
+            self._count += 1
+
+    def _store(self, edge_id, source, target, weight):
+        """Writes the three columns of one slot, appending dead slots up to edge_id first."""
+        size = len(self.alive)
+        if edge_id < size:
+            self.sources[edge_id] = source
+            self.targets[edge_id] = target
+            self.weights[edge_id] = weight
+            return
+        gap = edge_id - size
+        for column, value in ((self.sources, source), (self.targets, target), (self.weights, weight)):
+            column.extend([0] * gap)
+            column.append(value)
+        self.alive.extend(bytes(gap + 1))
+
+    def _widen(self, size):
+        """Replaces the typed arrays by lists of their first size slots, undoing a partial append."""
+        self.sources, self.targets, self.weights = (list(column[:size])
+                                                    for column in (self.sources, self.targets, self.weights))
+
+    def __delitem__(self, edge_id):
+        if not (0 <= edge_id < len(self.alive) and self.alive[edge_id]):
+            raise KeyError(edge_id)
+        self.alive[edge_id] = 0
+        self._count -= 1
+
+    def __contains__(self, edge_id):
+        return isinstance(edge_id, int) and 0 <= edge_id < len(self.alive) and self.alive[edge_id] == 1
+
+    def __iter__(self):
+        return compress(range(len(self.alive)), self.alive)
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        """Yields (source, target, weight) for every live edge in EDGE_ID order."""
+        return compress(zip(self.sources, self.targets, self.weights), self.alive)
+
+    def items(self):
+        """Yields (EDGE_ID, (source, target, weight)) for every live edge in EDGE_ID order."""
+        return compress(enumerate(zip(self.sources, self.targets, self.weights)), self.alive)
+
+    def columns(self):
+        """
+        Returns the live edges as three parallel sequences, in EDGE_ID order.
+        :return: (sources, targets, weights)
+        """
+        if self._count == len(self.alive):  # No dead slots, copy the columns as they are
+            return self.sources[:], self.targets[:], self.weights[:]
+        return tuple(array(column.typecode, compress(column, self.alive)) if isinstance(column, array)
+                     else list(compress(column, self.alive))
+                     for column in (self.sources, self.targets, self.weights))
+
+    def copy(self):
+        """Returns an independent copy of the table."""
+        table = EdgeTable()
+        table.sources, table.targets, table.weights = self.sources[:], self.targets[:], self.weights[:]
+        table.alive = bytearray(self.alive)
+        table._count = self._count
+        return table
+
+    def __repr__(self):
+        return f"EdgeTable({dict(self.items())})"
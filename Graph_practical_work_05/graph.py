@@ -1,5 +1,11 @@
 import random
-import copy
+
+from edge_table import EdgeTable
+from graph_common.cow import CopyOnWrite, DictOverlay, TableOverlay
+from graph_common.memory_usage import deep_sizeof
+
+# Structures a snapshot shares with its graph, and how each one records its changes afterwards
+_SHARED_STRUCTURES = {"out_neighbours": DictOverlay, "edges": TableOverlay, "edge_index": DictOverlay}
 
 class Graph:
     def __init__(self, v="graph.txt"):
@@ -10,8 +16,11 @@ class Graph:
         :param v: Can be an integer for the number of vertices or a string with the filename to read from.
         """
         self.out_neighbours = {}  # Adjacency list (with weights)
-        self.edges = {}  # Mapping EDGE_ID -> (source, target, weight)
-        self.edge_count = 0
+        self.edges = EdgeTable()  # Mapping EDGE_ID -> (source, target, weight), stored as typed arrays
+        self.edge_index = {}  # Mapping (source, target) -> EDGE_ID, both orientations
+        self.edge_count = 0  # Number of edges
+        self._next_id = 0  # One past the highest EDGE_ID handed out so far, IDs are never reused
+        self._cow = CopyOnWrite(_SHARED_STRUCTURES)  # Sharing with snapshots, see snapshot()
 
         # If v is a filename (string), read the graph from the file
         if isinstance(v, str):
@@ -39,10 +48,14 @@ class Graph:
 
     def add_edge(self, x, y, weight):
         """Adds an undirected edge between x and y with a given weight."""
-        if y not in [neighbor for neighbor, _ in self.out_neighbours.get(x, [])]:
-            self.out_neighbours.setdefault(x, []).append((y, weight))
-            self.out_neighbours.setdefault(y, []).append((x, weight))  # Add reverse edge
-            self.edges[self.edge_count] = (x, y, weight)
+        if (x, y) not in self.edge_index:
+            self._cow.prepare_write(self)
+            self._own(x).append((y, weight))
+            self._own(y).append((x, weight))  # Add reverse edge
+            edge_id = self._next_id
+            self._next_id += 1
+            self.edges.put(edge_id, x, y, weight)
+            self.edge_index[(x, y)] = self.edge_index[(y, x)] = edge_id
             self.edge_count += 1
             return True
         else:
@@ -51,21 +64,42 @@ class Graph:
     def remove_edge(self, x, y):
         """Removes the undirected edge between x and y."""
         removed = False
-        for i, (neighbor, weight) in enumerate(self.out_neighbours.get(x, [])):
-            if neighbor == y:
-                del self.out_neighbours[x][i]
-                removed = True
-                break
-        for i, (neighbor, weight) in enumerate(self.out_neighbours.get(y, [])):
-            if neighbor == x:
-                del self.out_neighbours[y][i]
-                removed = True
-                break
+        for source, target in ((x, y), (y, x)):
+            for i, (neighbor, weight) in enumerate(self.out_neighbours.get(source, [])):
+                if neighbor == target:
+                    self._cow.prepare_write(self)  # Only once there is something to remove
+                    del self._own(source)[i]
+                    removed = True
+                    break
+        if (x, y) in self.edge_index:
+            self._cow.prepare_write(self)
+            del self.edge_index[(x, y)]
+            self.edge_index.pop((y, x), None)
         return removed
 
+    def remove_edge_by_id(self, edge_id):
+        """
+        Removes the edge with the given ID, together with its adjacency entries.
+        The IDs of the other edges are not renumbered and the ID is not handed out again.
+        :param edge_id: the ID of the edge
+        :return: True if the edge existed, otherwise False
+        """
+        if edge_id not in self.edges:
+            return False
+        x, y, _ = self.edges[edge_id]
+        self.remove_edge(x, y)
+        self._cow.prepare_write(self)
+        del self.edges[edge_id]
+        self.edge_count -= 1
+        return True
+
     def remove_vertex(self, x):
         """Removes vertex x from the graph."""
         if x in self.out_neighbours:
+            self._cow.prepare_write(self)
+            for neighbor, _ in self.out_neighbours[x]:
+                self.edge_index.pop((x, neighbor), None)
+                self.edge_index.pop((neighbor, x), None)
             del self.out_neighbours[x]
             return True
         else:
@@ -74,6 +108,7 @@ class Graph:
     def add_vertex(self, x):
         """Adds vertex x to the graph."""
         if x not in self.out_neighbours:
+            self._cow.prepare_write(self)
             self.out_neighbours[x] = []
         else:
             raise ValueError("Vertex already exists")
@@ -107,16 +142,23 @@ class Graph:
 
     def is_edge(self, x, y):
         """
-        Returns True if there is an edge from x to y in the graph.
+        Checks in O(1) whether x and y are joined by an edge (in either orientation).
         :param x: source vertex
         :param y: target vertex
-        :return: returns the edge_id from x to y if it exists, otherwise None
+        :return: returns the edge_id between x and y if it exists, otherwise None
         """
-        for edge_id in range(self.edge_count):
-            source, target, _ = self.edges[edge_id]
-            if source == x and target == y:
-                return edge_id
-        return None
+        return self.edge_index.get((x, y))
+
+    def memory_report(self):
+        """
+        Breaks the memory held by the graph down by structure (containers, tuples and ints included;
+        an object referenced by two structures is counted in the first one).
+        :return: dict structure name -> bytes, plus "total"
+        """
+        seen = set()
+        report = {name: deep_sizeof(getattr(self, name), seen) for name in ("out_neighbours", "edges", "edge_index")}
+        report["total"] = sum(report.values())
+        return report
 
     def generate_random_graph(self, number_vertices, number_edges):
         """
@@ -132,17 +174,35 @@ class Graph:
             if x != y and self.is_edge(x, y) is None:
                 self.add_edge(x, y, weight)
 
-    def deepcopy(self):
+    def snapshot(self):
         """
-        Creates a deep copy of the graph.
-        :return: A new Graph object that is a deep copy of the current graph.
+        Creates an independent copy of the graph in O(1) using copy-on-write.
+        The copy reads the dicts, edge table and adjacency lists of the graph through overlays that keep
+        its own changes (graph_common.cow); while the copy is alive, the graph hands the old value of
+        every entry it overwrites over to it first. A write costs O(1) extra per live copy, plus O(deg)
+        when a shared adjacency list has to be copied, and a read through an overlay a few dict lookups.
+        :return: A new Graph object that can be modified independently of the current graph.
         """
-        new_graph = Graph()
-        new_graph.out_neighbours = copy.deepcopy(self.out_neighbours)
-        new_graph.edges = copy.deepcopy(self.edges)
+        new_graph = Graph(None)
+        self._cow.share(self, new_graph)
         new_graph.edge_count = self.edge_count
+        new_graph._next_id = self._next_id
         return new_graph
 
+    def deepcopy(self):
+        """
+        Creates a copy of the graph that can be modified independently, see snapshot().
+        :return: A new Graph object
+        """
+        return self.snapshot()
+
+    def _own(self, x):
+        """Returns the adjacency list of x (creating it if needed), copied first if a snapshot may share it."""
+        adjacency = self.out_neighbours.setdefault(x, [])
+        if not self._cow.owns(self.out_neighbours, x):
+            adjacency = self.out_neighbours[x] = list(adjacency)
+        return adjacency
+
 
 def write_to_file(graph: Graph, file_name):
     """
@@ -152,9 +212,7 @@ def write_to_file(graph: Graph, file_name):
     """
     with open(file_name, "w") as f:
         f.write(f"{graph.get_number_vertices()} {graph.edge_count}\n")
-        for edge_id in range(graph.edge_count):
-            source, target, weight = graph.get_edge_by_id(edge_id)
-            f.write(f"{source} {target} {weight}\n")
+        f.writelines(f"{source} {target} {weight}\n" for source, target, weight in zip(*graph.edges.columns()))
 
 
 
@@ -1,5 +1,7 @@
 from graph import Graph
+from graph_common.memory_usage import track_memory
 
+@track_memory
 def greedy_vertex_cover(graph: Graph):
     """
     2-Approximation algorithm for Minimum Vertex Cover using a greedy approach.
@@ -7,26 +9,24 @@ def greedy_vertex_cover(graph: Graph):
     :param graph: An instance of the Graph class (undirected)
     :return: A set containing the approximate vertex cover
     """
-    # Make a deepcopy of the graph to safely modify it
-    g_copy = graph.deepcopy()
+    # Take a copy-on-write snapshot of the graph to safely modify it
+    g_copy = graph.snapshot()
     cover = set()
 
-    # Keep track of all covered edges
-    while g_copy.edge_count > 0:
-        # Pick any edge (from the edges dictionary)
-        edge_id, (u, v, _) = next(iter(g_copy.edges.items()))  # Get any edge
+    # Walk the edges once in EDGE_ID order (the original table is not modified); the first edge
+    # still in the copy is the one each round used to pick
+    for edge_id, (u, v, _) in graph.edges.items():
+        if edge_id not in g_copy.edges:
+            continue  # Already covered
 
         # Add both endpoints of the edge to the cover
         cover.add(u)
         cover.add(v)
 
-        # Remove all edges incident to u or v
-        incident_edges = list(g_copy.edges.items())  # Create a static list of edges
-        for eid, (x, y, _) in incident_edges:
-            if x == u or y == u or x == v or y == v:  # Check if edge is incident to u or v
-                g_copy.remove_edge(x, y)  # Remove edge from adjacency list
-                del g_copy.edges[eid]  # Remove edge from edges dictionary
-                g_copy.edge_count -= 1
+        # Remove all edges incident to u or v, found through their adjacency lists
+        for x in (u, v):
+            for neighbour, _ in list(g_copy.out_neighbours[x]):
+                g_copy.remove_edge_by_id(g_copy.is_edge(x, neighbour))
 
     return cover
 
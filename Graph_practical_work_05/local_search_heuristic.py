@@ -1,5 +1,7 @@
 import random
 from graph import Graph
+from graph_common.memory_usage import track_memory
+@track_memory
 def local_search_vertex_cover(graph, max_iterations=1000):
     """
     Local search heuristic for the Vertex Cover problem.
@@ -1,6 +1,8 @@
 
 from graph import Graph
+from graph_common.memory_usage import track_memory
 
+@track_memory
 def primal_dual_vertex_cover(graph):
     """
     Finds a 2-approximate vertex cover using the Primal-Dual method.
@@ -15,7 +17,7 @@ def primal_dual_vertex_cover(graph):
 
     while len(covered_edges) < graph.edge_count:
         # Pick an uncovered edge (u, v)
-        for edge_id in range(graph.edge_count):
+        for edge_id in graph.edges:
             if edge_id in covered_edges:
                 continue
             u, v, _ = graph.get_edge_by_id(edge_id)
@@ -1,6 +1,9 @@
 import numpy as np
 from graph import Graph
+from graph_common.memory_usage import track_memory
 from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+@track_memory
 def vertex_cover_lp_relaxation(graph):
     """
     Finds a vertex cover using LP relaxation and rounding.
@@ -10,21 +13,21 @@ def vertex_cover_lp_relaxation(graph):
     """
 
     num_vertices = graph.get_number_vertices()
-    num_edges = graph.edge_count
+    sources, targets, _ = graph.edges.columns()  # Endpoints of every edge, read in bulk
+    num_edges = len(sources)
 
     # Objective: Minimize sum of x_i (vertex variables)
     c = np.ones(num_vertices)
 
     # Constraints: For each edge (u, v), x_u + x_v >= 1
     # Rewrite as: -x_u - x_v <= -1 for linprog standard form
-    A = np.zeros((num_edges, num_vertices))
+    # A is sparse: row i only has the two endpoints of edge i
+    rows = np.repeat(np.arange(num_edges), 2)
+    columns = np.column_stack((np.asarray(sources), np.asarray(targets))).ravel()
+    A = csr_matrix((np.ones(2 * num_edges), (rows, columns)), shape=(num_edges, num_vertices))
+    A.data[:] = -1  # A self-loop u-u gives one summed entry, keep it at -1 like the other ones
     b = np.full(num_edges, -1)
 
-    for i in range(num_edges):
-        u, v, _ = graph.edges[i]
-        A[i, u] = -1
-        A[i, v] = -1
-
     # Bounds for each x_i: 0 <= x_i <= 1
     bounds = [(0, 1) for _ in range(num_vertices)]
 
@@ -1,5 +1,7 @@
 from graph import Graph
+from graph_common.memory_usage import track_memory
 
+@track_memory
 def vertex_cover_maximal_matching(graph):
     """
     Finds a vertex cover using the maximal matching 2-approximation algorithm.
@@ -11,7 +13,7 @@ def vertex_cover_maximal_matching(graph):
     vertex_cover = set()
 
     # Iterate over all edges
-    for edge_id in range(graph.edge_count):
+    for edge_id in graph.edges:
         u, v, _ = graph.edges[edge_id]
 
         # If neither endpoint is matched, pick this edge for matching
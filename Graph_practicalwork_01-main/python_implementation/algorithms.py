@@ -0,0 +1,102 @@
+import heapq
+
+
+def dijkstra(graph, start_vertex):
+    """
+    Dijkstra's algorithm to find the shortest path from a starting vertex to all other vertices.
+    Only reached vertices get an entry, so the result stays small on large graphs.
+    :param graph: graph exposing parse_out (Graph or CSRGraph), with non-negative weights
+    :param start_vertex: The starting vertex.
+    :return: distances, parents (dicts over the reached vertices)
+    """
+    distances = {start_vertex: 0}
+    parents = {start_vertex: None}
+    visited = set()
+    priority_queue = [(0, start_vertex)]  # (distance, vertex)
+
+    while priority_queue:
+        current_distance, current_vertex = heapq.heappop(priority_queue)
+        if current_vertex in visited:
+            continue
+        visited.add(current_vertex)
+
+        for neighbor, weight in graph.parse_out(current_vertex):
+            new_distance = current_distance + weight
+            # Relaxation: Update distance if a shorter path is found
+            if neighbor not in visited and new_distance < distances.get(neighbor, new_distance + 1):
+                distances[neighbor] = new_distance
+                parents[neighbor] = current_vertex
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+
+    return distances, parents
+
+
+def weakly_connected_components(graph):
+    """
+    Finds the components of the graph when edge directions are ignored.
+    :param graph: Graph (needs parse_out and parse_in)
+    :return: list of components, each a list of vertices
+    """
+    visited = set()
+    components = []
+    for vertex in graph.parse_vertices():
+        if vertex in visited:
+            continue
+        visited.add(vertex)
+        component = [vertex]
+        stack = [vertex]
+        while stack:
+            current = stack.pop()
+            for neighbours in (graph.parse_out(current), graph.parse_in(current)):
+                for neighbor, _ in neighbours:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        component.append(neighbor)
+                        stack.append(neighbor)
+        components.append(component)
+    return components
+
+
+def strongly_connected_components(graph):
+    """
+    Kosaraju's algorithm with explicit stacks, so deep graphs do not hit the recursion limit.
+    :param graph: Graph (needs parse_out and parse_in)
+    :return: list of strongly connected components, each a list of vertices
+    """
+    # First pass: order the vertices by DFS finishing time on the graph
+    visited = set()
+    order = []
+    for root in graph.parse_vertices():
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(graph.parse_out(root)))]
+        while stack:
+            vertex, neighbours = stack[-1]
+            for neighbor, _ in neighbours:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append((neighbor, iter(graph.parse_out(neighbor))))
+                    break
+            else:
+                stack.pop()
+                order.append(vertex)
+
+    # Second pass: DFS on the reversed graph in decreasing finishing time
+    assigned = set()
+    components = []
+    for root in reversed(order):
+        if root in assigned:
+            continue
+        assigned.add(root)
+        component = [root]
+        stack = [root]
+        while stack:
+            vertex = stack.pop()
+            for source, _ in graph.parse_in(vertex):
+                if source not in assigned:
+                    assigned.add(source)
+                    component.append(source)
+                    stack.append(source)
+        components.append(component)
+    return components
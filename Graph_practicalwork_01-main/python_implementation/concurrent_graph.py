@@ -0,0 +1,215 @@
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from algorithms import dijkstra, weakly_connected_components, strongly_connected_components
+
+# A consistent, read-only state of a ConcurrentGraph: the version it was taken at and a snapshot of the graph
+ReadView = namedtuple("ReadView", ["version", "graph"])
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer at a time. Waiting writers block new readers, so a steady stream
+    of queries cannot starve updates. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentGraph:
+    """
+    Thread-safe wrapper around a Graph. Queries and traversals share a read lock, mutations take
+    it exclusively, and every mutation bumps 'version'.
+    Long iterations should go through read_view() or the iter_ methods: they work on a
+    copy-on-write snapshot of one version, hold no lock, and never see a half-applied update.
+    """
+
+    def __init__(self, graph):
+        """
+        :param graph: the Graph to share; it should not be used directly any more
+        """
+        self._graph = graph
+        self._lock = ReadWriteLock()
+        self._view = None  # ReadView of the current version, taken on demand
+        self.version = 0
+
+    # Mutations
+
+    def _mutate(self, method, *args):
+        """Runs a mutation under the write lock, counting it as a new version unless it changed nothing."""
+        with self._lock.write_locked():
+            result = method(*args)
+            if result is None or result:  # None from add_vertex, False or 0 when nothing changed
+                self.version += 1
+                self._view = None
+            return result
+
+    def add_vertex(self, x):
+        """Adds vertex x to the graph."""
+        return self._mutate(self._graph.add_vertex, x)
+
+    def remove_vertex(self, x):
+        """Removes vertex x and all its edges."""
+        return self._mutate(self._graph.remove_vertex, x)
+
+    def add_edge(self, x, y, weight):
+        """Adds an edge from x to y with a given weight."""
+        return self._mutate(self._graph.add_edge, x, y, weight)
+
+    def remove_edge(self, x, y):
+        """Removes the edge from x to y."""
+        return self._mutate(self._graph.remove_edge, x, y)
+
+    def add_edges_from(self, edges):
+        """Adds many edges as one version, see Graph.add_edges_from."""
+        return self._mutate(self._graph.add_edges_from, edges)
+
+    def remove_edges_from(self, edges):
+        """Removes many edges as one version, see Graph.remove_edges_from."""
+        return self._mutate(self._graph.remove_edges_from, edges)
+
+    # Queries
+
+    def is_edge(self, x, y):
+        """Returns the edge_id from x to y if it exists, otherwise None."""
+        with self._lock.read_locked():
+            return self._graph.is_edge(x, y)
+
+    def get_edge_by_id(self, edge_id):
+        """Returns the edge with the given ID."""
+        with self._lock.read_locked():
+            return self._graph.get_edge_by_id(edge_id)
+
+    def parse_out(self, x):
+        """Returns a list of the outbound neighbors of x, as (target, weight) pairs."""
+        with self._lock.read_locked():
+            return self._graph.parse_out(x)
+
+    def parse_in(self, x):
+        """Returns a list of the inbound neighbors of x, as (source, weight) pairs."""
+        with self._lock.read_locked():
+            return self._graph.parse_in(x)
+
+    def get_in_degree(self, x):
+        """Returns the in-degree of vertex x."""
+        with self._lock.read_locked():
+            return self._graph.get_in_degree(x)
+
+    def get_out_degree(self, x):
+        """Returns the out-degree of vertex x."""
+        with self._lock.read_locked():
+            return self._graph.get_out_degree(x)
+
+    def get_number_vertices(self):
+        """Returns the number of vertices in the graph."""
+        with self._lock.read_locked():
+            return self._graph.get_number_vertices()
+
+    @property
+    def edge_count(self):
+        with self._lock.read_locked():
+            return self._graph.edge_count
+
+    # Traversals, each one sees a single version
+
+    def dijkstra(self, start_vertex):
+        """Shortest paths from start_vertex, see algorithms.dijkstra."""
+        with self._lock.read_locked():
+            return dijkstra(self._graph, start_vertex)
+
+    def weakly_connected_components(self):
+        """See algorithms.weakly_connected_components."""
+        with self._lock.read_locked():
+            return weakly_connected_components(self._graph)
+
+    def strongly_connected_components(self):
+        """See algorithms.strongly_connected_components."""
+        with self._lock.read_locked():
+            return strongly_connected_components(self._graph)
+
+    # Versioned consistent reads
+
+    def read_view(self):
+        """
+        Returns the current version together with a snapshot of the graph at that version.
+        The snapshot is shared by every caller until the next mutation and must not be modified;
+        it can be read without any lock while other threads keep updating the graph.
+        Taking it is O(1) and happens at most once per version. While it is alive, every update costs
+        O(1) extra per entry it writes, plus an O(deg) copy of each adjacency list it first modifies
+        (see Graph.snapshot); reading through it costs a few dict lookups per access.
+        :return: ReadView(version, graph)
+        """
+        view = self._view
+        if view is not None:
+            return view
+        # Taking a snapshot marks the live graph as shared, which is a write to it
+        with self._lock.write_locked():
+            if self._view is None:
+                self._view = ReadView(self.version, self._graph.snapshot())
+            return self._view
+
+    def iter_vertices(self):
+        """Yields the vertices of the version current at the call."""
+        view = self.read_view()
+        return _iterate(view, view.graph.parse_vertices())
+
+    def iter_edges(self):
+        """Yields (edge_id, (source, target, weight)) for the version current at the call."""
+        view = self.read_view()
+        return _iterate(view, view.graph.edges.items())
+
+    def iter_out(self, x):
+        """Yields the (target, weight) outbound pairs of x in the version current at the call."""
+        view = self.read_view()
+        return _iterate(view, view.graph.out_neighbours[x])
+
+
+def _iterate(view, iterable):
+    """Yields from iterable, keeping view alive meanwhile: the graph only leaves alone what a live snapshot reads."""
+    yield from iterable
@@ -0,0 +1,337 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+from Graph_practical_work_02.vertex_map import VertexMap
+from graph_io import read_edge_list, is_binary_file, map_binary, write_binary
+
+
+class CSRGraph:
+    """
+    Read-only directed graph stored in compressed-sparse-row form.
+
+    The outbound edges of vertex x occupy the slots offsets[x] .. offsets[x + 1] - 1
+    of the 'targets' and 'weights' arrays, and the slot of an edge is its EDGE_ID.
+    Every edge costs two machine ints instead of the tuples and dict entries of Graph,
+    while parse_out, parse_in, parse_vertices, is_edge, get_edge_by_id and edge_count keep
+    the same meaning, so the algorithms written against Graph run on it unchanged.
+    Weights are int32, int64 or, as soon as one of them is not an int, doubles.
+    """
+
+    def __init__(self, number_vertices, offsets, targets, weights):
+        """
+        Wraps already built CSR arrays. Use from_edges, from_graph or read_from_file instead.
+
+        :param number_vertices: number of vertices (vertices are 0 .. number_vertices - 1)
+        :param offsets: array of number_vertices + 1 row offsets
+        :param targets: array with the target of every edge, grouped by source
+        :param weights: array with the weight of every edge, parallel to targets
+        """
+        self._number_vertices = number_vertices
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_count = len(targets)
+        self.out_neighbours = _OutNeighboursView(self)  # Read-only Mapping vertex -> [(neighbor, weight)]
+        self.in_neighbours = _InNeighboursView(self)  # Read-only Mapping vertex -> [(source, weight)]
+        self._transposed = None  # (offsets, sources, weights) of the reversed graph, built on first use
+        self.edges = _EdgesView(self)  # Read-only Mapping EDGE_ID -> (source, target, weight)
+
+    @classmethod
+    def from_edges(cls, number_vertices, sources, targets, weights):
+        """
+        Builds a CSR graph from parallel sequences of edge endpoints and weights.
+        Duplicate (source, target) pairs keep their first occurrence, like Graph.add_edge,
+        and the outbound edges of every vertex keep their input order.
+
+        :param number_vertices: number of vertices
+        :param sources: sequence of edge sources
+        :param targets: sequence of edge targets
+        :param weights: sequence of edge weights
+        :return: a new CSRGraph
+        """
+        edge_total = len(sources)
+        index_code = _index_typecode(edge_total)
+
+        # Counting sort by source: count, prefix sum, then scatter (stable, O(V + E))
+        counts = _zeros(index_code, number_vertices + 1)
+        for source in sources:
+            if not 0 <= source < number_vertices:
+                raise ValueError(f"Vertex {source} is out of range")
+            counts[source + 1] += 1
+        for vertex in range(number_vertices):
+            counts[vertex + 1] += counts[vertex]
+
+        next_slot = array(index_code, counts)
+        sorted_targets = _zeros("i", edge_total)
+        sorted_weights = _zeros(_weight_typecode(weights), edge_total)
+        for source, target, weight in zip(sources, targets, weights):
+            if not 0 <= target < number_vertices:
+                raise ValueError(f"Vertex {target} is out of range")
+            slot = next_slot[source]
+            sorted_targets[slot] = target
+            sorted_weights[slot] = weight
+            next_slot[source] = slot + 1
+
+        # Drop repeated targets inside each row, compacting the arrays in place
+        last_row = array("i", [-1]) * number_vertices  # last_row[t] = last row in which t was seen
+        offsets = _zeros(index_code, number_vertices + 1)
+        write = 0
+        for vertex in range(number_vertices):
+            offsets[vertex] = write
+            for slot in range(counts[vertex], counts[vertex + 1]):
+                target = sorted_targets[slot]
+                if last_row[target] != vertex:
+                    last_row[target] = vertex
+                    sorted_targets[write] = target
+                    sorted_weights[write] = sorted_weights[slot]
+                    write += 1
+        offsets[number_vertices] = write
+        del sorted_targets[write:]
+        del sorted_weights[write:]
+        return cls(number_vertices, offsets, sorted_targets, sorted_weights)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Converts any graph exposing parse_vertices and parse_out (such as Graph) to CSR form.
+        The vertices have to be 0 .. n-1.
+
+        :param graph: graph object
+        :return: a new CSRGraph
+        """
+        number_vertices = graph.get_number_vertices()
+        sources, targets, weights = [], [], []
+        for vertex in graph.parse_vertices():
+            for neighbor, weight in graph.parse_out(vertex):
+                sources.append(vertex)
+                targets.append(neighbor)
+                weights.append(weight)
+        return cls.from_edges(number_vertices, sources, targets, weights)
+
+    @classmethod
+    def read_from_file(cls, file_name):
+        """
+        Reads a graph directly into CSR form. Binary files are memory-mapped,
+        text files in the "n m / x y c" format are parsed.
+
+        :param file_name: The filename from which the graph is read.
+        :return: a new CSRGraph
+        """
+        if is_binary_file(file_name):
+            return cls.read_binary(file_name)
+        x, sources, targets, weights = read_edge_list(file_name)
+        return cls.from_edges(x, sources, targets, weights)
+
+    @classmethod
+    def read_binary(cls, file_name):
+        """
+        Opens a binary graph file without copying it: the arrays are views over a read-only mmap.
+
+        :param file_name: The filename from which the graph is read.
+        :return: a new CSRGraph
+        """
+        return cls(*map_binary(file_name))
+
+    def write_binary(self, file_name):
+        """
+        Writes the graph in the binary CSR format.
+        :param file_name: file name
+        """
+        write_binary(file_name, self._number_vertices, self.offsets, self.targets, self.weights)
+
+    def get_number_vertices(self):
+        """Returns the number of vertices in the graph."""
+        return self._number_vertices
+
+    def parse_vertices(self):
+        """Returns an iterable containing all vertices of the graph."""
+        return range(self._number_vertices)
+
+    def parse_out(self, x):
+        """Returns an iterable containing all outbound neighbors of x."""
+        start, end = self.offsets[x], self.offsets[x + 1]
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def get_out_neighbours_for_vertex(self, vertex):
+        """
+        Returns the out neighbours of a vertex
+        :param vertex: the parent
+        :return: the out neighbours
+        """
+        return self.parse_out(vertex)
+
+    def get_out_degree(self, x):
+        """Returns the out-degree of vertex x."""
+        return self.offsets[x + 1] - self.offsets[x]
+
+    def parse_in(self, x):
+        """Returns an iterable containing all inbound neighbors of x, as (source, weight) pairs."""
+        offsets, sources, weights = self._transpose()
+        start, end = offsets[x], offsets[x + 1]
+        return list(zip(sources[start:end], weights[start:end]))
+
+    def get_in_degree(self, x):
+        """Returns the in-degree of vertex x."""
+        offsets = self._transpose()[0]
+        return offsets[x + 1] - offsets[x]
+
+    def dense_csr(self, reverse=False):
+        """
+        Returns the graph in the form of Graph.dense_csr (Lab 2), so the array algorithms written for it
+        (scc, bcc, block_cut_tree, csgraph_backend) run on a CSRGraph too. The vertices already are
+        0 .. n-1, so the map is the identity and the arrays are only copied to int64.
+        :param reverse: use the inbound edges, i.e. the adjacency of the reversed graph
+        :return: (vertex_map, offsets, targets) where the neighbours of i are targets[offsets[i]:offsets[i + 1]]
+        """
+        offsets, targets = self._transpose()[:2] if reverse else (self.offsets, self.targets)
+        return VertexMap(range(self._number_vertices)), array("q", offsets), array("q", targets)
+
+    def _transpose(self):
+        """
+        Returns the CSR arrays of the reversed graph, (offsets, sources, weights), building them on the
+        first call with the same counting sort as from_edges. Inbound pairs come in EDGE_ID order.
+        """
+        if self._transposed is None:
+            number_vertices = self._number_vertices
+            offsets, targets, weights = self.offsets, self.targets, self.weights
+            index_code = _index_typecode(self.edge_count)
+            in_offsets = _zeros(index_code, number_vertices + 1)
+            for target in targets:
+                in_offsets[target + 1] += 1
+            for vertex in range(number_vertices):
+                in_offsets[vertex + 1] += in_offsets[vertex]
+
+            next_slot = array(index_code, in_offsets)
+            in_sources = _zeros("i", self.edge_count)
+            in_weights = _zeros(_typecode(weights), self.edge_count)
+            for source in range(number_vertices):
+                for edge_id in range(offsets[source], offsets[source + 1]):
+                    target = targets[edge_id]
+                    slot = next_slot[target]
+                    in_sources[slot] = source
+                    in_weights[slot] = weights[edge_id]
+                    next_slot[target] = slot + 1
+            self._transposed = in_offsets, in_sources, in_weights
+        return self._transposed
+
+    def is_edge(self, x, y):
+        """
+        Checks whether there is an edge from x to y in O(deg(x)).
+        :param x: source vertex
+        :param y: target vertex
+        :return: returns the edge_id from x to y if it exists, otherwise None
+        """
+        if not 0 <= x < self._number_vertices:
+            return None
+        for edge_id in range(self.offsets[x], self.offsets[x + 1]):
+            if self.targets[edge_id] == y:
+                return edge_id
+        return None
+
+    def get_edge_by_id(self, edge_id):
+        """Returns the edge with the given ID."""
+        if not 0 <= edge_id < self.edge_count:
+            return None
+        source = bisect_right(self.offsets, edge_id) - 1  # Row whose slot range contains edge_id
+        return source, self.targets[edge_id], self.weights[edge_id]
+
+    def nbytes(self):
+        """Returns the number of bytes held by the CSR arrays, the reversed ones included once built."""
+        arrays = (self.offsets, self.targets, self.weights) + (self._transposed or ())
+        return sum(len(a) * a.itemsize for a in arrays)
+
+
+def text_to_binary(text_file, binary_file):
+    """
+    Converts a graph file from the "n m / x y c" text format to the binary CSR format.
+    Duplicate edges are dropped and edges are renumbered in CSR order.
+    """
+    CSRGraph.read_from_file(text_file).write_binary(binary_file)
+
+
+def binary_to_text(binary_file, text_file):
+    """Converts a binary CSR graph file to the "n m / x y c" text format."""
+    graph = CSRGraph.read_binary(binary_file)
+    with open(text_file, "w") as f:
+        f.write(f"{graph.get_number_vertices()} {graph.edge_count}\n")
+        for _, (source, target, weight) in graph.edges.items():
+            f.write(f"{source} {target} {weight}\n")
+
+
+class _OutNeighboursView(Mapping):
+    """Read-only vertex -> [(neighbor, weight)] view, so code reading graph.out_neighbours still works."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, vertex):
+        if not 0 <= vertex < self._graph.get_number_vertices():
+            raise KeyError(vertex)
+        return self._graph.parse_out(vertex)
+
+    def __iter__(self):
+        return iter(self._graph.parse_vertices())
+
+    def __len__(self):
+        return self._graph.get_number_vertices()
+
+
+class _InNeighboursView(_OutNeighboursView):
+    """Read-only vertex -> [(source, weight)] view, so code reading graph.in_neighbours still works."""
+
+    def __getitem__(self, vertex):
+        if not 0 <= vertex < self._graph.get_number_vertices():
+            raise KeyError(vertex)
+        return self._graph.parse_in(vertex)
+
+
+class _EdgesView(Mapping):
+    """Read-only EDGE_ID -> (source, target, weight) view, so code reading graph.edges still works."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, edge_id):
+        edge = self._graph.get_edge_by_id(edge_id)
+        if edge is None:
+            raise KeyError(edge_id)
+        return edge
+
+    def __iter__(self):
+        return iter(range(self._graph.edge_count))
+
+    def __len__(self):
+        return self._graph.edge_count
+
+    def items(self):
+        """Yields (edge_id, (source, target, weight)) walking the rows instead of bisecting per edge."""
+        graph = self._graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        for source in range(graph.get_number_vertices()):
+            for edge_id in range(offsets[source], offsets[source + 1]):
+                yield edge_id, (source, targets[edge_id], weights[edge_id])
+
+
+def _index_typecode(edge_total):
+    """Offsets fit in int32 unless the graph has more than 2^31 - 1 edges."""
+    return "i" if edge_total < 2 ** 31 else "q"
+
+
+def _weight_typecode(weights):
+    """Weights are stored as int32 unless one of them does not fit, and as doubles if one is not an int."""
+    if not all(isinstance(weight, int) for weight in weights):
+        return "d"
+    if len(weights) and (min(weights) < -2 ** 31 or max(weights) >= 2 ** 31):
+        return "q"
+    return "i"
+
+
+def _typecode(values):
+    """Typecode of an array, or format of a memoryview over a mapped file."""
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _zeros(typecode, size):
+    """Returns an array of size zeros."""
+    return array(typecode, bytes(array(typecode).itemsize * size))
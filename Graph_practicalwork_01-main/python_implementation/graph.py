@@ -1,5 +1,30 @@
+import argparse
+import os
 import random
-import copy
+import sys
+from array import array
+from inspect import signature
+from itertools import chain, repeat
+from time import perf_counter
+
+from csr_graph import CSRGraph
+from edge_table import EdgeTable
+from graph_journal import Journal, replay_journal
+from graph_common.cow import ArrayOverlay, CopyOnWrite, DictOverlay, TableOverlay
+from graph_common.memory_usage import deep_sizeof
+from graph_io import (BINARY_SUFFIX, read_edge_list, read_header, iter_edge_chunks, check_vertex_range,
+                      is_binary_file, map_binary)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, random graphs are then sampled with the random module alone
+    np = None
+
+COMPACTION_MIN = 1024  # Removals below this count never trigger a compaction
+# Structures a snapshot shares with its graph, and how each one records its changes afterwards
+_SHARED_STRUCTURES = {"out_neighbours": DictOverlay, "in_neighbours": DictOverlay, "edges": TableOverlay,
+                      "edge_index": DictOverlay, "_out_slot": ArrayOverlay, "_in_slot": ArrayOverlay}
+
 
 class Graph:
     def __init__(self, v="graph.txt"):
@@ -10,8 +35,18 @@ class Graph:
         :param v: Can be an integer for the number of vertices or a string with the filename to read from.
         """
         self.out_neighbours = {}  # Adjacency list (with weights)
-        self.edges = {}  # Mapping EDGE_ID -> (source, target, weight)
+        self.in_neighbours = {}  # Inbound adjacency list: vertex -> [(source, weight)]
+        self.edges = EdgeTable()  # Mapping EDGE_ID -> (source, target, weight), stored as typed arrays
+        self.edge_index = {}  # Mapping (source, target) -> EDGE_ID
         self.edge_count = 0
+        # Bookkeeping for O(1) removal, see _remove_edge()
+        self._out_slot = array("q")  # EDGE_ID -> position of the edge in the out list of its source
+        self._in_slot = array("q")  # EDGE_ID -> position of the edge in the in list of its target
+        self._free_ids = []  # Ids of removed edges, handed out again before new ones
+        self._next_id = 0  # One past the highest EDGE_ID handed out so far
+        self._removed_since_compaction = 0
+        self._cow = CopyOnWrite(_SHARED_STRUCTURES)  # Sharing with snapshots, see snapshot()
+        self.journal = None  # Journal recording the mutations, see graph_journal.Journal
 
         # If v is a filename (string), read the graph from the file
         if isinstance(v, str):
@@ -20,53 +55,237 @@ class Graph:
         elif isinstance(v, int):
             for vertex in range(v):
                 self.out_neighbours[vertex] = []
+                self.in_neighbours[vertex] = []
 
-    def _read_from_file(self, file_name):
+    def _read_from_file(self, file_name, chunk_bytes=None):
         """
-        Reads a graph from the specified file.
+        Reads a graph from the specified file, in the text format or in the binary CSR format,
+        then replays the journal of the file if it has one.
 
         :param file_name: The filename from which the graph is read.
+        :param chunk_bytes: if given, stream a text file in blocks of about this many characters and
+                            add each block before parsing the next, instead of parsing it all at once
         """
-        with open(file_name, "r") as f:
-            # Read the number of vertices and edges (not used here, since we're reading lines)
-            x, y = map(int, f.readline().split())
+        if is_binary_file(file_name):
+            # Walk the memory-mapped rows directly; edge ids follow the CSR order of the file
+            x, offsets, targets, weights = map_binary(file_name)
+            self.__init__(x)
+            sources = chain.from_iterable(repeat(vertex, offsets[vertex + 1] - offsets[vertex]) for vertex in range(x))
+            self._load_edges(sources, targets, weights)
+        elif chunk_bytes is None:
+            x, sources, targets, weights = read_edge_list(file_name)
             self.__init__(x)  # Re-initialize the graph with 'x' vertices
-
-            # Read the edges with weights and add them to the graph
-            for line in f:
-                u, v, w = map(int, line.split())
-                self.add_edge(u, v, w)
+            self._load_edges(sources, targets, weights)
+        else:
+            with open(file_name, "r") as f:
+                x, _ = read_header(f)
+                self.__init__(x)
+                for sources, targets, weights in iter_edge_chunks(f, chunk_bytes):
+                    check_vertex_range(x, sources, targets)
+                    self._load_edges(sources, targets, weights)
+        replay_journal(self, file_name)
+
+    def _load_edges(self, sources, targets, weights):
+        """
+        Adds a batch of edges between existing vertices in one pass, without the per-call work of add_edge.
+        Pairs that are already edges are skipped, like in add_edge.
+        """
+        self._cow.prepare_write(self)
+        if not isinstance(self.out_neighbours, dict):  # Shared with a snapshot: copy the lists it may read first
+            sources, targets = list(sources), list(targets)
+            for x in set(sources):
+                self._own_out(x)
+            for y in set(targets):
+                self._own_in(y)
+        out_neighbours, in_neighbours = self.out_neighbours, self.in_neighbours
+        edge_index = self.edge_index
+        out_slot, in_slot, free_ids = self._out_slot, self._in_slot, self._free_ids
+        next_id, added = self._next_id, 0
+        new_sources, new_targets, new_weights = [], [], []  # Edges with fresh ids, appended to the table at the end
+        for x, y, weight in zip(sources, targets, weights):
+            if (x, y) in edge_index:
+                continue
+            out_list, in_list = out_neighbours[x], in_neighbours[y]
+            if free_ids:
+                edge_id = free_ids.pop()
+                out_slot[edge_id] = len(out_list)
+                in_slot[edge_id] = len(in_list)
+                self.edges.put(edge_id, x, y, weight)
+            else:
+                edge_id = next_id
+                next_id += 1
+                out_slot.append(len(out_list))
+                in_slot.append(len(in_list))
+                new_sources.append(x)
+                new_targets.append(y)
+                new_weights.append(weight)
+            out_list.append((y, weight))
+            in_list.append((x, weight))
+            edge_index[(x, y)] = edge_id
+            added += 1
+        self.edges.extend(new_sources, new_targets, new_weights)
+        self._next_id = next_id
+        self.edge_count += added
 
     def add_edge(self, x, y, weight):
         """Adds an edge from x to y with a given weight."""
-        if y not in self.out_neighbours[x]:
-            self.out_neighbours[x].append((y, weight))
-            self.edges[self.edge_count] = (x, y, weight)
+        if x not in self.out_neighbours or y not in self.out_neighbours:
+            raise ValueError("Vertex does not exist")
+        if (x, y) not in self.edge_index:
+            self._cow.prepare_write(self)
+            out_list, in_list = self._own_out(x), self._own_in(y)
+            edge_id = self._take_edge_id()
+            self._out_slot[edge_id] = len(out_list)
+            self._in_slot[edge_id] = len(in_list)
+            out_list.append((y, weight))
+            in_list.append((x, weight))
+            self.edges.put(edge_id, x, y, weight)
+            self.edge_index[(x, y)] = edge_id
             self.edge_count += 1
+            if self.journal is not None:
+                self.journal.record("add_edge", x, y, weight)
             return True
         else:
             return False
 
+    def add_edges_from(self, edges):
+        """
+        Adds many edges in one pass. Pairs that are already edges, or repeated inside the batch,
+        keep their first weight, like in add_edge. Nothing is added if an endpoint is not a vertex.
+        :param edges: iterable of (x, y, weight) triples, or a NumPy array of shape (k, 3)
+        :return: the number of edges actually added
+        """
+        if hasattr(edges, "tolist"):  # NumPy arrays become plain ints in one call
+            edges = edges.tolist()
+        columns = list(zip(*edges))
+        if not columns:
+            return 0
+        sources, targets, weights = columns
+        for vertex in set(sources).union(targets):
+            if vertex not in self.out_neighbours:
+                raise ValueError("Vertex does not exist")
+        before = self.edge_count
+        self._load_edges(sources, targets, weights)
+        if self.journal is not None:  # Repeated pairs replay as no-ops, like they were here
+            for x, y, weight in zip(sources, targets, weights):
+                self.journal.record("add_edge", x, y, weight)
+        return self.edge_count - before
+
+    def remove_edges_from(self, edges):
+        """
+        Removes many edges in one pass, compacting the edge index at most once at the end.
+        Pairs that are not edges are ignored.
+        :param edges: iterable of (x, y) pairs or (x, y, weight) triples, or a NumPy array of them
+        :return: the number of edges actually removed
+        """
+        if hasattr(edges, "tolist"):
+            edges = edges.tolist()
+        removed = 0
+        for edge in edges:
+            x, y = edge[0], edge[1]
+            edge_id = self.edge_index.get((x, y))
+            if edge_id is not None:
+                self._cow.prepare_write(self)
+                self._remove_edge(edge_id, x, y)
+                removed += 1
+                if self.journal is not None:
+                    self.journal.record("remove_edge", x, y)
+        self._maybe_compact()
+        return removed
+
     def remove_edge(self, x, y):
-        """Removes the edge from x to y."""
-        for i, (neighbor, weight) in enumerate(self.out_neighbours[x]):
-            if neighbor == y:
-                del self.out_neighbours[x][i]
-                return True
-        return False
+        """Removes the edge from x to y in O(1) amortized."""
+        edge_id = self.edge_index.get((x, y))
+        if edge_id is None:
+            return False
+        self._cow.prepare_write(self)
+        self._remove_edge(edge_id, x, y)
+        self._maybe_compact()
+        if self.journal is not None:
+            self.journal.record("remove_edge", x, y)
+        return True
 
     def remove_vertex(self, x):
-        """Removes vertex x from the graph."""
+        """Removes vertex x and all its inbound and outbound edges in O(deg(x))."""
         if x in self.out_neighbours:
+            self._cow.prepare_write(self)
+            for neighbor, _ in list(self.out_neighbours[x]):
+                self._remove_edge(self.edge_index[(x, neighbor)], x, neighbor)
+            for source, _ in list(self.in_neighbours[x]):
+                self._remove_edge(self.edge_index[(source, x)], source, x)
             del self.out_neighbours[x]
+            del self.in_neighbours[x]
+            self._maybe_compact()
+            if self.journal is not None:
+                self.journal.record("remove_vertex", x)
             return True
         else:
             return False
 
+    def _take_edge_id(self):
+        """Returns the id for a new edge, reusing the id of a removed edge when there is one."""
+        if self._free_ids:
+            return self._free_ids.pop()
+        edge_id = self._next_id
+        self._next_id += 1
+        self._out_slot.append(0)
+        self._in_slot.append(0)
+        return edge_id
+
+    def _remove_edge(self, edge_id, x, y):
+        """
+        Unlinks edge x -> y in O(1): in both adjacency lists the last entry is moved into the
+        position of the removed one, so nothing has to be searched or shifted.
+        """
+        out_list = self._own_out(x)
+        position = self._out_slot[edge_id]
+        last = out_list.pop()
+        if position < len(out_list):
+            out_list[position] = last
+            self._out_slot[self.edge_index[(x, last[0])]] = position
+
+        in_list = self._own_in(y)
+        position = self._in_slot[edge_id]
+        last = in_list.pop()
+        if position < len(in_list):
+            in_list[position] = last
+            self._in_slot[self.edge_index[(last[0], y)]] = position
+
+        del self.edges[edge_id]
+        del self.edge_index[(x, y)]
+        self._free_ids.append(edge_id)
+        self.edge_count -= 1
+        self._removed_since_compaction += 1
+
+    def _maybe_compact(self):
+        """
+        Deleting from a dict leaves a tombstone slot behind and dicts never shrink on deletion,
+        so once there have been more removals than there are live edges the edge index is
+        rebuilt at its live size. Freed ids at the top of the id range are given back too,
+        which shrinks the edge table.
+        """
+        if self._removed_since_compaction <= max(self.edge_count, COMPACTION_MIN):
+            return
+        self.edge_index = dict(self.edge_index)
+        free_ids = sorted(self._free_ids)
+        while free_ids and free_ids[-1] == self._next_id - 1:
+            free_ids.pop()
+            self._next_id -= 1
+        del self._out_slot[self._next_id:]
+        del self._in_slot[self._next_id:]
+        self.edges.truncate(self._next_id)
+        free_ids.reverse()  # Hand out the lowest ids first
+        self._free_ids = free_ids
+        self._removed_since_compaction = 0
+
     def add_vertex(self, x):
         """Adds vertex x to the graph."""
         if x not in self.out_neighbours:
+            self._cow.prepare_write(self)
             self.out_neighbours[x] = []
+            self.in_neighbours[x] = []
+            if self.journal is not None:
+                self.journal.record("add_vertex", x)
         else:
             raise ValueError("Vertex already exists")
 
@@ -78,6 +297,18 @@ class Graph:
         """Returns an iterable containing all outbound neighbors of x."""
         return [(neighbor, weight) for neighbor, weight in self.out_neighbours[x]]
 
+    def parse_in(self, x):
+        """Returns an iterable containing all inbound neighbors of x, as (source, weight) pairs."""
+        return [(source, weight) for source, weight in self.in_neighbours[x]]
+
+    def get_in_degree(self, x):
+        """Returns the in-degree of vertex x in O(1)."""
+        return len(self.in_neighbours[x])
+
+    def get_out_degree(self, x):
+        """Returns the out-degree of vertex x in O(1)."""
+        return len(self.out_neighbours[x])
+
     def get_number_vertices(self):
         """Returns the number of vertices in the graph."""
         return len(self.out_neighbours)
@@ -87,66 +318,225 @@ class Graph:
         return self.out_neighbours.keys()
 
     @staticmethod
-    def read_from_file(file_name):
-        """Static method to read a graph from a file."""
-        with open(file_name, "r") as f:
-            x, y = map(int, f.readline().split())
-            graph = Graph(x)  # Initialize the graph with x vertices
-            for line in f:
-                u, v, w = map(int, line.split())
-                graph.add_edge(u, v, w)
+    def read_from_file(file_name, chunk_bytes=None):
+        """Static method to read a graph from a file, optionally streaming it in blocks of chunk_bytes."""
+        graph = Graph(None)
+        graph._read_from_file(file_name, chunk_bytes)
         return graph
 
     def is_edge(self, x, y):
         """
-        Returns True if there is an edge from x to y in the graph.
+        Checks in O(1) whether there is an edge from x to y in the graph.
         :param x: source vertex
         :param y: target vertex
         :return: returns the edge_id from x to y if it exists, otherwise None
         """
-        for edge_id in range(self.edge_count):
-            source, target, _ = self.edges[edge_id]
-            if source == x and target == y:
-                return edge_id
-        return None
+        return self.edge_index.get((x, y))
 
-    def generate_random_graph(self, number_vertices, number_edges):
+    def memory_report(self):
+        """
+        Breaks the memory held by the graph down by structure (containers, tuples and ints included;
+        an object referenced by two structures is counted in the first one). Memory-mapped file
+        pages are not counted, they belong to the page cache.
+        :return: dict structure name -> bytes, plus "total"
         """
-        Generates a random graph.
+        seen = set()
+        report = {
+            "out_neighbours": deep_sizeof(self.out_neighbours, seen),
+            "in_neighbours": deep_sizeof(self.in_neighbours, seen),
+            "edges": deep_sizeof(self.edges, seen),
+            "edge_index": deep_sizeof(self.edge_index, seen),
+            "removal_bookkeeping": deep_sizeof((self._out_slot, self._in_slot, self._free_ids), seen),
+        }
+        report["total"] = sum(report.values())
+        return report
+
+    def generate_random_graph(self, number_vertices, number_edges, seed=None):
+        """
+        Generates a random graph with exactly number_edges distinct edges and no self-loops.
+        Every possible edge x -> y (x != y) is numbered x * (n - 1) + (y if y < x else y - 1),
+        and number_edges of those numbers are sampled without replacement, so there is no
+        rejection loop and no duplicate to skip. With NumPy the sampling and the decoding of the
+        numbers run as array operations.
         :param number_vertices: number of vertices
         :param number_edges: number of edges
+        :param seed: seed of the random generator, the same seed always gives the same graph
+                     (a different one with and without NumPy)
         """
+        if number_vertices < 0:
+            raise ValueError("The number of vertices cannot be negative")
+        possible_edges = number_vertices * (number_vertices - 1)
+        if not 0 <= number_edges <= possible_edges:
+            raise ValueError("Too many edges for the given number of vertices")
+        row = max(number_vertices - 1, 1)
+        if np is not None and possible_edges < 2 ** 63:
+            rng = np.random.default_rng(seed)
+            codes = rng.choice(possible_edges, number_edges, replace=False)
+            sources, targets = np.divmod(codes, row)
+            targets += targets >= sources  # Skip the self-loop
+            weights = rng.integers(1, 101, number_edges)  # Random weights between 1 and 100
+            sources, targets, weights = sources.tolist(), targets.tolist(), weights.tolist()
+        else:
+            rng = random.Random(seed)
+            codes = rng.sample(range(possible_edges), number_edges)
+            sources = [code // row for code in codes]
+            targets = [y + (y >= x) for x, y in zip(sources, (code % row for code in codes))]  # Skip the self-loop
+            weights = rng.choices(range(1, 101), k=number_edges)  # Random weights between 1 and 100
+
+        journal = self.journal
         self.__init__(number_vertices)  # Re-initialize the graph with the given number of vertices
-        for _ in range(number_edges):
-            x = random.randint(0, number_vertices - 1)
-            y = random.randint(0, number_vertices - 1)
-            weight = random.randint(1, 100)  # Random weight between 1 and 100
-            if x != y and self.is_edge(x, y) is None:
-                self.add_edge(x, y, weight)
+        self._load_edges(sources, targets, weights)
+        if journal is not None:
+            journal.invalidate()  # Everything changed, the next save rewrites the base file
+            self.journal = journal
 
-    def deepcopy(self):
+    def snapshot(self):
         """
-        Creates a deep copy of the graph.
-        :return: A new Graph object that is a deep copy of the current graph.
+        Creates an independent copy of the graph in O(1) using copy-on-write.
+        The copy reads the dicts, edge table, slot arrays and adjacency lists of the graph through
+        overlays that keep its own changes (graph_common.cow); while the copy is alive, the graph hands
+        the old value of every entry it overwrites over to it first. A write costs O(1) extra per live
+        copy, plus O(deg) when a shared adjacency list has to be copied, and a read through an overlay a
+        few dict lookups. For undo, GraphUI records inverse mutations instead.
+        :return: A new Graph object that can be modified independently of the current graph.
         """
-        new_graph = Graph()
-        new_graph.out_neighbours = copy.deepcopy(self.out_neighbours)
-        new_graph.edges = copy.deepcopy(self.edges)
+        new_graph = Graph(None)
+        self._cow.share(self, new_graph)
         new_graph.edge_count = self.edge_count
+        new_graph._next_id = self._next_id  # The ids freed before the snapshot stay with this graph
+        new_graph._removed_since_compaction = self._removed_since_compaction
         return new_graph
 
+    def deepcopy(self):
+        """
+        Creates a copy of the graph that can be modified independently, see snapshot().
+        :return: A new Graph object
+        """
+        return self.snapshot()
+
+    def _own_out(self, x):
+        """Returns the out list of x, copying it first if a snapshot may still be reading it."""
+        adjacency = self.out_neighbours[x]
+        if not self._cow.owns(self.out_neighbours, x):
+            adjacency = self.out_neighbours[x] = list(adjacency)
+        return adjacency
+
+    def _own_in(self, x):
+        """Returns the in list of x, copying it first if a snapshot may still be reading it."""
+        adjacency = self.in_neighbours[x]
+        if not self._cow.owns(self.in_neighbours, x):
+            adjacency = self.in_neighbours[x] = list(adjacency)
+        return adjacency
+
+
+def _numbered_vertex_count(graph):
+    """
+    Returns n such that every vertex is one of 0 .. n-1, the way both file formats number them,
+    or None if a vertex is not a non-negative int (a string label, for example).
+    """
+    number_vertices = 0
+    for vertex in graph.parse_vertices():
+        if not isinstance(vertex, int) or vertex < 0:
+            return None
+        number_vertices = max(number_vertices, vertex + 1)
+    return number_vertices
+
 
 def write_to_file(graph: Graph, file_name):
     """
-    Writes the graph to a file.
+    Writes the graph to a file, in the binary CSR format if the name ends in ".bin".
+    Both formats number the vertices 0 .. n-1, so the gaps left by removed vertices read back as
+    isolated vertices; save_to_file journals their removal.
     :param graph: graph object
     :param file_name: file name
     """
+    number_vertices = _numbered_vertex_count(graph)
+    if file_name.endswith(BINARY_SUFFIX):
+        if number_vertices is None:
+            raise ValueError("The binary format only stores vertices numbered by non-negative ints")
+        CSRGraph.from_edges(number_vertices, *graph.edges.columns()).write_binary(file_name)
+        return
+    if number_vertices is None:  # Other labels are written as they are, after the number of vertices
+        number_vertices = graph.get_number_vertices()
     with open(file_name, "w") as f:
-        f.write(f"{graph.get_number_vertices()} {graph.edge_count}\n")
-        for edge_id in range(graph.edge_count):
-            source, target, weight = graph.get_edge_by_id(edge_id)
-            f.write(f"{source} {target} {weight}\n")
+        f.write(f"{number_vertices} {graph.edge_count}\n")
+        f.writelines(f"{source} {target} {weight}\n" for source, target, weight in zip(*graph.edges.columns()))
+
+
+def save_to_file(graph: Graph, file_name):
+    """
+    Persists the graph to file_name. If the graph journals into that file, only the changes since the
+    last save are appended to the journal; otherwise, or once the journal outgrows the graph, the file
+    is rewritten (through a temporary file, so a crash never leaves half a graph) and the journal emptied.
+    Afterwards the graph journals into file_name.
+    :param graph: graph object
+    :param file_name: file name
+    """
+    journal = graph.journal
+    if journal is not None and journal.base_file == file_name and not journal.stale:
+        journal.flush()
+        if not journal.needs_compaction(graph.edge_count):
+            return
+    else:
+        journal = graph.journal = Journal(file_name)
+    root, extension = os.path.splitext(file_name)
+    temporary = f"{root}.tmp{extension}"  # Same extension, so write_to_file picks the same format
+    write_to_file(graph, temporary)
+    os.replace(temporary, file_name)
+    # The rewritten file brings removed vertices back as isolated ones, the fresh journal removes them again
+    number_vertices = _numbered_vertex_count(graph) or 0
+    journal.reset([f"remove_vertex {vertex}" for vertex in range(number_vertices) if vertex not in graph.out_neighbours])
+
+UNDO_LIMIT = 100  # Number of modifications GraphUI keeps for undo
+
+
+def _inverse_operations(graph, name, arguments):
+    """
+    Returns the mutations that undo graph.<name>(*arguments), read from the graph before it is applied,
+    in O(deg) for remove_vertex and O(1) otherwise. Undone edges come back with new EDGE_IDs.
+    :param graph: graph object
+    :param name: "add_vertex", "remove_vertex", "add_edge" or "remove_edge"
+    :param arguments: the arguments of the mutation
+    :return: list of (method name, arguments) pairs, to be applied in order
+    """
+    if name == "add_vertex":
+        return [("remove_vertex", arguments)]
+    if name == "add_edge":
+        return [("remove_edge", arguments[:2])]
+    if name == "remove_edge":
+        edge_id = graph.is_edge(*arguments)
+        return [] if edge_id is None else [("add_edge", (*arguments, graph.edges[edge_id][2]))]
+    if name == "remove_vertex":
+        x = arguments[0]
+        if x not in graph.out_neighbours:
+            return []
+        return ([("add_vertex", (x,))]
+                + [("add_edge", (x, target, weight)) for target, weight in graph.parse_out(x)]
+                + [("add_edge", (source, x, weight)) for source, weight in graph.parse_in(x) if source != x])
+    raise ValueError(f"{name!r} cannot be undone")
+
+# Commands understood by GraphUI.run_batch: name -> function(ui, *arguments as strings)
+BATCH_COMMANDS = {
+    "add_vertex": lambda ui, x: ui.graph.add_vertex(int(x)),
+    "remove_vertex": lambda ui, x: ui.graph.remove_vertex(int(x)),
+    "add_edge": lambda ui, x, y, weight: ui.graph.add_edge(int(x), int(y), int(weight)),
+    "remove_edge": lambda ui, x, y: ui.graph.remove_edge(int(x), int(y)),
+    "is_edge": lambda ui, x, y: ui.graph.is_edge(int(x), int(y)),
+    "in_degree": lambda ui, x: ui.graph.get_in_degree(int(x)),
+    "out_degree": lambda ui, x: ui.graph.get_out_degree(int(x)),
+    "out": lambda ui, x: ui.graph.parse_out(int(x)),
+    "in": lambda ui, x: ui.graph.parse_in(int(x)),
+    "vertices": lambda ui: ui.graph.get_number_vertices(),
+    "edges": lambda ui: ui.graph.edge_count,
+    "save": lambda ui, file_name: save_to_file(ui.graph, file_name),
+    "load": lambda ui, file_name: ui.load_graph(file_name),
+    "random": lambda ui, n, m, seed=None: ui.graph.generate_random_graph(int(n), int(m),
+                                                                        None if seed is None else int(seed)),
+    "copy": lambda ui: setattr(ui, "deep_copied_graph", ui.graph.snapshot()),
+    "save_copy": lambda ui, file_name="deepcopy.txt": write_to_file(ui.deep_copied_graph, file_name),
+}
+_BATCH_SIGNATURES = {name: signature(command) for name, command in BATCH_COMMANDS.items()}
+
 
 class GraphUI:
 
@@ -160,19 +550,40 @@ class GraphUI:
         else:
             self.graph = graph
         self.deep_copied_graph = None  # To store the deep copy of the graph
+        # Undo and redo entries: a (mutations, inverse mutations) pair of lists of (method name, arguments),
+        # or the Graph object that a load or a random generation replaced
+        self.undo_stack = []
+        self.redo_stack = []
 
     def load_graph_from_file_ui(self):
         """Prompts user to load a graph from a file."""
         file_name = input("Enter file name to load the graph: ")
-        self.graph = Graph.read_from_file(file_name)
+        self.remember_graph()
+        self.load_graph(file_name)
         print(f"Graph loaded from {file_name}")
 
+    def load_graph(self, file_name):
+        """Replaces the graph by the one in file_name, journaling later changes into that file."""
+        self.switch_graph(Graph.read_from_file(file_name))
+        self.graph.journal = Journal(file_name)
+
     def save_graph_to_file_ui(self):
-        """Prompts user to save the graph to a file."""
+        """Prompts user to save the graph to a file, appending only the changes if it was loaded from it."""
         file_name = input("Enter file name to save the graph: ")
-        write_to_file(self.graph, file_name)
+        save_to_file(self.graph, file_name)
         print(f"Graph saved to {file_name}")
 
+    def switch_graph(self, graph):
+        """
+        Makes another graph (an undo state, a loaded file) the current one. The journal follows
+        the current graph but becomes stale, so the next save rewrites the whole file.
+        """
+        journal, self.graph.journal = self.graph.journal, None
+        if journal is not None:
+            journal.invalidate()
+        graph.journal = journal
+        self.graph = graph
+
     def print_deep_copy(self):
         """Prints the deep copy of the graph."""
         if self.deep_copied_graph:
@@ -211,7 +622,9 @@ class GraphUI:
         print("15. Deep Copy Graph")
         print("16. Save Deep Copy to File")
         print("17. Print Deep Copy")
-        print("18. Exit")
+        print("18. Undo")
+        print("19. Redo")
+        print("20. Exit")
 
     def handle_menu_option(self, option):
         """Handles user input and executes the corresponding graph operation."""
@@ -250,6 +663,10 @@ class GraphUI:
         elif option == 17:
             self.print_deep_copy()
         elif option == 18:
+            self.undo_ui()
+        elif option == 19:
+            self.redo_ui()
+        elif option == 20:
             print("Exiting...")
             return False
         else:
@@ -266,13 +683,13 @@ class GraphUI:
     def add_vertex_ui(self):
         """Prompt user to add a vertex to the graph."""
         vertex = int(input("Enter vertex to add: "))
-        self.graph.add_vertex(vertex)
+        self.edit("add_vertex", vertex)
         print(f"Vertex {vertex} added.")
 
     def remove_vertex_ui(self):
         """Prompt user to remove a vertex from the graph."""
         vertex = int(input("Enter vertex to remove: "))
-        self.graph.remove_vertex(vertex)
+        self.edit("remove_vertex", vertex)
         print(f"Vertex {vertex} removed.")
 
     def add_edge_ui(self):
@@ -280,7 +697,7 @@ class GraphUI:
         x = int(input("Enter source vertex: "))
         y = int(input("Enter target vertex: "))
         weight = int(input("Enter weight of the edge: "))
-        if self.graph.add_edge(x, y, weight):
+        if self.edit("add_edge", x, y, weight):
             print(f"Edge {x} -> {y} with weight {weight} added.")
         else:
             print(f"Edge {x} -> {y} already exists.")
@@ -289,7 +706,7 @@ class GraphUI:
         """Prompt user to remove an edge from the graph."""
         x = int(input("Enter source vertex: "))
         y = int(input("Enter target vertex: "))
-        if self.graph.remove_edge(x, y):
+        if self.edit("remove_edge", x, y):
             print(f"Edge {x} -> {y} removed.")
         else:
             print(f"Edge {x} -> {y} does not exist.")
@@ -331,23 +748,121 @@ class GraphUI:
     def show_inbound_edges_ui(self):
         """Displays inbound edges of a vertex."""
         vertex = int(input("Enter vertex to show inbound edges: "))
-        inbound_edges = [(source, edge_id) for edge_id, (source, target, _) in self.graph.edges.items() if target == vertex]
         print(f"Inbound edges for vertex {vertex}:")
-        for source, edge_id in inbound_edges:
-            print(f"Source: {source}, Edge ID: {edge_id}")
+        for source, _ in self.graph.parse_in(vertex):
+            print(f"Source: {source}, Edge ID: {self.graph.is_edge(source, vertex)}")
 
     def generate_random_graph_ui(self):
         """Generates a random graph."""
         number_vertices = int(input("Enter number of vertices: "))
         number_edges = int(input("Enter number of edges: "))
-        self.graph.generate_random_graph(number_vertices, number_edges)
+        seed = input("Enter seed (leave empty for a different graph every time): ")
+        graph = Graph(None)  # A new object, so that undo can switch back to the old one
+        graph.generate_random_graph(number_vertices, number_edges, int(seed) if seed else None)
+        self.remember_graph()
+        self.switch_graph(graph)
         print(f"Random graph generated with {number_vertices} vertices and {number_edges} edges.")
 
     def deep_copy_graph_ui(self):
         """Creates a deep copy of the graph."""
-        self.deep_copied_graph = self.graph.deepcopy()
+        self.deep_copied_graph = self.graph.snapshot()
         print("Deep copy of the graph created. You can now modify them independently.")
 
+    def edit(self, name, *arguments):
+        """
+        Applies a mutation to the graph and remembers the mutations that undo it, so an undo entry
+        costs O(deg) instead of a copy of the graph.
+        :param name: "add_vertex", "remove_vertex", "add_edge" or "remove_edge"
+        :param arguments: the arguments of the graph method
+        :return: the result of the graph method
+        """
+        inverse = _inverse_operations(self.graph, name, arguments)
+        result = getattr(self.graph, name)(*arguments)
+        if result is not False:  # False: nothing changed, nothing to undo
+            self._push_undo(([(name, arguments)], inverse))
+        return result
+
+    def remember_graph(self):
+        """Remembers the current graph object before another one replaces it, so the switch can be undone."""
+        self._push_undo(self.graph)
+
+    def _push_undo(self, entry):
+        self.undo_stack.append(entry)
+        if len(self.undo_stack) > UNDO_LIMIT:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+
+    def _revert(self, entry):
+        """
+        Reverts an undo or redo entry.
+        :return: the entry that reverts it again
+        """
+        if isinstance(entry, Graph):
+            current = self.graph
+            self.switch_graph(entry)
+            return current
+        mutations, inverse = entry
+        for name, arguments in inverse:
+            getattr(self.graph, name)(*arguments)
+        return inverse, mutations
+
+    def undo_ui(self):
+        """Restores the graph as it was before the last modification."""
+        if not self.undo_stack:
+            print("Nothing to undo.")
+            return
+        self.redo_stack.append(self._revert(self.undo_stack.pop()))
+        print("Last modification undone.")
+
+    def redo_ui(self):
+        """Re-applies the last undone modification."""
+        if not self.redo_stack:
+            print("Nothing to redo.")
+            return
+        self.undo_stack.append(self._revert(self.redo_stack.pop()))
+        print("Modification redone.")
+
+    def run_batch(self, commands, out=sys.stdout, quiet=False):
+        """
+        Runs a stream of commands such as "add_edge 1 2 5" or "save out.bin" without the menu,
+        one command per line (see BATCH_COMMANDS; blank lines and lines starting with # are skipped).
+        For every command a line "line_number  command  result  latency" is written, and a latency
+        summary per command name at the end. A failing command is reported and the replay goes on.
+        No undo history is recorded, so a long replay does not copy the graph on every mutation.
+        :param commands: iterable of command lines (an open file, sys.stdin, a list of strings)
+        :param out: text stream the results are written to
+        :param quiet: only write the summary
+        :return: dict command name -> list of latencies in seconds
+        """
+        latencies = {}
+        for line_number, line in enumerate(commands, 1):
+            words = line.split()
+            if not words or words[0].startswith("#"):
+                continue
+            name, arguments = words[0], words[1:]
+            start = perf_counter()
+            try:
+                if name not in BATCH_COMMANDS:
+                    raise ValueError(f"unknown command {name!r}")
+                try:
+                    _BATCH_SIGNATURES[name].bind(self, *arguments)
+                except TypeError:
+                    raise ValueError(f"usage: {name} {' '.join(list(_BATCH_SIGNATURES[name].parameters)[1:])}")
+                start = perf_counter()
+                result = BATCH_COMMANDS[name](self, *arguments)
+            except (ValueError, KeyError, OSError, AttributeError) as error:
+                result = f"error: {error!r}"
+            elapsed = perf_counter() - start
+            latencies.setdefault(name, []).append(elapsed)
+            if not quiet:
+                out.write(f"{line_number}\t{name}\t{result}\t{elapsed * 1e6:.1f} us\n")
+
+        out.write("# command\tcount\ttotal ms\tmean us\tmax us\n")
+        for name, times in latencies.items():
+            out.write(f"# {name}\t{len(times)}\t{sum(times) * 1e3:.3f}\t{sum(times) / len(times) * 1e6:.1f}"
+                      f"\t{max(times) * 1e6:.1f}\n")
+        return latencies
+
     def run(self):
         """Runs the menu-driven UI in a loop."""
         while True:
@@ -359,5 +874,19 @@ class GraphUI:
 
 # Example usage:
 if __name__ == "__main__":
-    ui = GraphUI()  # Initialize UI with graph from "graph.txt"
-    ui.run()  # Start the console-based menu system
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Directed graph console.")
+    parser.add_argument("graph_file", nargs="?", default="graph.txt", help="graph to start from (default: graph.txt)")
+    parser.add_argument("--batch", metavar="COMMANDS",
+                        help="run the commands in this file ('-' for stdin) instead of showing the menu")
+    parser.add_argument("--quiet", action="store_true", help="in batch mode only print the latency summary")
+    arguments = parser.parse_args()
+
+    ui = GraphUI(Graph.read_from_file(arguments.graph_file))  # Initialize UI with graph from "graph.txt" by default
+    ui.graph.journal = Journal(arguments.graph_file)  # Saving back to the same file only appends the changes
+    if arguments.batch is None:
+        ui.run()  # Start the console-based menu system
+    elif arguments.batch == "-":
+        ui.run_batch(sys.stdin, quiet=arguments.quiet)
+    else:
+        with open(arguments.batch) as commands:
+            ui.run_batch(commands, quiet=arguments.quiet)
\ No newline at end of file
@@ -0,0 +1,213 @@
+import io
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the text format is then parsed with the array module alone
+    np = None
+
+CHUNK_BYTES = 1 << 24  # Parse the text format 16 MiB at a time
+
+# Binary CSR format: header, then offsets (n + 1 ints), targets (m int32) and weights (m numbers), little-endian
+BINARY_MAGIC = b"GRAPHCSR"
+BINARY_SUFFIX = ".bin"
+# magic, number of vertices, number of edges, bytes per offset, bytes per weight
+_HEADER = struct.Struct("<8sqqii")
+# Weight field of the header -> typecode of the weights; floating point weights store their width negated
+_WEIGHT_TYPECODES = {4: "i", 8: "q", -8: "d"}
+
+
+def read_header(f):
+    """
+    Reads the "n m" first line of a graph file.
+    :param f: text file positioned at the beginning
+    :return: (number of vertices, number of edges)
+    """
+    number_vertices, number_edges = map(int, f.readline().split())
+    return number_vertices, number_edges
+
+
+def iter_edge_chunks(f, chunk_bytes=CHUNK_BYTES):
+    """
+    Parses the "x y c" lines that follow the header in blocks of about chunk_bytes characters,
+    so a file never has to be held in memory as Python objects all at once.
+    :param f: text file positioned after the header
+    :param chunk_bytes: approximate size of one block
+    :yield: (sources, targets, weights) arrays for one block of lines
+    """
+    for text in _iter_blocks(f, chunk_bytes):
+        yield _parse_block(text)
+
+
+def _iter_blocks(f, chunk_bytes):
+    """Reads the rest of a text file in blocks of about chunk_bytes characters that end with a whole line."""
+    rest = ""
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind("\n") + 1  # Only parse whole lines, keep the partial one for the next block
+        rest = block[cut:]
+        if cut:
+            yield block[:cut]
+    if rest.strip():
+        yield rest
+
+
+def _parse_block(text):
+    """Turns a block of whole "x y c" lines into three parallel arrays."""
+    values = _parse_values(text)
+    return values[0::3], values[1::3], values[2::3]
+
+
+def _parse_values(text):
+    """
+    Turns a block of whole "x y c" lines into one array of "q", three values per edge.
+    :raises ValueError: if a token is not an int or the number of values is not a multiple of 3
+    :raises OverflowError: if a value does not fit in 64 bits
+    """
+    values = array("q", map(int, text.split()))
+    if len(values) % 3:
+        raise ValueError("Every edge line needs a source, a target and a cost")
+    return values
+
+
+def read_edge_list(file_name, chunk_bytes=CHUNK_BYTES):
+    """
+    Reads a whole graph file in the "n m / x y c" text format into arrays.
+    Without NumPy repeated (x, y) pairs are kept and Graph and CSRGraph drop them while building;
+    with NumPy only the first line of each pair is returned.
+    :param file_name: The filename from which the graph is read.
+    :param chunk_bytes: approximate size of one parsed block
+    :return: (number of vertices, sources, targets, weights)
+    """
+    sources, targets, weights = array("q"), array("q"), array("q")
+    with open(file_name, "r") as f:
+        number_vertices, _ = read_header(f)
+        if np is not None:
+            return (number_vertices,) + _read_edges_numpy(f, number_vertices, chunk_bytes)
+        for chunk_sources, chunk_targets, chunk_weights in iter_edge_chunks(f, chunk_bytes):
+            sources.extend(chunk_sources)
+            targets.extend(chunk_targets)
+            weights.extend(chunk_weights)
+    check_vertex_range(number_vertices, sources, targets)
+    return number_vertices, sources, targets, weights
+
+
+def _read_edges_numpy(f, number_vertices, chunk_bytes):
+    """
+    NumPy version of the edge parsing in read_edge_list: the blocks are parsed in C and the duplicate
+    pairs are found with one sort of the x * n + y keys instead of a dictionary lookup per line.
+    :return: (sources, targets, weights) arrays of "q", in the order of the file
+    """
+    blocks = [_parse_values_numpy(text) for text in _iter_blocks(f, chunk_bytes) if not text.isspace()]
+    values = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.int64)
+    sources, targets, weights = values[0::3], values[1::3], values[2::3]
+    if len(values) and (min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= number_vertices):
+        raise ValueError("Vertex does not exist")
+    # return_index gives the first line of every pair, like add_edge keeps the first one
+    if number_vertices <= 2 ** 31:
+        _, first = np.unique(sources * number_vertices + targets, return_index=True)
+    else:  # x * n + y could overflow int64, compare the pairs themselves
+        _, first = np.unique(np.stack((sources, targets), axis=1), axis=0, return_index=True)
+    first.sort()
+    columns = []
+    for column in (sources, targets, weights):
+        values = array("q")
+        values.frombytes(column[first].tobytes())
+        columns.append(values)
+    return tuple(columns)
+
+
+def _parse_values_numpy(text):
+    """
+    NumPy version of _parse_values, accepting and rejecting the same blocks. np.loadtxt parses a block
+    of regular "x y c" lines in C; it refuses anything int() might read differently (a value beyond
+    64 bits, "1_000", lines of unequal length, ...), and such a block goes through _parse_values instead.
+    :return: int64 ndarray, three values per edge
+    """
+    try:
+        values = np.loadtxt(io.StringIO(text), dtype=np.int64, comments=None, ndmin=2).ravel()
+    except ValueError:
+        values = None
+    if values is None or len(values) % 3:
+        values = np.frombuffer(_parse_values(text), dtype=np.int64)
+    return values
+
+
+def check_vertex_range(number_vertices, sources, targets):
+    """Raises ValueError if an endpoint is not one of the vertices 0 .. number_vertices - 1."""
+    for endpoints in (sources, targets):
+        if endpoints and (min(endpoints) < 0 or max(endpoints) >= number_vertices):
+            raise ValueError("Vertex does not exist")
+
+
+def is_binary_file(file_name):
+    """Returns True if the file starts with the magic bytes of the binary CSR format."""
+    with open(file_name, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def write_binary(file_name, number_vertices, offsets, targets, weights):
+    """
+    Writes CSR arrays in the binary format.
+    :param file_name: file name
+    :param number_vertices: number of vertices
+    :param offsets: array or memoryview of number_vertices + 1 row offsets ('i' or 'q')
+    :param targets: int32 array or memoryview of edge targets, grouped by source
+    :param weights: array or memoryview of edge weights ('i', 'q' or 'd'), parallel to targets
+    """
+    weight_code = weights.typecode if isinstance(weights, array) else weights.format
+    weight_field = -weights.itemsize if weight_code == "d" else weights.itemsize
+    with open(file_name, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, number_vertices, len(targets), offsets.itemsize, weight_field))
+        for values in (offsets, targets, weights):
+            if sys.byteorder != "little":
+                values = array(values.typecode if isinstance(values, array) else values.format, values)
+                values.byteswap()
+            f.write(values)
+
+
+def map_binary(file_name):
+    """
+    Maps a binary CSR file into memory. Nothing is read up front: the returned views page the
+    file in on demand and share the page cache, so opening a huge graph costs about as much as
+    opening a small one. The mapping stays alive as long as one of the views does.
+    :param file_name: file name
+    :return: (number of vertices, offsets, targets, weights) as read-only memoryviews
+    """
+    with open(file_name, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, number_vertices, number_edges, offset_size, weight_size = _HEADER.unpack_from(mapped)
+    if magic != BINARY_MAGIC:
+        mapped.close()
+        raise ValueError(f"{file_name} is not a binary graph file")
+    if offset_size not in (4, 8) or weight_size not in _WEIGHT_TYPECODES:
+        mapped.close()
+        raise ValueError(f"{file_name} has an invalid offset or weight width")
+
+    view = memoryview(mapped)
+    start = _HEADER.size
+    offsets_end = start + (number_vertices + 1) * offset_size
+    targets_end = offsets_end + 4 * number_edges
+    weights_end = targets_end + abs(weight_size) * number_edges
+    if len(view) < weights_end:
+        raise ValueError(f"{file_name} is truncated")
+
+    offsets = view[start:offsets_end].cast("i" if offset_size == 4 else "q")
+    targets = view[offsets_end:targets_end].cast("i")
+    weights = view[targets_end:weights_end].cast(_WEIGHT_TYPECODES[weight_size])
+    if sys.byteorder != "little":  # The file is little-endian, so fall back to swapped copies
+        offsets, targets, weights = (_swapped(values) for values in (offsets, targets, weights))
+    return number_vertices, offsets, targets, weights
+
+
+def _swapped(values):
+    """Copies a memoryview into an array with the byte order reversed."""
+    copied = array(values.format, values.tobytes())
+    copied.byteswap()
+    return copied
@@ -0,0 +1,117 @@
+import os
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACTION_MIN = 4096  # Journals with fewer records than this are never folded into the base file
+
+
+class Journal:
+    """
+    Append-only record of the mutations of a graph since its base file was last written.
+    The records live in a side file next to the base file, one "add_edge x y c", "remove_edge x y",
+    "add_vertex x" or "remove_vertex x" line per mutation (the same commands GraphUI.run_batch
+    understands). Saving only appends the new records, so it costs O(changes) instead of O(E);
+    Graph replays the journal after reading the base file.
+    """
+
+    def __init__(self, base_file):
+        """
+        :param base_file: the graph file the journal belongs to
+        """
+        self.base_file = base_file
+        self.file_name = base_file + JOURNAL_SUFFIX
+        self.stale = False  # The graph changed in a way the records cannot express, see invalidate()
+        self._pending = []  # Records not written to the side file yet
+        self.entries = _drop_torn_record(self.file_name)  # Records already in the side file
+
+    def record(self, command, *arguments):
+        """Remembers one mutation until the next flush()."""
+        if not self.stale:
+            self._pending.append(" ".join(map(str, (command,) + arguments)))
+
+    def invalidate(self):
+        """
+        Marks the journal as unusable, e.g. after an undo or a random regeneration replaced the whole
+        graph: the next save has to rewrite the base file.
+        """
+        self.stale = True
+        self._pending.clear()
+
+    def flush(self):
+        """Appends the pending records to the side file and syncs it to disk."""
+        if self.stale:
+            raise ValueError("The journal is stale, the base file has to be rewritten")
+        if not self._pending:
+            return
+        with open(self.file_name, "a") as f:
+            f.write("\n".join(self._pending) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += len(self._pending)
+        self._pending.clear()
+
+    def needs_compaction(self, edge_count):
+        """Returns True once replaying the journal would cost more than reading the base file."""
+        return self.entries > max(JOURNAL_COMPACTION_MIN, edge_count)
+
+    def reset(self, records=()):
+        """
+        Empties the journal after the base file was rewritten with the current graph.
+        :param records: records the new journal starts with, for what the base file cannot express
+        """
+        with open(self.file_name, "w") as f:
+            if records:
+                f.write("\n".join(records) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self.entries = len(records)
+        self._pending.clear()
+        self.stale = False
+
+
+def replay_journal(graph, base_file):
+    """
+    Applies the journal of base_file, if there is one, to a graph read from base_file.
+    Replaying is lenient (adding what exists or removing what is missing is skipped), so a journal that
+    survived a crash right after its base file was rewritten does no harm. A torn last line is ignored.
+    :param graph: graph read from base_file
+    :param base_file: the graph file
+    :return: the number of records applied
+    """
+    file_name = base_file + JOURNAL_SUFFIX
+    if not os.path.exists(file_name):
+        return 0
+    with open(file_name, "r") as f:
+        lines = f.read().split("\n")
+    applied = 0
+    for line in lines[:-1]:  # The last piece is empty, or a record whose write was cut off
+        command, *arguments = line.split()
+        arguments = [int(argument) for argument in arguments]
+        if command == "add_edge":
+            if arguments[0] in graph.out_neighbours and arguments[1] in graph.out_neighbours:
+                graph.add_edge(*arguments)
+        elif command == "remove_edge":
+            graph.remove_edge(*arguments)
+        elif command == "add_vertex":
+            if arguments[0] not in graph.out_neighbours:
+                graph.add_vertex(*arguments)
+        elif command == "remove_vertex":
+            graph.remove_vertex(*arguments)
+        else:
+            raise ValueError(f"Unknown journal record {line!r}")
+        applied += 1
+    return applied
+
+
+def _drop_torn_record(file_name):
+    """
+    Cuts a record whose write was interrupted off the end of a journal, so new records are not glued to it.
+    :return: the number of complete records, 0 if there is no journal
+    """
+    if not os.path.exists(file_name):
+        return 0
+    with open(file_name, "r+b") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    return data.count(b"\n")
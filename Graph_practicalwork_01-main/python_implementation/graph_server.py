@@ -0,0 +1,183 @@
+"""
+Long-lived query server that keeps one graph loaded and answers JSON-lines requests.
+
+Every request is one line {"id": ..., "op": "...", "args": [...]}, every answer one line
+{"id": ..., "result": ...} or {"id": ..., "error": "..."}. A client may send many requests
+without waiting (pipelining); answers carry the id of their request and come back as soon as
+they are ready, so a quick is_edge is not held up behind a dijkstra sent earlier.
+Quick queries run on the event loop, the CPU-heavy ones (see HEAVY_OPS) in a process pool whose
+workers load the graph once when they start.
+
+    python graph_server.py graph.txt --tcp 127.0.0.1:8765
+    python graph_server.py graph.bin --unix /tmp/graph.sock --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms import dijkstra, weakly_connected_components, strongly_connected_components
+from graph import Graph
+
+MAX_IN_FLIGHT = 64  # Requests of one connection that may be pending before the server stops reading it
+MAX_LINE = 1 << 20  # Longest accepted request line
+
+
+def _dijkstra(graph, start_vertex):
+    distances, parents = dijkstra(graph, start_vertex)
+    return {"distances": list(distances.items()), "parents": list(parents.items())}
+
+
+# Quick queries: op -> function(graph, *args), answered directly on the event loop
+QUICK_OPS = {
+    "is_edge": lambda graph, x, y: graph.is_edge(x, y),
+    "parse_out": lambda graph, x: graph.parse_out(x),
+    "parse_in": lambda graph, x: graph.parse_in(x),
+    "in_degree": lambda graph, x: graph.get_in_degree(x),
+    "out_degree": lambda graph, x: graph.get_out_degree(x),
+    "number_vertices": lambda graph: graph.get_number_vertices(),
+    "number_edges": lambda graph: graph.edge_count,
+    "get_edge_by_id": lambda graph, edge_id: graph.get_edge_by_id(edge_id),
+}
+
+# CPU-heavy queries: op -> function(graph, *args), run in the worker pool
+HEAVY_OPS = {
+    "dijkstra": _dijkstra,
+    "weakly_connected_components": weakly_connected_components,
+    "strongly_connected_components": strongly_connected_components,
+}
+
+_worker_graph = None  # The graph of the current process, shared by the server and forked workers
+
+
+def _init_worker(file_name):
+    """Loads the graph in a worker process, unless the worker was forked with it already loaded."""
+    global _worker_graph
+    if _worker_graph is None:
+        _worker_graph = Graph.read_from_file(file_name)
+
+
+def _worker_ready():
+    """No-op task: returns once a worker process is up."""
+    return os.getpid()
+
+
+def _run_heavy(op, args):
+    """Runs a heavy query against the graph of the worker process."""
+    return HEAVY_OPS[op](_worker_graph, *args)
+
+
+class GraphServer:
+    def __init__(self, file_name, workers=None):
+        """
+        Loads the graph and starts the worker pool, before any socket is open: a worker forked while a
+        client is connected would inherit that connection (and the listening socket) and keep it open
+        after the server closes it, so the client would never see the end of its answers.
+        :param file_name: graph file, in the text or binary format
+        :param workers: number of worker processes for heavy queries (default: number of CPUs)
+        """
+        global _worker_graph
+        self.file_name = file_name
+        self.graph = _worker_graph = Graph.read_from_file(file_name)
+        self.pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker, initargs=(file_name,))
+        # With fork the pool starts all of its workers on the first submit (spawned workers inherit no sockets)
+        self.pool.submit(_worker_ready).result()
+
+    async def answer(self, request):
+        """
+        Answers one decoded request.
+        :param request: dict with "op", optional "args" and optional "id"
+        :return: the response dict
+        """
+        response = {"id": request.get("id")}
+        op, args = request.get("op"), request.get("args", [])
+        try:
+            if op in QUICK_OPS:
+                response["result"] = QUICK_OPS[op](self.graph, *args)
+            elif op in HEAVY_OPS:
+                loop = asyncio.get_running_loop()
+                response["result"] = await loop.run_in_executor(self.pool, _run_heavy, op, args)
+            else:
+                response["error"] = f"unknown op {op!r}"
+        except (KeyError, TypeError, ValueError) as error:
+            response["error"] = f"{type(error).__name__}: {error}"
+        return response
+
+    async def handle_connection(self, reader, writer):
+        """Serves one client: reads request lines and writes each answer as soon as it is ready."""
+        in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        tasks = set()
+
+        async def serve(line):
+            try:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("a request must be a JSON object")
+                except ValueError as error:
+                    response = {"id": None, "error": f"bad request: {error}"}
+                else:
+                    response = await self.answer(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                in_flight.release()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await in_flight.acquire()
+                task = asyncio.create_task(serve(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, ValueError):  # ValueError: a line longer than MAX_LINE
+            pass
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host, port):
+        """Serves clients on a TCP socket until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path):
+        """Serves clients on a Unix socket until cancelled."""
+        server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        """Stops the worker processes."""
+        self.pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve graph queries over JSON lines.")
+    parser.add_argument("graph_file", help="graph to serve, in the text or binary format")
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument("--tcp", default="127.0.0.1:8765", metavar="HOST:PORT", help="default: 127.0.0.1:8765")
+    address.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes for heavy queries (default: number of CPUs)")
+    arguments = parser.parse_args()
+
+    graph_server = GraphServer(arguments.graph_file, arguments.workers)
+    try:
+        if arguments.unix:
+            asyncio.run(graph_server.serve_unix(arguments.unix))
+        else:
+            host, port = arguments.tcp.rsplit(":", 1)
+            asyncio.run(graph_server.serve_tcp(host, int(port)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        graph_server.close()
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from algorithms import dijkstra, strongly_connected_components, weakly_connected_components
+from csr_graph import CSRGraph
+from graph import Graph
+
+
+def random_graph(seed):
+    rng = random.Random(seed)
+    number_vertices = rng.randint(1, 15)
+    g = Graph(number_vertices)
+    for _ in range(rng.randint(0, 3 * number_vertices)):
+        g.add_edge(rng.randrange(number_vertices), rng.randrange(number_vertices), rng.randint(0, 9))
+    return g
+
+
+def reachable(g, start):
+    seen, stack = {start}, [start]
+    while stack:
+        for neighbour, _ in g.parse_out(stack.pop()):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+def as_partition(components):
+    return sorted(sorted(component) for component in components)
+
+
+@pytest.fixture(params=["graph", "csr"])
+def as_kind(request):
+    """Runs a test on Graph and on the same graph in CSR form."""
+    return (lambda g: g) if request.param == "graph" else CSRGraph.from_graph
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_strongly_connected_components(seed, as_kind):
+    g = random_graph(seed)
+    reach = {vertex: reachable(g, vertex) for vertex in g.parse_vertices()}
+    expected = {frozenset(v for v in reach[u] if u in reach[v]) for u in reach}
+    assert as_partition(strongly_connected_components(as_kind(g))) == as_partition(expected)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_weakly_connected_components(seed, as_kind):
+    g = random_graph(seed)
+    undirected = Graph(g.get_number_vertices())
+    for x, y, weight in g.edges.values():
+        undirected.add_edge(x, y, weight)
+        undirected.add_edge(y, x, weight)
+    expected = {frozenset(reachable(undirected, vertex)) for vertex in g.parse_vertices()}
+    assert as_partition(weakly_connected_components(as_kind(g))) == as_partition(expected)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_dijkstra_matches_bellman_ford(seed, as_kind):
+    g = random_graph(seed)
+    distances = {0: 0}
+    for _ in range(g.get_number_vertices()):
+        for x, y, weight in g.edges.values():
+            if x in distances and distances[x] + weight < distances.get(y, float("inf")):
+                distances[y] = distances[x] + weight
+    found, parents = dijkstra(as_kind(g), 0)
+    assert found == distances
+    for vertex, parent in parents.items():
+        if parent is not None:
+            assert found[vertex] == found[parent] + dict(g.parse_out(parent))[vertex]
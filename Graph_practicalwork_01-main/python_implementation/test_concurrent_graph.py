@@ -0,0 +1,116 @@
+import gc
+import random
+import threading
+
+from concurrent_graph import ConcurrentGraph, ReadWriteLock
+from graph import Graph
+
+
+def make_graph():
+    g = Graph(4)
+    for edge in [(0, 1, 1), (1, 2, 2), (2, 0, 3)]:
+        g.add_edge(*edge)
+    return ConcurrentGraph(g)
+
+
+def test_versions_count_effective_mutations():
+    graph = make_graph()
+    assert graph.add_edge(2, 3, 4) and graph.version == 1
+    assert not graph.add_edge(2, 3, 5) and graph.version == 1
+    assert not graph.remove_edge(3, 2) and graph.version == 1
+    graph.add_vertex(4)
+    assert graph.version == 2
+    assert graph.add_edges_from([(4, 0, 1), (4, 1, 1), (4, 0, 2)]) == 2 and graph.version == 3
+    assert graph.remove_edges_from([(9, 9)]) == 0 and graph.version == 3
+    assert graph.remove_vertex(4) and graph.version == 4
+    assert graph.edge_count == 4 and graph.get_number_vertices() == 4
+
+
+def test_queries():
+    graph = make_graph()
+    assert graph.is_edge(0, 1) is not None and graph.is_edge(1, 0) is None
+    assert graph.parse_out(1) == [(2, 2)] and graph.parse_in(0) == [(2, 3)]
+    assert graph.get_in_degree(0) == graph.get_out_degree(0) == 1
+    assert graph.get_edge_by_id(graph.is_edge(2, 0)) == (2, 0, 3)
+    assert graph.dijkstra(0)[0] == {0: 0, 1: 1, 2: 3}
+    assert sorted(map(sorted, graph.strongly_connected_components())) == [[0, 1, 2], [3]]
+    assert sorted(map(sorted, graph.weakly_connected_components())) == [[0, 1, 2], [3]]
+
+
+def test_read_view_is_shared_until_the_next_mutation():
+    graph = make_graph()
+    view = graph.read_view()
+    assert graph.read_view() is view
+    graph.add_edge(0, 3, 9)
+    later = graph.read_view()
+    assert later is not view and later.version == view.version + 1
+    assert view.graph.is_edge(0, 3) is None and later.graph.is_edge(0, 3) is not None
+
+
+def test_iterators_see_the_version_of_the_call():
+    graph = make_graph()
+    edges, out, vertices = graph.iter_edges(), graph.iter_out(0), graph.iter_vertices()
+    graph.add_edge(0, 3, 9)
+    graph.remove_edge(0, 1)
+    gc.collect()  # Only the iterators keep the old view alive now
+    assert [edge for _, edge in edges] == [(0, 1, 1), (1, 2, 2), (2, 0, 3)]
+    assert list(out) == [(1, 1)]
+    assert list(vertices) == [0, 1, 2, 3]
+    assert sorted(graph.iter_out(0)) == [(3, 9)]
+
+
+def test_readers_see_consistent_versions_under_writes():
+    graph = ConcurrentGraph(Graph(30))
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            view = graph.read_view()
+            try:
+                edges = list(view.graph.edges.items())
+                assert edges == list(view.graph.edges.items())
+                for edge_id, (x, y, weight) in edges:
+                    assert view.graph.is_edge(x, y) == edge_id and (y, weight) in view.graph.parse_out(x)
+                assert len(edges) == view.graph.edge_count
+            except AssertionError as error:
+                errors.append(error)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    rng = random.Random(0)
+    for step in range(3000):
+        x, y = rng.randrange(30), rng.randrange(30)
+        if rng.random() < 0.6:
+            graph.add_edge(x, y, step)
+        else:
+            graph.remove_edge(x, y)
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    writer_done = threading.Event()
+
+    def write():
+        with lock.write_locked():
+            writer_done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while not lock._waiting_writers:
+        pass
+    late_reader = threading.Thread(target=lambda: lock.read_locked().__enter__())
+    late_reader.start()
+    late_reader.join(0.05)
+    assert late_reader.is_alive() and not writer_done.is_set()  # The new reader waits behind the writer
+    lock.release_read()
+    writer.join()
+    late_reader.join()
+    assert writer_done.is_set()
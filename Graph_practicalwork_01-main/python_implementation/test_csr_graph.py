@@ -0,0 +1,141 @@
+import random
+import struct
+
+import pytest
+
+from csr_graph import CSRGraph, binary_to_text, text_to_binary
+from graph import Graph
+
+
+def random_edges(rng, number_vertices, number_edges, weight):
+    """Random edges, repeated pairs included, as three parallel lists."""
+    sources = [rng.randrange(number_vertices) for _ in range(number_edges)]
+    targets = [rng.randrange(number_vertices) for _ in range(number_edges)]
+    weights = [weight(rng) for _ in range(number_edges)]
+    return sources, targets, weights
+
+
+def as_graph(number_vertices, sources, targets, weights):
+    g = Graph(number_vertices)
+    for edge in zip(sources, targets, weights):
+        g.add_edge(*edge)
+    return g
+
+
+WEIGHTS = {
+    "int32": lambda rng: rng.randint(-5, 5),
+    "int64": lambda rng: rng.choice([rng.randint(-5, 5), 2 ** 40]),
+    "double": lambda rng: rng.choice([rng.randint(-5, 5), rng.random()]),
+}
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("kind", WEIGHTS)
+def test_matches_graph(seed, kind):
+    rng = random.Random(seed)
+    number_vertices = rng.randint(1, 15)
+    edges = random_edges(rng, number_vertices, rng.randint(0, 60), WEIGHTS[kind])
+    csr, g = CSRGraph.from_edges(number_vertices, *edges), as_graph(number_vertices, *edges)
+    assert csr.weights.typecode == {"int32": "i", "int64": "q", "double": "d"}[kind] or not csr.edge_count
+    assert csr.edge_count == g.edge_count
+    for vertex in range(number_vertices):
+        assert csr.parse_out(vertex) == g.parse_out(vertex)  # Duplicates keep their first occurrence
+        assert sorted(csr.parse_in(vertex)) == sorted(g.parse_in(vertex))
+        assert csr.get_in_degree(vertex) == g.get_in_degree(vertex)
+        assert csr.get_out_degree(vertex) == g.get_out_degree(vertex)
+        assert csr.in_neighbours[vertex] == csr.parse_in(vertex)
+    for edge_id, edge in csr.edges.items():
+        assert csr.get_edge_by_id(edge_id) == edge
+        assert csr.is_edge(*edge[:2]) == edge_id
+
+
+def test_parse_in_lists_sources_in_edge_id_order():
+    csr = CSRGraph.from_edges(3, [2, 0, 1, 0], [1, 1, 1, 2], [4, 5, 6, 7])
+    assert csr.parse_in(1) == [(0, 5), (1, 6), (2, 4)]
+    assert csr.parse_in(0) == []
+
+
+def test_dense_csr():
+    csr = CSRGraph.from_edges(4, [0, 0, 2, 3], [1, 2, 3, 0], [1, 1, 1, 1])
+    vertex_map, offsets, targets = csr.dense_csr()
+    assert vertex_map.is_identity() and len(vertex_map) == 4
+    assert (offsets.typecode, targets.typecode) == ("q", "q")
+    assert list(offsets) == [0, 2, 2, 3, 4] and list(targets) == [1, 2, 3, 0]
+    _, offsets, targets = csr.dense_csr(reverse=True)
+    assert [sorted(targets[offsets[v]:offsets[v + 1]]) for v in range(4)] == [[3], [0], [0], [2]]
+
+
+def test_from_graph():
+    g = Graph(4)
+    for edge in [(0, 1, 3), (1, 2, 4), (3, 0, 5)]:
+        g.add_edge(*edge)
+    csr = CSRGraph.from_graph(g)
+    assert sorted(csr.edges.values()) == sorted(g.edges.values())
+
+
+@pytest.mark.parametrize("sources, targets", [([0, 3], [1, 1]), ([0, 1], [1, -1])])
+def test_out_of_range_vertex(sources, targets):
+    with pytest.raises(ValueError, match="out of range"):
+        CSRGraph.from_edges(3, sources, targets, [1, 1])
+
+
+def test_lookups_outside_the_graph():
+    csr = CSRGraph.from_edges(2, [0], [1], [1])
+    assert csr.is_edge(5, 1) is None and csr.get_edge_by_id(1) is None
+    with pytest.raises(KeyError):
+        csr.out_neighbours[2]
+    with pytest.raises(KeyError):
+        csr.edges[3]
+
+
+@pytest.mark.parametrize("kind", WEIGHTS)
+def test_binary_round_trip(tmp_path, kind):
+    rng = random.Random(5)
+    csr = CSRGraph.from_edges(12, *random_edges(rng, 12, 50, WEIGHTS[kind]))
+    file_name = str(tmp_path / "graph.bin")
+    csr.write_binary(file_name)
+    loaded = CSRGraph.read_from_file(file_name)
+    assert loaded.weights.format == csr.weights.typecode
+    assert list(loaded.edges.items()) == list(csr.edges.items())
+    assert [loaded.parse_in(v) for v in range(12)] == [csr.parse_in(v) for v in range(12)]
+
+
+def test_text_binary_conversions(tmp_path):
+    text, binary, back = (str(tmp_path / name) for name in ("graph.txt", "graph.bin", "back.txt"))
+    with open(text, "w") as f:
+        f.write("4 5\n0 1 3\n1 2 4\n0 1 9\n3 0 5\n2 2 1\n")
+    text_to_binary(text, binary)
+    binary_to_text(binary, back)
+    with open(back) as f:
+        assert f.read() == "4 4\n0 1 3\n1 2 4\n2 2 1\n3 0 5\n"
+
+
+def test_graph_reads_binary_files(tmp_path):
+    file_name = str(tmp_path / "graph.bin")
+    CSRGraph.from_edges(3, [0, 1], [1, 2], [7, 8]).write_binary(file_name)
+    g = Graph.read_from_file(file_name)
+    assert g.parse_out(0) == [(1, 7)] and g.parse_in(2) == [(1, 8)]
+
+
+@pytest.mark.parametrize("field, value", [(24, 3), (28, 0), (28, 2), (28, -4)])
+def test_invalid_header_widths(tmp_path, field, value):
+    file_name = str(tmp_path / "graph.bin")
+    CSRGraph.from_edges(3, [0, 1], [1, 2], [7, 8]).write_binary(file_name)
+    with open(file_name, "r+b") as f:
+        f.seek(field)
+        f.write(struct.pack("<i", value))
+    with pytest.raises(ValueError, match="invalid offset or weight width"):
+        CSRGraph.read_binary(file_name)
+
+
+def test_truncated_and_foreign_files(tmp_path):
+    file_name = str(tmp_path / "graph.bin")
+    CSRGraph.from_edges(3, [0, 1], [1, 2], [7, 8]).write_binary(file_name)
+    with open(file_name, "r+b") as f:
+        f.truncate(40)
+    with pytest.raises(ValueError, match="truncated"):
+        CSRGraph.read_binary(file_name)
+    with open(file_name, "wb") as f:
+        f.write(b"NOTAGRAPH" + bytes(40))
+    with pytest.raises(ValueError, match="not a binary graph file"):
+        CSRGraph.read_binary(file_name)
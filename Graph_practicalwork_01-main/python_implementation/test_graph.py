@@ -0,0 +1,285 @@
+import random
+
+import pytest
+
+import graph as graph_module
+from graph import Graph, GraphUI, save_to_file, write_to_file
+from graph_journal import JOURNAL_SUFFIX
+
+
+def edge_set(g):
+    """The edges of g as a dict (source, target) -> weight."""
+    return {(source, target): weight for source, target, weight in g.edges.values()}
+
+
+def check_invariants(g):
+    """Checks that the adjacency lists, the edge table, the index and the removal slots agree."""
+    assert g.edge_count == len(g.edges) == len(g.edge_index)
+    for edge_id, (x, y, weight) in g.edges.items():
+        assert g.edge_index[(x, y)] == edge_id
+        assert g.out_neighbours[x][g._out_slot[edge_id]] == (y, weight)
+        assert g.in_neighbours[y][g._in_slot[edge_id]] == (x, weight)
+    assert sum(map(len, g.out_neighbours.values())) == sum(map(len, g.in_neighbours.values())) == g.edge_count
+    assert not set(g._free_ids) & set(g.edges)
+
+
+def random_mutations(g, model, rng, steps, number_vertices):
+    """Applies random mutations to g and to model, a dict (source, target) -> weight."""
+    vertices = set(g.parse_vertices())
+    for step in range(steps):
+        x, y = rng.randrange(number_vertices), rng.randrange(number_vertices)
+        operation = rng.random()
+        if operation < 0.5:
+            if x in vertices and y in vertices:
+                assert g.add_edge(x, y, step) == ((x, y) not in model)
+                model.setdefault((x, y), step)
+        elif operation < 0.85:
+            assert g.remove_edge(x, y) == ((x, y) in model)
+            model.pop((x, y), None)
+        elif operation < 0.93:
+            if x in vertices:
+                g.remove_vertex(x)
+                vertices.discard(x)
+                for pair in [pair for pair in model if x in pair]:
+                    del model[pair]
+        elif x not in vertices:
+            g.add_vertex(x)
+            vertices.add(x)
+
+
+def test_add_edge_rejects_missing_vertex():
+    g = Graph(3)
+    with pytest.raises(ValueError, match="Vertex does not exist"):
+        g.add_edge(0, 3, 1)
+    assert g.edge_count == 0 and g.parse_out(0) == []
+
+
+def test_add_vertex_twice_raises():
+    g = Graph(2)
+    with pytest.raises(ValueError, match="Vertex already exists"):
+        g.add_vertex(1)
+
+
+def test_duplicate_edge_keeps_first_weight():
+    g = Graph(2)
+    assert g.add_edge(0, 1, 5)
+    assert not g.add_edge(0, 1, 7)
+    assert g.parse_out(0) == [(1, 5)] and g.edge_count == 1
+
+
+def test_remove_edge_swaps_the_last_entry_in():
+    g = Graph(4)
+    for target in (1, 2, 3):
+        g.add_edge(0, target, target)
+    assert g.remove_edge(0, 1)
+    assert g.parse_out(0) == [(3, 3), (2, 2)]
+    assert not g.remove_edge(0, 1)
+    check_invariants(g)
+
+
+def test_removed_ids_are_reused():
+    g = Graph(3)
+    g.add_edge(0, 1, 1)
+    g.add_edge(1, 2, 2)
+    removed = g.is_edge(0, 1)
+    g.remove_edge(0, 1)
+    g.add_edge(2, 0, 3)
+    assert g.is_edge(2, 0) == removed
+    assert g.get_edge_by_id(removed) == (2, 0, 3)
+
+
+def test_remove_vertex_with_loop():
+    g = Graph(3)
+    g.add_edge(1, 1, 4)
+    g.add_edge(0, 1, 1)
+    g.add_edge(1, 2, 2)
+    assert g.remove_vertex(1)
+    assert not g.remove_vertex(1)
+    assert g.edge_count == 0 and g.parse_out(0) == [] and g.parse_in(2) == []
+    check_invariants(g)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_mutations_keep_invariants(seed, monkeypatch):
+    monkeypatch.setattr(graph_module, "COMPACTION_MIN", 4)  # Compact often
+    rng = random.Random(seed)
+    number_vertices = rng.randint(1, 12)
+    g, model = Graph(number_vertices), {}
+    for _ in range(10):
+        random_mutations(g, model, rng, 40, number_vertices)
+        check_invariants(g)
+        assert edge_set(g) == model
+
+
+def test_compaction_gives_top_ids_back(monkeypatch):
+    monkeypatch.setattr(graph_module, "COMPACTION_MIN", 0)
+    g = Graph(10)
+    for x in range(10):
+        for y in range(10):
+            g.add_edge(x, y, 1)
+    for edge_id in range(99, 0, -1):  # The highest ids first, so every compaction can give them back
+        g.remove_edge(*g.get_edge_by_id(edge_id)[:2])
+    assert g.edge_count == 1 and g._next_id < 10
+    assert len(g.edges.alive) == len(g._out_slot) == g._next_id
+    check_invariants(g)
+    g.add_edge(3, 4, 2)
+    assert g.is_edge(3, 4) == 1  # The lowest free id
+    check_invariants(g)
+
+
+def test_batches_match_single_mutations():
+    rng = random.Random(1)
+    edges = [(rng.randrange(8), rng.randrange(8), rng.randint(1, 9)) for _ in range(60)]
+    batch, single = Graph(8), Graph(8)
+    assert batch.add_edges_from(edges) == sum(single.add_edge(*edge) for edge in edges)
+    assert edge_set(batch) == edge_set(single)
+    removed = edges[::3]
+    assert batch.remove_edges_from(removed) == sum(bool(single.remove_edge(x, y)) for x, y, _ in removed)
+    assert edge_set(batch) == edge_set(single)
+    check_invariants(batch)
+    with pytest.raises(ValueError, match="Vertex does not exist"):
+        batch.add_edges_from([(0, 1, 1), (0, 8, 1)])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_snapshots_stay_independent(seed, monkeypatch):
+    monkeypatch.setattr(graph_module, "COMPACTION_MIN", 4)
+    rng = random.Random(seed)
+    number_vertices = rng.randint(2, 10)
+    graphs = [(Graph(number_vertices), {})]
+    for _ in range(60):
+        g, model = rng.choice(graphs)
+        if rng.random() < 0.2:
+            graphs.append((g.snapshot(), dict(model)))
+        elif rng.random() < 0.05 and len(graphs) > 1:
+            graphs.remove((g, model))  # Drop a graph: the ones sharing with it must not notice
+        else:
+            random_mutations(g, model, rng, 5, number_vertices)
+        for other, other_model in graphs:
+            assert edge_set(other) == other_model
+    for g, _ in graphs:
+        check_invariants(g)
+
+
+def test_snapshot_reads_do_not_see_later_writes():
+    g = Graph(3)
+    g.add_edge(0, 1, 1)
+    copy = g.snapshot()
+    g.add_edge(0, 2, 2)
+    g.remove_edge(0, 1)
+    assert copy.parse_out(0) == [(1, 1)] and copy.edge_count == 1
+    copy.add_edge(1, 2, 3)
+    assert g.is_edge(1, 2) is None and g.parse_out(0) == [(2, 2)]
+
+
+def test_generate_random_graph():
+    g = Graph(None)
+    g.generate_random_graph(30, 200, seed=7)
+    assert g.edge_count == 200 and g.get_number_vertices() == 30
+    assert all(x != y and 1 <= weight <= 100 for x, y, weight in g.edges.values())
+    again = Graph(None)
+    again.generate_random_graph(30, 200, seed=7)
+    assert list(again.edges.items()) == list(g.edges.items())
+    check_invariants(g)
+
+
+def test_generate_random_graph_without_numpy(monkeypatch):
+    monkeypatch.setattr(graph_module, "np", None)
+    g = Graph(None)
+    g.generate_random_graph(5, 20, seed=1)
+    assert len(edge_set(g)) == 20
+
+
+@pytest.mark.parametrize("number_vertices, number_edges", [(-1, 0), (-3, 2), (3, 7), (1, 1)])
+def test_generate_random_graph_rejects_impossible_sizes(number_vertices, number_edges):
+    with pytest.raises(ValueError):
+        Graph(None).generate_random_graph(number_vertices, number_edges)
+
+
+@pytest.mark.parametrize("name", ["graph.txt", "graph.bin"])
+@pytest.mark.parametrize("chunk_bytes", [None, 16])
+def test_file_round_trip(tmp_path, name, chunk_bytes):
+    g = Graph(None)
+    g.generate_random_graph(20, 80, seed=3)
+    file_name = str(tmp_path / name)
+    write_to_file(g, file_name)
+    loaded = Graph.read_from_file(file_name, chunk_bytes)
+    assert edge_set(loaded) == edge_set(g) and loaded.get_number_vertices() == 20
+    check_invariants(loaded)
+
+
+def test_binary_format_needs_numbered_vertices(tmp_path):
+    g = Graph(None)
+    g.add_vertex("a")
+    with pytest.raises(ValueError):
+        write_to_file(g, str(tmp_path / "graph.bin"))
+
+
+def test_journal_replays_changes_since_the_last_save(tmp_path):
+    file_name = str(tmp_path / "graph.txt")
+    g = Graph(None)
+    g.generate_random_graph(10, 30, seed=2)
+    save_to_file(g, file_name)
+    size = (tmp_path / "graph.txt").stat().st_size
+    g.add_edge(*next((x, y) for x in range(10) for y in range(10) if g.is_edge(x, y) is None), 42)
+    g.remove_edge(*next(iter(g.edge_index)))
+    g.remove_vertex(3)
+    save_to_file(g, file_name)
+    assert (tmp_path / "graph.txt").stat().st_size == size  # Only the journal grew
+    loaded = Graph.read_from_file(file_name)
+    assert edge_set(loaded) == edge_set(g) and 3 not in loaded.out_neighbours
+
+
+def test_journal_ignores_a_torn_record(tmp_path):
+    file_name = str(tmp_path / "graph.txt")
+    g = Graph(3)
+    save_to_file(g, file_name)
+    g.add_edge(0, 1, 5)
+    save_to_file(g, file_name)
+    with open(file_name + JOURNAL_SUFFIX, "a") as f:
+        f.write("add_edge 1 2")  # A write cut off by a crash
+    assert edge_set(Graph.read_from_file(file_name)) == {(0, 1): 5}
+
+
+def test_stale_journal_rewrites_the_base_file(tmp_path):
+    file_name = str(tmp_path / "graph.txt")
+    g = Graph(4)
+    save_to_file(g, file_name)
+    g.generate_random_graph(4, 5, seed=1)
+    assert g.journal.stale
+    save_to_file(g, file_name)
+    assert edge_set(Graph.read_from_file(file_name)) == edge_set(g)
+
+
+def test_undo_and_redo(capsys):
+    g = Graph(4)
+    g.add_edge(0, 1, 1)
+    g.add_edge(2, 0, 2)
+    ui = GraphUI(g)
+    before = edge_set(g)
+    ui.edit("remove_vertex", 0)
+    ui.edit("add_edge", 1, 2, 3)
+    ui.edit("remove_edge", 3, 3)  # Nothing changes, nothing to undo
+    after = edge_set(g)
+    ui.undo_ui()
+    ui.undo_ui()
+    assert edge_set(g) == before and 0 in g.out_neighbours
+    ui.undo_ui()
+    assert "Nothing to undo." in capsys.readouterr().out
+    ui.redo_ui()
+    ui.redo_ui()
+    assert edge_set(g) == after
+    check_invariants(g)
+
+
+def test_run_batch_reports_errors():
+    ui = GraphUI(Graph(3))
+    lines = ["add_edge 0 1 4", "# comment", "", "add_edge 0 9 1", "frobnicate", "add_edge 0", "edges"]
+    out = []
+    latencies = ui.run_batch(lines, out=type("Out", (), {"write": lambda self, text: out.append(text)})())
+    results = [line.split("\t") for line in out if not line.startswith("#")]
+    assert [(number, name) for number, name, *_ in results] == [
+        ("1", "add_edge"), ("4", "add_edge"), ("5", "frobnicate"), ("6", "add_edge"), ("7", "edges")]
+    assert results[0][2] == "True" and results[4][2] == "1"
+    assert all(result[2].startswith("error") for result in results[1:4])
+    assert len(latencies["add_edge"]) == 3
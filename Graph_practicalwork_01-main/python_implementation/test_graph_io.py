@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+import graph_io
+from graph_io import iter_edge_chunks, read_edge_list
+
+numpy_paths = [pytest.param(True, id="numpy"), pytest.param(False, id="array")]
+if graph_io.np is None:
+    numpy_paths = [pytest.param(True, id="numpy", marks=pytest.mark.skip("NumPy is not installed")), numpy_paths[1]]
+
+
+@pytest.fixture(params=numpy_paths)
+def parser(request, monkeypatch):
+    """read_edge_list on the NumPy path or on the array path."""
+    if not request.param:
+        monkeypatch.setattr(graph_io, "np", None)
+    return read_edge_list
+
+
+def write(tmp_path, text):
+    file_name = tmp_path / "graph.txt"
+    file_name.write_text(text)
+    return str(file_name)
+
+
+def first_weights(sources, targets, weights):
+    """Edges as a dict (source, target) -> weight of the first line of the pair, like add_edge keeps."""
+    edges = {}
+    for edge in zip(sources, targets, weights):
+        edges.setdefault(edge[:2], edge[2])
+    return edges
+
+
+@pytest.mark.parametrize("chunk_bytes", [5, 64, 1 << 20])
+@pytest.mark.parametrize("text", [
+    "3 2\n0 1 5\n1 2 6\n",
+    "3 2\n0 1 5\n1 2 6",  # No newline at the end
+    "3 2\n0 1 5 1 2 6\n",  # Values are read as a stream, three per edge
+    "3 0\n\n \n",
+    "3 2\n 0\t1 -5 \r\n\n1 2 +6\n",
+    "3 1\n0 1 1_000\n",
+    "3 2\n0 1 5\n0 1 7\n1 0 9223372036854775807\n",
+])
+def test_accepted_files(tmp_path, parser, text, chunk_bytes):
+    number_vertices, *columns = parser(write(tmp_path, text), chunk_bytes)
+    assert number_vertices == 3
+    tokens = [int(token) for token in text.split()[2:]]
+    assert first_weights(*columns) == first_weights(tokens[0::3], tokens[1::3], tokens[2::3])
+
+
+@pytest.mark.parametrize("chunk_bytes", [5, 1 << 20])
+@pytest.mark.parametrize("text, error, message", [
+    ("3 1\n0 1\n", ValueError, "Every edge line needs a source, a target and a cost"),
+    ("3 2\n0 1 2\n1 2\n", ValueError, "Every edge line needs a source, a target and a cost"),
+    ("3 1\n0 1 99999999999999999999\n", OverflowError, None),
+    ("3 1\n0 1 -9223372036854775809\n", OverflowError, None),
+    ("3 1\n0 1 x\n", ValueError, "invalid literal"),
+    ("3 1\n0 1 1.0\n", ValueError, "invalid literal"),
+    ("3 1\n0 1 2 # comment\n", ValueError, "invalid literal"),
+    ("3 1\n0 3 1\n", ValueError, "Vertex does not exist"),
+    ("3 1\n-1 0 1\n", ValueError, "Vertex does not exist"),
+])
+def test_rejected_files(tmp_path, parser, text, error, message, chunk_bytes):
+    with pytest.raises(error, match=message):
+        parser(write(tmp_path, text), chunk_bytes)
+
+
+@pytest.mark.skipif(graph_io.np is None, reason="NumPy is not installed")
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_and_array_paths_agree(tmp_path, monkeypatch, seed):
+    rng = random.Random(seed)
+    number_vertices = rng.randint(1, 30)
+    lines = [f"{rng.randrange(number_vertices)} {rng.randrange(number_vertices)} {rng.randint(-10 ** 12, 10 ** 12)}"
+             for _ in range(rng.randint(0, 300))]
+    file_name = write(tmp_path, f"{number_vertices} {len(lines)}\n" + "\n".join(lines))
+    with_numpy = read_edge_list(file_name, 50)
+    monkeypatch.setattr(graph_io, "np", None)
+    without_numpy = read_edge_list(file_name, 50)
+    assert with_numpy[0] == without_numpy[0]
+    assert first_weights(*with_numpy[1:]) == first_weights(*without_numpy[1:])
+
+
+def test_chunks_end_with_whole_lines(tmp_path):
+    lines = [f"{i} {i + 1} {i * 7}" for i in range(50)]
+    with open(write(tmp_path, "\n".join(lines) + "\n")) as f:
+        chunks = list(iter_edge_chunks(f, 16))
+    assert len(chunks) > 1
+    sources = [source for chunk in chunks for source in chunk[0]]
+    weights = [weight for chunk in chunks for weight in chunk[2]]
+    assert sources == list(range(50)) and weights == [i * 7 for i in range(50)]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from graph_server import GraphServer
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    file_name = tmp_path_factory.mktemp("server") / "graph.txt"
+    file_name.write_text("4 4\n0 1 2\n1 2 3\n2 0 4\n0 3 10\n")
+    graph_server = GraphServer(str(file_name), workers=1)
+    yield graph_server
+    graph_server.close()
+
+
+def answer(server, request):
+    return asyncio.run(server.answer(request))
+
+
+def test_quick_queries(server):
+    assert answer(server, {"id": 1, "op": "is_edge", "args": [0, 1]}) == {"id": 1, "result": 0}
+    assert answer(server, {"op": "parse_in", "args": [0]})["result"] == [(2, 4)]
+    assert answer(server, {"op": "number_edges"})["result"] == 4
+    assert answer(server, {"op": "get_edge_by_id", "args": [1]})["result"] == (1, 2, 3)
+
+
+def test_heavy_queries_run_in_the_pool(server):
+    result = answer(server, {"id": "d", "op": "dijkstra", "args": [0]})["result"]
+    assert dict(result["distances"]) == {0: 0, 1: 2, 2: 5, 3: 10}
+    components = answer(server, {"op": "strongly_connected_components"})["result"]
+    assert sorted(map(sorted, components)) == [[0, 1, 2], [3]]
+
+
+@pytest.mark.parametrize("request_, error", [
+    ({"op": "nope"}, "unknown op 'nope'"),
+    ({"op": "parse_out", "args": [9]}, "KeyError: 9"),
+    ({"op": "is_edge", "args": [0]}, "TypeError"),
+])
+def test_errors(server, request_, error):
+    assert error in answer(server, request_)["error"]
+
+
+def test_pipelined_connection(server, tmp_path):
+    path = str(tmp_path / "graph.sock")
+
+    async def session():
+        listener = asyncio.create_task(server.serve_unix(path))
+        while not listener.done():
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(0.01)
+        requests = [{"id": 1, "op": "dijkstra", "args": [0]}, {"id": 2, "op": "out_degree", "args": [0]}]
+        writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        writer.write(b"not json\n\n[1, 2]\n")
+        writer.write_eof()
+        answers = [json.loads(line) async for line in reader]
+        writer.close()
+        listener.cancel()
+        return answers
+
+    answers = asyncio.run(session())
+    by_id = {response["id"]: response for response in answers if response["id"] is not None}
+    assert by_id[2]["result"] == 2 and dict(by_id[1]["result"]["distances"])[3] == 10
+    bad = [response["error"] for response in answers if response["id"] is None]
+    assert len(bad) == 2 and all(error.startswith("bad request") for error in bad)
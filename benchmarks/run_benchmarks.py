@@ -0,0 +1,309 @@
+"""
+Cross-lab benchmark suite.
+
+Generates seeded graphs at increasing sizes, times every benchmark in BENCHMARKS against them and
+writes a JSON report (and optionally a CSV one) that can be compared with an earlier run:
+
+    python benchmarks/run_benchmarks.py --edges 1000 10000 100000 1000000 --out report.json --csv report.csv
+    python benchmarks/run_benchmarks.py --edges 1000 10000 --compare report.json
+
+Every benchmark runs in its own subprocess: the labs all have a module called 'graph', memory
+figures are not polluted by earlier runs, and an algorithm that does not scale is stopped by
+--timeout without losing the other results.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAB_DIRS = {
+    "lab1": os.path.join(ROOT, "Graph_practicalwork_01-main", "python_implementation"),
+    "lab2": os.path.join(ROOT, "Graph_practical_work_02"),
+    "lab3": os.path.join(ROOT, "Graph_practical_work_03"),
+    "lab4": os.path.join(ROOT, "Graph_practical_work_04"),
+    "lab5": os.path.join(ROOT, "Graph_practical_work_05"),
+}
+IS_EDGE_QUERIES = 100_000
+
+# lab -> benchmark -> kind of generated graph it runs on, see write_graph()
+BENCHMARKS = {
+    "lab1": {"load": "directed", "load_binary": "directed", "is_edge": "directed", "dijkstra": "directed",
+             "strongly_connected_components": "directed"},
+    "lab2": {"load": "directed", "find_conected_components": "symmetric", "kosaraju_scc": "directed",
+             "tarjan_bcc": "symmetric"},
+    "lab3": {"load": "directed", "is_edge": "directed", "dijkstra": "directed", "count_min_cost_walks": "directed"},
+    "lab4": {"load": "dag", "topological_sort": "dag", "longest_path": "dag"},
+    "lab5": {"load": "undirected", "greedy_vertex_cover": "undirected", "primal_dual_vertex_cover": "undirected",
+             "local_search_vertex_cover": "undirected", "vertex_cover_maximal_matching": "undirected",
+             "vertex_cover_lp_relaxation": "undirected", "high_degree_vertex_cover": "undirected",
+             "edge_density_vertex_cover": "undirected", "hybrid_greedy_matching_vertex_cover": "undirected"},
+}
+
+
+def number_vertices_for(number_edges):
+    """Graphs get an average out-degree of about 8."""
+    return max(16, number_edges // 8)
+
+
+def write_graph(file_name, kind, number_edges, seed):
+    """
+    Writes a seeded random graph in the "n m / x y c" text format.
+    :param kind: "directed" (distinct x -> y, no self-loops), "dag" (only x < y), "undirected" (every
+                 pair once, for the undirected Lab 5 graph) or "symmetric" (every pair in both directions)
+    :return: (number of vertices, number of edge lines written)
+    """
+    rng = random.Random(seed)
+    n = number_vertices_for(number_edges)
+    codes = rng.sample(range(n * (n - 1)), number_edges)
+    pairs = [(code // (n - 1), code % (n - 1)) for code in codes]
+    pairs = [(x, y + (y >= x)) for x, y in pairs]  # Skip the self-loop, like Graph.generate_random_graph
+    if kind != "directed":
+        pairs = list(dict.fromkeys((min(x, y), max(x, y)) for x, y in pairs))  # Orient low -> high, drop repeats
+    if kind == "symmetric":
+        pairs += [(y, x) for x, y in pairs]
+    weights = [rng.randint(1, 100) for _ in pairs]
+    with open(file_name, "w") as f:
+        f.write(f"{n} {len(pairs)}\n")
+        f.writelines(f"{x} {y} {weight}\n" for (x, y), weight in zip(pairs, weights))
+    return n, len(pairs)
+
+
+# Worker side: every prepare_ function imports its lab, builds what the benchmark needs (untimed)
+# and returns (function to time, number of operations it performs)
+
+def prepare_lab1(name, graph_file, rng):
+    from graph import Graph, write_to_file
+    import algorithms
+    if name == "load":
+        return lambda: Graph.read_from_file(graph_file), 1
+    graph = Graph.read_from_file(graph_file)
+    if name == "load_binary":
+        binary_file = graph_file + ".bin"
+        write_to_file(graph, binary_file)
+        return lambda: Graph.read_from_file(binary_file), 1
+    if name == "is_edge":
+        queries = _is_edge_queries(graph, rng)
+        return lambda: [graph.is_edge(x, y) for x, y in queries], len(queries)
+    if name == "dijkstra":
+        return lambda: algorithms.dijkstra(graph, 0), 1
+    return lambda: algorithms.strongly_connected_components(graph), 1
+
+
+def prepare_lab2(name, graph_file, rng):
+    import importlib.util
+    from Graph_practical_work_02.graph import Graph
+    spec = importlib.util.spec_from_file_location("assigned_problem",
+                                                  os.path.join(LAB_DIRS["lab2"], "Assigned_Problem(03).py"))
+    problems = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(problems)
+    if name == "load":
+        return lambda: Graph(graph_file), 1
+    graph = Graph(graph_file)
+    return lambda: getattr(problems, name)(graph), 1
+
+
+def prepare_lab3(name, graph_file, rng):
+    from graph import Graph
+    if name == "load":
+        return lambda: Graph(graph_file), 1
+    graph = Graph(graph_file)
+    if name == "is_edge":
+        queries = _is_edge_queries(graph, rng)
+        return lambda: [graph.is_edge(x, y) for x, y in queries], len(queries)
+    if name == "dijkstra":
+        return lambda: graph.dijkstra(0), 1
+    end_vertex = graph.get_number_vertices() - 1
+    return lambda: graph.count_min_cost_walks(0, end_vertex), 1
+
+
+def prepare_lab4(name, graph_file, rng):
+    import graph as lab4
+    if name == "load":
+        return lambda: lab4.Graph(graph_file), 1
+    graph = lab4.Graph(graph_file)
+    if name == "topological_sort":
+        return lambda: lab4.topological_sort(graph), 1
+    return lambda: lab4.longest_path(graph, 0, graph.get_number_vertices() - 1), 1
+
+
+def prepare_lab5(name, graph_file, rng):
+    import importlib
+    from graph import Graph
+    if name == "load":
+        return lambda: Graph(graph_file), 1
+    modules = {
+        "greedy_vertex_cover": "greedy_vertex_cover",
+        "primal_dual_vertex_cover": "primal_dual_dual_approximation",
+        "local_search_vertex_cover": "local_search_heuristic",
+        "vertex_cover_maximal_matching": "vertex_cover_maximal_matching",
+        "vertex_cover_lp_relaxation": "vertex_cover_lp_relaxation",
+    }
+    algorithm = getattr(importlib.import_module(modules.get(name, "anotherThreeApproaches")), name)
+    graph = Graph(graph_file)
+    return lambda: algorithm(graph), 1
+
+
+def _is_edge_queries(graph, rng):
+    """Half existing edges, half random pairs."""
+    edges = list(graph.edges.values())
+    n = graph.get_number_vertices()
+    queries = [edges[rng.randrange(len(edges))][:2] for _ in range(IS_EDGE_QUERIES // 2)]
+    queries += [(rng.randrange(n), rng.randrange(n)) for _ in range(IS_EDGE_QUERIES // 2)]
+    return queries
+
+
+def run_worker(lab, name, graph_file, seed, trace_memory):
+    """Runs one benchmark in this process and prints its measurements as one JSON object."""
+    lab_dir = LAB_DIRS[lab]
+    # Lab 2 is imported as a package; the other labs import their own modules by name. All of them need
+    # the root for graph_common
+    sys.path[:0] = [ROOT] if lab == "lab2" else [lab_dir, ROOT]
+    os.chdir(lab_dir)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):  # Some algorithms print their results
+        function, operations = globals()[f"prepare_{lab}"](name, graph_file, rng)
+    if trace_memory:
+        from graph_common import memory_usage
+        memory_usage.enable_tracking()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    result = {"seconds": seconds, "operations": operations,
+              "peak_rss_mb": rss_after / 1024, "rss_growth_mb": (rss_after - rss_before) / 1024}
+    if trace_memory:
+        result["tracked_peaks"] = memory_usage.peak_report()
+    print(json.dumps(result))
+
+
+# Orchestrator side
+
+def run_suite(edge_counts, labs, seed, timeout, trace_memory, work_dir):
+    """
+    Runs every selected benchmark at every scale, each in a fresh interpreter.
+    :return: list of result rows
+    """
+    rows = []
+    for number_edges in edge_counts:
+        graphs = {}
+        for lab in labs:
+            for name, kind in BENCHMARKS[lab].items():
+                if kind not in graphs:
+                    graph_file = os.path.join(work_dir, f"{kind}_{number_edges}.txt")
+                    graphs[kind] = (graph_file,) + write_graph(graph_file, kind, number_edges, seed)
+                graph_file, number_vertices, edge_lines = graphs[kind]
+                row = {"lab": lab, "benchmark": name, "graph": kind, "vertices": number_vertices,
+                       "edges": edge_lines, "seed": seed}
+                command = [sys.executable, os.path.abspath(__file__), "--worker", lab, name, graph_file, "--seed",
+                           str(seed)] + (["--trace-memory"] if trace_memory else [])
+                try:
+                    completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    row["status"] = "timeout"
+                else:
+                    if completed.returncode == 0:
+                        row.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+                        row["status"] = "ok"
+                    else:
+                        error = (completed.stderr.strip().splitlines() or ["exit code %d" % completed.returncode])[-1]
+                        row["status"] = f"error: {error}"
+                rows.append(row)
+                print(_format_row(row), file=sys.stderr)
+    return rows
+
+
+def _format_row(row):
+    if row["status"] != "ok":
+        return f"{row['lab']:5} {row['benchmark']:36} {row['edges']:>9} edges  {row['status']}"
+    return (f"{row['lab']:5} {row['benchmark']:36} {row['edges']:>9} edges  {row['seconds']:10.4f} s"
+            f"  {row['peak_rss_mb']:9.1f} MB")
+
+
+def write_reports(rows, json_file, csv_file, arguments):
+    """Writes the rows with the run metadata as JSON, and as CSV if csv_file is given."""
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "seed": arguments.seed,
+            "edges": arguments.edges,
+        },
+        "results": rows,
+    }
+    with open(json_file, "w") as f:
+        json.dump(report, f, indent=2)
+    if csv_file:
+        columns = ["lab", "benchmark", "graph", "vertices", "edges", "seed", "status", "seconds", "operations",
+                   "peak_rss_mb", "rss_growth_mb"]
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def compare(rows, baseline_file):
+    """Prints the time ratio of every benchmark against the same benchmark in an earlier JSON report."""
+    with open(baseline_file) as f:
+        baseline = {(row["lab"], row["benchmark"], row["edges"]): row for row in json.load(f)["results"]}
+    print(f"{'lab':5} {'benchmark':36} {'edges':>9}  {'before s':>10} {'after s':>10}  ratio")
+    for row in rows:
+        old = baseline.get((row["lab"], row["benchmark"], row["edges"]))
+        if old is None or row["status"] != "ok" or old["status"] != "ok":
+            continue
+        ratio = row["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        print(f"{row['lab']:5} {row['benchmark']:36} {row['edges']:>9}  {old['seconds']:10.4f} "
+              f"{row['seconds']:10.4f}  {ratio:5.2f}x")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the graph labs on seeded random graphs.")
+    parser.add_argument("--edges", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="graph sizes, in edges (default: 1k 10k 100k 1M)")
+    parser.add_argument("--labs", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated graphs and queries")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds before a benchmark is stopped")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record tracemalloc peaks of the @track_memory entry points (slower)")
+    parser.add_argument("--out", default="benchmark_report.json", help="JSON report (default: benchmark_report.json)")
+    parser.add_argument("--csv", help="also write the results as CSV")
+    parser.add_argument("--compare", metavar="REPORT", help="earlier JSON report to compare the timings with")
+    parser.add_argument("--worker", nargs=3, metavar=("LAB", "BENCHMARK", "GRAPH_FILE"), help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.worker:
+        run_worker(*arguments.worker, arguments.seed, arguments.trace_memory)
+        return
+    with tempfile.TemporaryDirectory(prefix="graph_benchmarks_") as work_dir:
+        rows = run_suite(arguments.edges, arguments.labs, arguments.seed, arguments.timeout, arguments.trace_memory,
+                         work_dir)
+    write_reports(rows, arguments.out, arguments.csv, arguments)
+    if arguments.compare:
+        compare(rows, arguments.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# The labs import the shared code as graph_common and Graph_practical_work_02 from the repository root;
+# pytest puts the directory of this file on sys.path, and the directory of each test file for the
+# modules it imports by their plain names (graph, csr_graph, ...).
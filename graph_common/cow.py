@@ -0,0 +1,324 @@
+import heapq
+import weakref
+from collections.abc import MutableMapping
+from itertools import chain
+
+_MISSING = object()  # Key not mentioned in an overlay
+_DELETED = object()  # Key absent from the state an overlay shows
+
+
+class CopyOnWrite:
+    """
+    Snapshot state of one graph. A snapshot reads the structures of the graph through overlays
+    (DictOverlay, TableOverlay, ArrayOverlay): its own writes go to 'changes', everything else is read
+    from the graph. While a snapshot is alive, the graph hands the old value of every entry it writes
+    over to the overlays ('preserved') before writing it, so the snapshot keeps seeing the state it was
+    taken at. Taking a snapshot is O(1), a write costs O(1) extra per live snapshot, and an adjacency
+    list is copied the first time it is modified while a snapshot may read it (see owns()).
+
+    Values are handed over before the graph writes and a snapshot checks for them again after reading
+    the graph, so a snapshot that is not modified can be read from other threads during the writes.
+    The state does not reference its graph, so a dropped snapshot is freed (and stops being kept up) at once.
+    """
+
+    def __init__(self, overlays):
+        """
+        :param overlays: dict attribute name -> overlay class, for every structure a snapshot shares
+        """
+        self.overlays = overlays
+        self._readers = {}  # attribute name -> (structure, id -> overlay reading it, weakly)
+
+    def share(self, graph, copy):
+        """Makes copy, a graph with no structures of its own yet, read the structures of graph."""
+        for name, overlay_class in self.overlays.items():
+            structure = _unwrapped(getattr(graph, name))
+            entry = self._readers.get(name)
+            if entry is None or entry[0] is not structure:
+                entry = self._readers[name] = (structure, weakref.WeakValueDictionary())
+            overlay = overlay_class(structure)
+            entry[1][id(overlay)] = overlay  # Overlays compare by content, so they are not hashable
+            setattr(copy, name, overlay)
+
+    def prepare_write(self, graph):
+        """
+        Has to be called before graph writes one of its shared structures. Structures that a snapshot
+        still reads are wrapped so that writing them hands the old values over; the others are unwrapped.
+        Read the graph attributes again afterwards, they may have been replaced.
+        """
+        if not self._readers:
+            return
+        for name, (structure, readers) in list(self._readers.items()):
+            current = getattr(graph, name)
+            if _unwrapped(current) is not structure or not readers:  # Replaced by the graph, or nobody reads it
+                del self._readers[name]
+                if current is not _unwrapped(current):
+                    setattr(graph, name, current.base)
+            elif current is structure:
+                setattr(graph, name, self.overlays[name].writer(structure, readers))
+
+    @staticmethod
+    def owns(structure, key):
+        """
+        Tells whether the value of key in structure, an adjacency dict of the graph, can be modified in
+        place: no snapshot reads it. Otherwise it has to be replaced by a copy first. Call prepare_write() first.
+        Only the snapshots the graph handed an older value over to are sure not to read the current one, a
+        snapshot that wrote the key itself may have handed the current one on to its own snapshots.
+        """
+        if isinstance(structure, PreservingDict):
+            return (all(key in reader.preserved for reader in structure.readers.values())
+                    and CopyOnWrite.owns(structure.base, key))
+        if isinstance(structure, DictOverlay):
+            return key in structure.changes
+        return True
+
+
+class _Writer:
+    """Write access to a structure that snapshots read: every write hands the old value over first."""
+
+    def __init__(self, base, readers):
+        self.base = base
+        self.readers = readers  # WeakValueDictionary id -> overlay reading base
+
+    def _preserve(self, key):
+        old = self.base.get(key, _DELETED)
+        for reader in self.readers.values():
+            reader.preserved.setdefault(key, old)
+
+
+def _unwrapped(structure):
+    return structure.base if isinstance(structure, _Writer) else structure
+
+
+class PreservingDict(_Writer, MutableMapping):
+    """dict (or overlay) written through _Writer."""
+
+    def __getitem__(self, key):
+        return self.base[key]
+
+    def get(self, key, default=None):
+        return self.base.get(key, default)
+
+    def __contains__(self, key):
+        return key in self.base
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __setitem__(self, key, value):
+        self._preserve(key)
+        self.base[key] = value
+
+    def __delitem__(self, key):
+        self._preserve(key)
+        del self.base[key]
+
+
+class PreservingTable(PreservingDict):
+    """EdgeTable (or overlay) written through _Writer."""
+
+    def put(self, edge_id, source, target, weight):
+        self._preserve(edge_id)
+        self.base.put(edge_id, source, target, weight)
+
+    def extend(self, sources, targets, weights):
+        sources, targets, weights = list(sources), list(targets), list(weights)
+        start = _table_end(self.base)
+        for edge_id in range(start, start + len(sources)):
+            self._preserve(edge_id)
+        self.base.extend(sources, targets, weights)
+
+    def truncate(self, size):
+        self.base.truncate(size)  # Only dead slots: the snapshots got them when they were removed
+
+    def items(self):
+        return self.base.items()
+
+    def values(self):
+        return self.base.values()
+
+    def columns(self):
+        return self.base.columns()
+
+
+class PreservingArray(_Writer):
+    """Slot array (or overlay) written through _Writer."""
+
+    def _preserve(self, index):
+        old = self.base[index]
+        for reader in self.readers.values():
+            reader.preserved.setdefault(index, old)
+
+    def __getitem__(self, index):
+        return self.base[index]
+
+    def __setitem__(self, index, value):
+        self._preserve(index)
+        self.base[index] = value
+
+    def append(self, value):
+        self.base.append(value)
+
+    def __delitem__(self, index):
+        for position in range(index.start, len(self.base)):  # Only del a[n:]
+            self._preserve(position)
+        del self.base[index]
+
+    def __len__(self):
+        return len(self.base)
+
+
+class DictOverlay(MutableMapping):
+    """dict that reads through to 'base' (a dict or another overlay) and keeps its own writes in 'changes'."""
+
+    writer = PreservingDict
+
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}  # key -> value written through the overlay, or _DELETED
+        self.preserved = {}  # key -> value base had when the overlay was made, or _DELETED
+        self._size = len(base)
+
+    def _lookup(self, key):
+        value = self.changes.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.preserved.get(key, _MISSING)
+            if value is _MISSING:
+                value = self.base.get(key, _DELETED)
+                value = self.preserved.get(key, value)  # Written meanwhile: the old value was handed over first
+        return value
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _DELETED else value
+
+    def __contains__(self, key):
+        return self._lookup(key) is not _DELETED
+
+    def __setitem__(self, key, value):
+        if self._lookup(key) is _DELETED:
+            self._size += 1
+        self.changes[key] = value
+
+    def __delitem__(self, key):
+        if self._lookup(key) is _DELETED:
+            raise KeyError(key)
+        self.changes[key] = _DELETED
+        self._size -= 1
+
+    def __iter__(self):
+        seen = set()
+        for key in chain(list(self.base), list(self.preserved), list(self.changes)):
+            if key not in seen:
+                seen.add(key)
+                if self._lookup(key) is not _DELETED:
+                    yield key
+
+    def __len__(self):
+        return self._size
+
+
+class TableOverlay(DictOverlay):
+    """
+    EdgeTable that reads through to 'base' and keeps its own writes in 'changes'. Iteration keeps
+    EDGE_ID order; columns() builds lists instead of copying arrays.
+    """
+
+    writer = PreservingTable
+
+    def __init__(self, base):
+        super().__init__(base)
+        self._end = _table_end(base)  # Where extend() appends
+
+    def __setitem__(self, edge_id, edge):
+        super().__setitem__(edge_id, tuple(edge))
+        self._end = max(self._end, edge_id + 1)
+
+    def put(self, edge_id, source, target, weight):
+        """Stores an edge, see EdgeTable.put."""
+        self[edge_id] = source, target, weight
+
+    def extend(self, sources, targets, weights):
+        """Appends live edges with consecutive ids, see EdgeTable.extend."""
+        for edge in zip(sources, targets, weights):
+            self[self._end] = edge
+
+    def truncate(self, size):
+        """Drops every slot from EDGE_ID size on; the dropped slots have to be dead."""
+        self._end = min(self._end, size)
+
+    def __contains__(self, edge_id):
+        return isinstance(edge_id, int) and super().__contains__(edge_id)
+
+    def __iter__(self):
+        return (edge_id for edge_id, _ in self.items())
+
+    def items(self):
+        """Yields (EDGE_ID, (source, target, weight)) for every live edge in EDGE_ID order."""
+        previous = None
+        for edge_id in heapq.merge(list(self.base), sorted(list(self.preserved)), sorted(list(self.changes))):
+            if edge_id != previous:
+                previous = edge_id
+                edge = self._lookup(edge_id)
+                if edge is not _DELETED:
+                    yield edge_id, edge
+
+    def values(self):
+        """Yields (source, target, weight) for every live edge in EDGE_ID order."""
+        return (edge for _, edge in self.items())
+
+    def columns(self):
+        """
+        Returns the live edges as three parallel lists, in EDGE_ID order.
+        :return: (sources, targets, weights)
+        """
+        return tuple(map(list, zip(*self.values()))) or ([], [], [])
+
+
+class ArrayOverlay:
+    """
+    Slot array that reads through to 'base' and keeps its own writes in 'changes'. Supports what the
+    slot arrays are used for: indexing, append() and del a[n:].
+    """
+
+    writer = PreservingArray
+
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}  # index -> value written through the overlay
+        self.preserved = {}  # index -> value base had when the overlay was made
+        self._size = len(base)
+
+    def __getitem__(self, index):
+        value = self.changes.get(index, _MISSING)
+        if value is _MISSING:
+            value = self.preserved.get(index, _MISSING)
+            if value is _MISSING:
+                value = self.base[index]
+        return value
+
+    def __setitem__(self, index, value):
+        self.changes[index] = value
+
+    def append(self, value):
+        self.changes[self._size] = value
+        self._size += 1
+
+    def __delitem__(self, index):
+        self._size = min(self._size, index.start)  # Only del a[n:]; the dropped slots are not read again
+
+    def __len__(self):
+        return self._size
+
+
+def _table_end(table):
+    """One past the highest slot of an EdgeTable or TableOverlay."""
+    return table._end if isinstance(table, TableOverlay) else len(table.alive)
@@ -0,0 +1,104 @@
+import functools
+import os
+import sys
+import tracemalloc
+from itertools import chain
+
+# Peak tracking is off unless GRAPH_TRACK_MEMORY=1 is set or enable_tracking() is called
+_tracking = os.environ.get("GRAPH_TRACK_MEMORY") == "1"
+_peaks = {}  # Name of a tracked function -> {"calls", "last", "max"} peak bytes allocated during a call
+_open_peaks = []  # For every tracked call in progress, the highest peak reached by its finished nested tracked calls
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Returns the bytes held by an object and everything it references (container items, dict keys and
+    values, instance attributes). Objects already in 'seen' are not counted again, so one 'seen' set
+    shared between calls splits shared objects between structures instead of counting them twice.
+    :param obj: any object
+    :param seen: set of ids of the objects counted so far, updated in place
+    :return: number of bytes
+    """
+    if seen is None:
+        seen = set()
+    getsizeof, mark = sys.getsizeof, seen.add
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        mark(id(item))
+        total += getsizeof(item)
+        if isinstance(item, dict):
+            children = chain(item.keys(), item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            children = item
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            children = (vars(item),)
+        else:
+            continue
+        for child in children:
+            kind = type(child)
+            if kind is int or kind is float or kind is str:  # Leaves: count them here instead of stacking them
+                if id(child) not in seen:
+                    mark(id(child))
+                    total += getsizeof(child)
+            else:
+                stack.append(child)
+    return total
+
+
+def enable_tracking(enabled=True):
+    """Switches peak-memory tracking of the @track_memory functions on or off."""
+    global _tracking
+    _tracking = enabled
+
+
+def track_memory(function):
+    """
+    Decorator for algorithm entry points. While tracking is enabled, every call records the peak
+    number of bytes allocated above what was allocated when it started (tracemalloc, so only
+    while tracking is the process slowed down). Read the results with peak_report().
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def tracked(*args, **kwargs):
+        if not _tracking:
+            return function(*args, **kwargs)
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if _open_peaks:  # reset_peak() below would lose the peak the enclosing call reached so far
+            _open_peaks[-1] = max(_open_peaks[-1], tracemalloc.get_traced_memory()[1])
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        _open_peaks.append(0)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            peak = max(tracemalloc.get_traced_memory()[1], _open_peaks.pop())
+            stats = _peaks.setdefault(name, {"calls": 0, "last": 0, "max": 0})
+            stats["calls"] += 1
+            stats["last"] = peak - baseline
+            stats["max"] = max(stats["max"], peak - baseline)
+            if _open_peaks:
+                _open_peaks[-1] = max(_open_peaks[-1], peak)
+            if started:
+                tracemalloc.stop()
+
+    return tracked
+
+
+def peak_report():
+    """
+    Returns the peaks recorded so far.
+    :return: dict function name -> {"calls": number of tracked calls, "last": bytes, "max": bytes}
+    """
+    return {name: dict(stats) for name, stats in _peaks.items()}
+
+
+def reset_peaks():
+    """Forgets the peaks recorded so far."""
+    _peaks.clear()
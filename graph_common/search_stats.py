@@ -0,0 +1,70 @@
+import os
+
+# Work counters an instrumented search reports for every call:
+# edges_relaxed - edges looked at from an expanded node (relaxation tried, improving or not)
+# heap_pushes, heap_pops - operations on the priority queue or explicit stack (0 for recursive searches)
+# stale_pops - popped entries skipped because their node had already been expanded
+# nodes_expanded - nodes whose edges were looked at
+# peak_frontier - largest size the queue or stack reached (deepest recursion for recursive searches)
+SEARCH_COUNTERS = ("edges_relaxed", "heap_pushes", "heap_pops", "stale_pops", "nodes_expanded", "peak_frontier")
+
+# Counting is off unless GRAPH_SEARCH_STATS=1 is set, enable_stats() is called or a listener is added
+_counting = os.environ.get("GRAPH_SEARCH_STATS") == "1"
+_stats = {}  # Name of an instrumented search -> {"calls", "last", "total"} counters
+_listeners = []  # Callbacks called as callback(name, counters) after every instrumented call
+
+
+def enable_stats(enabled=True):
+    """Switches recording of the search counters on or off."""
+    global _counting
+    _counting = enabled
+
+
+def add_listener(callback):
+    """
+    Registers a callback that receives the counters of every instrumented call as they finish.
+    :param callback: function called as callback(name, counters), counters being a fresh dict
+    """
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    """Unregisters a callback added with add_listener()."""
+    _listeners.remove(callback)
+
+
+def record_search(name, **counters):
+    """
+    Called by the instrumented searches once per call with the counters they kept in local variables,
+    so while nobody is listening a search pays only for a few integer additions.
+    :param name: name of the search, e.g. "Graph.dijkstra"
+    :param counters: values for some of SEARCH_COUNTERS, the missing ones are 0
+    :return: None
+    """
+    if not _counting and not _listeners:
+        return
+    counts = {counter: counters.get(counter, 0) for counter in SEARCH_COUNTERS}
+    if _counting:
+        stats = _stats.setdefault(name, {"calls": 0, "last": None, "total": dict.fromkeys(SEARCH_COUNTERS, 0)})
+        stats["calls"] += 1
+        stats["last"] = counts
+        total = stats["total"]
+        for counter, value in counts.items():
+            # A peak does not add up over calls, the total keeps the highest one
+            total[counter] = max(total[counter], value) if counter == "peak_frontier" else total[counter] + value
+    for callback in list(_listeners):
+        callback(name, dict(counts))
+
+
+def stats_report():
+    """
+    Returns the counters recorded so far.
+    :return: dict search name -> {"calls": number of calls, "last": counters of the latest call, "total": summed counters}
+    """
+    return {name: {"calls": stats["calls"], "last": dict(stats["last"]), "total": dict(stats["total"])}
+            for name, stats in _stats.items()}
+
+
+def reset_stats():
+    """Forgets the counters recorded so far."""
+    _stats.clear()